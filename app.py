@@ -8,9 +8,19 @@ from __future__ import annotations
 
 import streamlit as st
 import base64
+import functools
+import hashlib
+import html
+import os
 from pathlib import Path
 import json
+import random
+import re
+import threading
+from collections import OrderedDict, deque
+from typing import Callable
 import streamlit.components.v1 as components
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 
 try:
     import tokens as design_tokens
@@ -32,6 +42,41 @@ except Exception:
 
     design_tokens = _FallbackTokens()  # type: ignore
 
+from validators import (
+    amount_to_words as _amount_to_words,
+    client_rules as _client_rules,
+    normalize_amount_words as _normalize_amount_words,
+    normalize_text as _normalize_text,
+    parse_cents as _parse_cents,
+    parse_currency as _parse_currency,
+    validate_amount_numeric as _validate_amount_numeric,
+    validate_amount_words as _validate_amount_words,
+    validate_date as _validate_date,
+    validate_payee as _validate_payee,
+    words_to_cents as _words_to_cents,
+)
+from fonts import FONT_FACES as _FONT_FACES, FONTS_DIR as _FONTS_DIR
+from fields import (
+    FIELD_NAMES,
+    FIELD_SPECS,
+    FIELDS_BY_NAME,
+    check_step as _check_step,
+    instructions as _instructions,
+    summary_line as _summary_line,
+    validate_check as _validate_check,
+)
+from state import STATE_KEY, SessionModel
+from scenarios import (
+    Scenario,
+    generate_pool as _generate_pool,
+    generate_scenario as _generate_scenario,
+    generated_seed as _generated_seed,
+    parse_seed as _parse_seed,
+    get_catalog as _get_catalog,
+)
+import metrics
+import profiling
+
 
 st.set_page_config(
     page_title="NGPF Check Writing",
@@ -40,71 +85,267 @@ st.set_page_config(
 )
 
 
-def _get_check_bg_data_url() -> str | None:
-    """Return data URL for a background image if an assets/check.* file exists (case-insensitive)."""
-    assets_dir = Path("assets")
-    if not assets_dir.exists():
+metrics.start_from_env()
+
+_PROFILES_KEY = "rerun_profiles"
+_PROFILES_KEPT = 20
+
+
+def _profile_mode() -> str | None:
+    """``?dev=1&profile=1`` times each rerun's sections; ``profile=full`` also runs cProfile."""
+    qp = st.query_params
+    if qp.get("dev") != "1" or qp.get("profile") not in {"1", "full"}:
         return None
-    allowed_exts = {"png", "jpg", "jpeg", "svg", "webp"}
-    # Prefer files named exactly check.* but accept case-insensitive
-    candidates: list[Path] = []
-    for p in assets_dir.iterdir():
-        if not p.is_file():
-            continue
-        name_lower = p.name.lower()
-        ext = p.suffix.lower().strip(".")
-        if ext in allowed_exts and (name_lower == f"check.{ext}" or name_lower.startswith("check.")):
-            candidates.append(p)
-    # Stable order
-    candidates.sort(key=lambda x: x.name.lower())
-    for p in candidates:
-        ext = p.suffix.lower().strip(".")
+    return qp["profile"]
+
+
+def _profiled(fn):
+    """Time main() or a render_* function; the outermost call in a rerun records the profile.
+
+    A fragment rerun starts at its render_* function, so it gets a profile of its own.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if profiling.active() is not None:
+            with profiling.section(fn.__name__):
+                return fn(*args, **kwargs)
+        mode = _profile_mode()
+        if mode is None:
+            return fn(*args, **kwargs)
+        with profiling.record(fn.__name__, cprofile=mode == "full") as profile:
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                history = st.session_state.setdefault(_PROFILES_KEY, deque(maxlen=_PROFILES_KEPT))
+                history.append(profile)
+
+    return wrapper
+
+
+def _metered(fn):
+    """Count and time main() and fragment reruns for metrics.py when an exporter is configured."""
+    kind = "full" if fn.__name__ == "main" else "fragment"
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not metrics.enabled():
+            return fn(*args, **kwargs)
+        ctx = get_script_run_ctx()
         try:
-            data = p.read_bytes()
-            b64 = base64.b64encode(data).decode("utf-8")
-            mime = "image/svg+xml" if ext == "svg" else f"image/{ext}"
-            return f"data:{mime};base64,{b64}"
-        except Exception:
-            continue
-    return None
+            with metrics.rerun(kind, _state().screen, ctx.session_id if ctx else None):
+                return fn(*args, **kwargs)
+        finally:
+            _record_cache_stats()
+
+    return wrapper
+
+
+_IMAGE_EXTS = {"png", "jpg", "jpeg", "svg", "webp"}
+# Streamlit serves <app dir>/static at app/static/ when server.enableStaticServing is on
+_STATIC_DIR = Path(__file__).resolve().parent / "static"
+_STATIC_URL_PREFIX = "app/static/"
+
+
+def _publish_static(static_dir: Path, stem: str, suffix: str, data: bytes, mtime_ns: int | None = None) -> str:
+    """Write ``data`` to ``static_dir/<stem>.<hash><suffix>`` and return its app/static URL.
+
+    Older copies with the same stem are removed. Raises OSError if the folder is not writable.
+    """
+    digest = hashlib.sha256(data).hexdigest()[:12]
+    target = static_dir / f"{stem}.{digest}{suffix}"
+    if not target.exists():
+        static_dir.mkdir(parents=True, exist_ok=True)
+        tmp = static_dir / f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp.write_bytes(data)
+        if mtime_ns is not None:
+            os.utime(tmp, ns=(mtime_ns, mtime_ns))
+        os.replace(tmp, target)
+    for stale in static_dir.glob(f"{stem}.*{suffix}"):
+        if stale != target:
+            stale.unlink(missing_ok=True)
+    return f"{_STATIC_URL_PREFIX}{target.name}"
+
+
+class _AssetCache:
+    """Process-wide cache of asset data URLs keyed on path, mtime and size.
+
+    Each file is read and base64-encoded once and re-encoded only when it changes.
+    """
+
+    def __init__(self, assets_dir: Path) -> None:
+        self.assets_dir = assets_dir
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: dict[Path, tuple[tuple[int, int], str]] = {}
+        self._published: dict[Path, tuple[tuple[int, int], str]] = {}
+        self._listing_stamp: int | None = None
+        self._listing: list[Path] = []
+
+    def _files(self) -> list[Path]:
+        try:
+            stamp = self.assets_dir.stat().st_mtime_ns
+        except OSError:
+            return []
+        if stamp != self._listing_stamp:
+            # Stable order so the same file wins on every host
+            self._listing = sorted(
+                (p for p in self.assets_dir.iterdir() if p.is_file()),
+                key=lambda x: x.name.lower(),
+            )
+            self._listing_stamp = stamp
+        return self._listing
+
+    def find(self, stem: str) -> list[Path]:
+        """Return image files named ``<stem>.<ext>`` (case-insensitive)."""
+        with self._lock:
+            files = self._files()
+        prefix = f"{stem}."
+        return [
+            p for p in files
+            if p.name.lower().startswith(prefix) and p.suffix.lower().strip(".") in _IMAGE_EXTS
+        ]
+
+    def data_url(self, path: Path) -> str | None:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == stamp:
+                self.hits += 1
+                return entry[1]
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        ext = path.suffix.lower().strip(".")
+        mime = "image/svg+xml" if ext == "svg" else f"image/{ext}"
+        url = f"data:{mime};base64,{base64.b64encode(data).decode('utf-8')}"
+        with self._lock:
+            self.misses += 1
+            self._entries[path] = (stamp, url)
+        return url
+
+    def static_url(self, path: Path, static_dir: Path) -> str | None:
+        """Publish ``path`` into ``static_dir`` under a content-hashed name and return its URL.
+
+        The hashed name changes whenever the content does, so browsers and proxies can
+        keep the file indefinitely. Returns None if the copy cannot be written.
+        """
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._published.get(path)
+            if entry is not None and entry[0] == stamp:
+                self.hits += 1
+                return entry[1]
+        try:
+            # Keep Last-Modified stable across restarts so revalidation returns 304
+            url = _publish_static(
+                static_dir, path.stem.lower(), path.suffix.lower(), path.read_bytes(), stat.st_mtime_ns
+            )
+        except OSError:
+            return None
+        with self._lock:
+            self.misses += 1
+            self._published[path] = (stamp, url)
+        return url
+
+    def first_data_url(self, stem: str) -> str | None:
+        for p in self.find(stem):
+            url = self.data_url(p)
+            if url:
+                return url
+        return None
+
+    def first_url(self, stem: str) -> str | None:
+        """Static URL for assets/<stem>.* when static serving is on, else a data URL."""
+        if _static_serving_enabled():
+            for p in self.find(stem):
+                url = self.static_url(p, _STATIC_DIR)
+                if url:
+                    return url
+        return self.first_data_url(stem)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+@st.cache_resource(show_spinner=False)
+def _asset_cache() -> _AssetCache:
+    return _AssetCache(Path("assets"))
+
+
+def _static_serving_enabled() -> bool:
+    try:
+        return bool(st.get_option("server.enableStaticServing"))
+    except Exception:
+        return False
+
+
+def _get_check_bg_data_url() -> str | None:
+    """Return data URL for a background image if an assets/check.* file exists (case-insensitive)."""
+    return _asset_cache().first_data_url("check")
 
 
 def _get_logo_data_url() -> str | None:
     """Return data URL for a header logo if assets/logo.* exists (case-insensitive)."""
-    assets_dir = Path("assets")
-    if not assets_dir.exists():
-        return None
-    exts = {"png", "jpg", "jpeg", "svg", "webp"}
-    candidates = []
-    for p in assets_dir.iterdir():
-        if p.is_file():
-            name = p.name.lower()
-            ext = p.suffix.lower().strip(".")
-            if ext in exts and (name == f"logo.{ext}" or name.startswith("logo.")):
-                candidates.append(p)
-    candidates.sort(key=lambda x: x.name.lower())
-    for p in candidates:
-        try:
-            data = p.read_bytes()
-            b64 = base64.b64encode(data).decode("utf-8")
-            mime = "image/svg+xml" if p.suffix.lower() == ".svg" else f"image/{p.suffix.lower().strip('.')}"
-            return f"data:{mime};base64,{b64}"
-        except Exception:
-            continue
-    return None
+    return _asset_cache().first_data_url("logo")
 
 
-def inject_global_styles() -> None:
-    """Inject CSS variables, fonts, focus styles, and basic layout tokens."""
-    bg_data_url = _get_check_bg_data_url()
+@profiling.timed("assets")
+def _get_check_bg_url() -> str | None:
+    """URL for the check background: served from app/static/ when enabled, data URL otherwise."""
+    return _asset_cache().first_url("check")
+
+
+@profiling.timed("assets")
+def _get_logo_url() -> str | None:
+    """URL for the header logo: served from app/static/ when enabled, data URL otherwise."""
+    return _asset_cache().first_url("logo")
+
+
+_GOOGLE_FONTS_IMPORT = "@import url('https://fonts.googleapis.com/css2?family=PT+Sans:wght@700&family=Montserrat:wght@400;500;700&family=Dancing+Script:wght@700&display=swap');"
+
+
+def _bundled_fonts(static_dir: Path) -> tuple[str, tuple[str, ...]] | None:
+    """Publish the bundled WOFF2 files and return (@font-face rules, preload URLs).
+
+    The rules use URLs relative to app/static/, for the published stylesheet. Returns None
+    unless every face in _FONT_FACES is present, so fonts are never half local, half CDN.
+    """
+    paths = [_FONTS_DIR / f"{stem}.woff2" for _, _, stem, _ in _FONT_FACES]
+    if not all(p.is_file() for p in paths):
+        return None
+    rules, preloads = [], []
+    for (family, weight, stem, preload), path in zip(_FONT_FACES, paths):
+        href = _publish_static(static_dir, stem, ".woff2", path.read_bytes(), path.stat().st_mtime_ns)
+        rules.append(
+            f"@font-face {{ font-family: '{family}'; font-style: normal; font-weight: {weight}; "
+            f"font-display: swap; src: url('{href[len(_STATIC_URL_PREFIX):]}') format('woff2'); }}"
+        )
+        if preload:
+            preloads.append(href)
+    return "\n".join(rules), tuple(preloads)
+
+
+def _build_global_css(bg_url: str | None, font_css: str = _GOOGLE_FONTS_IMPORT) -> str:
+    """Render the global stylesheet (without the <style> wrapper) from design tokens."""
     bg_image_block = (
-        f"background-image: url('{bg_data_url}'); background-size: cover; background-position: center;"
-        if bg_data_url
+        f"background-image: url('{bg_url}'); background-size: cover; background-position: center;"
+        if bg_url
         else ""
     )
-    css = f"""
-    <style>
-      @import url('https://fonts.googleapis.com/css2?family=PT+Sans:wght@700&family=Montserrat:wght@400;500;700&family=Dancing+Script:wght@700&display=swap');
+    return f"""
+      {font_css}
       :root {{
         --color-royal-blue: {design_tokens.ROYAL_BLUE};
         --color-navy-blue: {design_tokens.NAVY_BLUE};
@@ -425,18 +666,108 @@ def inject_global_styles() -> None:
       @media (max-width: 480px) {{
         .check-row {{ grid-template-columns: 1fr; }}
       }}
-    </style>
     """
-    st.markdown(css, unsafe_allow_html=True)
 
 
-def _check_overlay_component(*args, **kwargs):
-    # Removed custom component usage for reliability
-    raise RuntimeError("custom component disabled")
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_CSS_SPACE_RE = re.compile(r"\s+")
+_CSS_PUNCT_RE = re.compile(r"\s*([{};,>])\s*")
+# A declaration's colon: the text after it reaches ";" or "}" before any "{". In a
+# selector the space before ":" is a descendant combinator (".a :hover") and stays.
+_CSS_DECL_COLON_RE = re.compile(r"\s*:\s*(?=[^{};]*[;}])")
+
+
+def _minify_css(css: str) -> str:
+    css = _CSS_COMMENT_RE.sub("", css)
+    css = _CSS_SPACE_RE.sub(" ", css)
+    css = _CSS_PUNCT_RE.sub(r"\1", css)
+    css = _CSS_DECL_COLON_RE.sub(":", css)
+    return css.replace(";}", "}").strip()
+
 
+@st.cache_resource(show_spinner=False)
+def _global_stylesheet(bg_url: str | None, static: bool, bundle_fonts: bool = True) -> str:
+    """Return the markdown payload for the global styles, built and minified once per process.
 
+    In static mode the stylesheet is published as app/static/styles.<hash>.css and the
+    payload is a one-line @import, so reruns resend ~70 bytes and the browser reuses its
+    cached copy until the tokens or background change the hash. When assets/fonts holds
+    the bundled WOFF2 files they are served from app/static/ too, with preload hints,
+    instead of importing Google Fonts.
+    """
+    if static and (bg_url is None or bg_url.startswith(_STATIC_URL_PREFIX)):
+        # Inside the published stylesheet, url() resolves relative to app/static/
+        local_bg = bg_url[len(_STATIC_URL_PREFIX):] if bg_url else None
+        try:
+            fonts = _bundled_fonts(_STATIC_DIR) if bundle_fonts else None
+            font_css, preloads = fonts if fonts else (_GOOGLE_FONTS_IMPORT, ())
+            css = _minify_css(_build_global_css(local_bg, font_css))
+            href = _publish_static(_STATIC_DIR, "styles", ".css", css.encode("utf-8"))
+            links = "".join(
+                f"<link rel='preload' href='{url}' as='font' type='font/woff2' crossorigin>" for url in preloads
+            )
+            return f"{links}<style>@import url('{href}');</style>"
+        except OSError:
+            pass
+    return f"<style>{_minify_css(_build_global_css(bg_url))}</style>"
+
+
+@_profiled
+def inject_global_styles() -> None:
+    """Inject CSS variables, fonts, focus styles, and basic layout tokens."""
+    stylesheet = _global_stylesheet(_get_check_bg_url(), _static_serving_enabled())
+    with profiling.section("st.markdown"):
+        st.markdown(stylesheet, unsafe_allow_html=True)
+
+
+_CHECK_OVERLAY_DIR = Path(__file__).resolve().parent / "components" / "check_overlay"
+_OVERLAY_DEBOUNCE_MS = 400  # pause in typing before edits are sent to Python
+_check_overlay = components.declare_component("check_overlay", path=str(_CHECK_OVERLAY_DIR))
+
+
+def _check_overlay_component(
+    *,
+    bg_url: str | None,
+    positions: dict[str, dict[str, float]],
+    values: dict[str, str],
+    editable: bool,
+    highlight: str = "",
+    debounce_ms: int = _OVERLAY_DEBOUNCE_MS,
+    rules: dict | None = None,
+    key: str = "check_overlay",
+) -> dict[str, str]:
+    """Render the overlay component and return ``values`` with the browser's latest edits applied.
+
+    The component sends ``{"batch", "seq", "changes"}`` with only the fields edited since its
+    last send. Streamlit keeps returning that value on every rerun, so each batch is applied
+    once; otherwise a stale batch would undo Clear or New check. ``rules`` (from
+    validators.client_rules) turns on inline ✅/❌ feedback computed in the browser.
+    """
+    result = _check_overlay(
+        bg_url=bg_url,
+        positions=positions,
+        values=values,
+        editable=editable,
+        highlight=highlight,
+        debounce_ms=debounce_ms,
+        rules=rules,
+        key=key,
+        default=None,
+    )
+    merged = dict(values)
+    if isinstance(result, dict):
+        stamp = (result.get("batch"), result.get("seq"))
+        applied_key = f"{key}_applied"
+        if st.session_state.get(applied_key) != stamp:
+            st.session_state[applied_key] = stamp
+            changes = result.get("changes") or {}
+            merged.update({k: v for k, v in changes.items() if k in merged and isinstance(v, str)})
+    return merged
+
+
+@_profiled
 def render_header() -> None:
-    logo_url = _get_logo_data_url()
+    logo_url = _get_logo_url()
     logo_style = (
         f"background-image:url('{logo_url}'); background-size: contain; background-position:center; background-repeat:no-repeat;"
         if logo_url
@@ -451,178 +782,16 @@ def render_header() -> None:
       </div>
     </div>
     """
-    st.markdown(header_html, unsafe_allow_html=True)
-
-
-def _ensure_session_state_defaults() -> None:
-    if "selected_scenario" not in st.session_state:
-        st.session_state.selected_scenario = 0
-    if "mode" not in st.session_state:
-        st.session_state.mode = "I do"
-    if "guided_step" not in st.session_state:
-        st.session_state.guided_step = -1  # -1 = before first step
-    if "_last_scenario" not in st.session_state:
-        st.session_state._last_scenario = st.session_state.selected_scenario
-    if "_last_mode" not in st.session_state:
-        st.session_state._last_mode = st.session_state.mode
-    # Defaults for We do inputs
-    for key, default in [
-        ("we_date", ""),
-        ("we_payee", ""),
-        ("we_amount_numeric", ""),
-        ("we_amount_words", ""),
-        ("we_memo", ""),
-        ("we_signature", ""),
-        ("we_validation_error", ""),
-        ("we_step", 0),
-    ]:
-        st.session_state.setdefault(key, default)
-    
-    # Clear validation error when starting fresh (step 0 with no input)
-    if st.session_state.get("we_step", 0) == 0 and not any([
-        st.session_state.get("we_date", ""),
-        st.session_state.get("we_payee", ""),
-        st.session_state.get("we_amount_numeric", ""),
-        st.session_state.get("we_amount_words", ""),
-        st.session_state.get("we_memo", ""),
-        st.session_state.get("we_signature", "")
-    ]):
-        st.session_state.we_validation_error = ""
-
-
-def _get_scenarios() -> list[dict[str, str]]:
-    return [
-        {
-            "title": "Plumbing Inc — $150",
-            "prompt": "Write a check to Plumbing Inc for $150.00.",
-        },
-        {
-            "title": "Monthly Rent — $1,200",
-            "prompt": "On November 1, 2025, write a check to Oakwood Apartments for $1,200.00 for November rent. Sign as Jordan Patel.",
-        },
-        {
-            "title": "Field Trip Donation — $86.45",
-            "prompt": "Write a check to Lincoln High PTA for $86.45 to cover a field trip fee.",
-        },
-        {
-            "title": "Grocery Store — $64.32",
-            "prompt": "Write a check to FreshMart for $64.32.",
-        },
-        {
-            "title": "Donation — $50",
-            "prompt": "Write a check to Community Fund for $50.00.",
-        },
-    ]
-
-
-@st.cache_data(show_spinner=False)
-def _get_guided_scenarios() -> list[dict]:
-    """Guided step scripts for "I do" mode.
-
-    Each scenario defines ordered steps that auto-fill the check and include explanations.
-    """
-    return [
-        {
-            "title": "Plumbing Inc — $150",
-            "context": (
-                "Scenario (Feb 12, 2025): Avery Thompson hired Plumbing Inc to fix a leaking kitchen faucet. "
-                "The service was completed today and the invoice total is $150.00. Avery will write a check "
-                "to pay the plumber before the technician leaves."
-            ),
-            "amount_numeric": "$150.00",
-            "amount_words": "One hundred fifty dollars and 00/100",
-            "payee": "Plumbing Inc",
-            "date": "02/12/2025",
-            "memo": "Service call",
-            "signature": "Avery Thompson",
-            "steps": [
-                {
-                    "field": "date",
-                    "value": "02/12/2025",
-                    "explanation": "Write today’s date clearly in MM/DD/YYYY format.",
-                },
-                {
-                    "field": "payee",
-                    "value": "Plumbing Inc",
-                    "explanation": "Enter the payee’s name exactly as provided.",
-                },
-                {
-                    "field": "amount_numeric",
-                    "value": "$150.00",
-                    "explanation": "Write the numeric amount including cents (use .00 if no cents).",
-                },
-                {
-                    "field": "amount_words",
-                    "value": "One hundred fifty dollars and 00/100",
-                    "explanation": "Write the amount in words and include the cents as a fraction.",
-                },
-                {
-                    "field": "memo",
-                    "value": "Service call",
-                    "explanation": "Memo is optional but helpful for your records.",
-                },
-                {
-                    "field": "signature",
-                    "value": "Avery Thompson",
-                    "explanation": "Sign your name as it appears on your bank account.",
-                },
-            ],
-        },
-        {
-            "title": "Monthly Rent — $1,200",
-            "context": (
-                "Scenario (Nov 1, 2025): Jordan Patel is paying November rent to Oakwood Apartments. "
-                "The amount due is $1,200.00. Jordan will write and sign a check today."
-            ),
-            "amount_numeric": "$1,200.00",
-            "amount_words": "One thousand two hundred dollars and 00/100",
-            "payee": "Oakwood Apartments",
-            "date": "11/01/2025",
-            "memo": "November rent",
-            "signature": "Jordan Patel",
-            "steps": [
-                {"field": "date", "value": "11/01/2025", "explanation": "Rent is due on the 1st of the month."},
-                {"field": "payee", "value": "Oakwood Apartments", "explanation": "Enter the apartment name exactly."},
-                {"field": "amount_numeric", "value": "$1,200.00", "explanation": "Write the full amount with .00 cents."},
-                {"field": "amount_words", "value": "One thousand two hundred dollars and 00/100", "explanation": "Write the amount in words with the cents fraction."},
-                {"field": "memo", "value": "November rent", "explanation": "Memo helps you remember the purpose."},
-                {"field": "signature", "value": "Jordan Patel", "explanation": "Sign your full name to authorize payment."},
-            ],
-        },
-        {
-            "title": "Field Trip Donation — $86.45",
-            "context": (
-                "Scenario: John donates to the school PTA to cover a field trip fee for a relative."
-            ),
-            "amount_numeric": "$86.45",
-            "amount_words": "Eighty-six dollars and 45/100",
-            "payee": "Lincoln High PTA",
-            "date": "10/20/2025",
-            "memo": "Field trip fee",
-            "signature": "John Doe",
-            "steps": [],
-        },
-        {
-            "title": "Grocery Store — $64.32",
-            "amount_numeric": "$64.32",
-            "amount_words": "Sixty-four dollars and 32/100",
-            "payee": "FreshMart",
-            "date": "10/12/2025",
-            "memo": "Groceries",
-            "signature": "John Doe",
-            "steps": [],
-        },
-        {
-            "title": "Donation — $50",
-            "amount_numeric": "$50.00",
-            "amount_words": "Fifty dollars and 00/100",
-            "payee": "Community Fund",
-            "date": "10/20/2025",
-            "memo": "Donation",
-            "signature": "John Doe",
-            "steps": [],
-        },
-    ]
+    with profiling.section("st.markdown"):
+        st.markdown(header_html, unsafe_allow_html=True)
+
+
+def _state() -> SessionModel:
+    """This session's state, created on first use under a single session_state key."""
+    state = st.session_state.get(STATE_KEY)
+    if state is None:
+        state = st.session_state[STATE_KEY] = SessionModel()
+    return state
 
 
 def _reset_all_state() -> None:
@@ -630,31 +799,172 @@ def _reset_all_state() -> None:
         del st.session_state[k]
 
 
-def _ensure_flow_defaults() -> None:
-    st.session_state.setdefault("screen", "i_do")  # i_do -> we_do -> you_do
-    st.session_state.setdefault("selected_scenario", 0)
-    st.session_state.setdefault("guided_step", -1)
-    st.session_state.setdefault("mode", "I do")
-    # default overlay positions if no assets/overlay.json
-    st.session_state.setdefault("overlay_positions", {
-        "date": {"top": 13, "left": 62, "width": 32, "height": 7},
-        "payee": {"top": 30, "left": 8, "width": 70, "height": 8},
-        "amount_numeric": {"top": 30, "left": 80, "width": 12, "height": 7},
-        "amount_words": {"top": 45, "left": 7, "width": 82, "height": 8},
-        "memo": {"top": 72, "left": 7, "width": 42, "height": 7},
-        "signature": {"top": 72, "left": 55, "width": 36, "height": 7},
-    })
+_OVERLAY_FIELDS = ("date", "payee", "amount_numeric", "amount_words", "memo", "signature")
+_OVERLAY_BOX_KEYS = ("top", "left", "width", "height")
+
+# default overlay positions if no assets/overlay.json; shared by all sessions, never mutated
+_DEFAULT_OVERLAY_POSITIONS: dict[str, dict[str, float]] = {
+    "date": {"top": 13, "left": 62, "width": 32, "height": 7},
+    "payee": {"top": 30, "left": 8, "width": 70, "height": 8},
+    "amount_numeric": {"top": 30, "left": 80, "width": 12, "height": 7},
+    "amount_words": {"top": 45, "left": 7, "width": 82, "height": 8},
+    "memo": {"top": 72, "left": 7, "width": 42, "height": 7},
+    "signature": {"top": 72, "left": 55, "width": 36, "height": 7},
+}
+
+
+def _validate_overlay_positions(data: object) -> dict[str, dict[str, float]]:
+    """Keep well-formed boxes from ``data``; any missing or malformed field uses its default."""
+    positions: dict[str, dict[str, float]] = {}
+    for field in _OVERLAY_FIELDS:
+        box = data.get(field) if isinstance(data, dict) else None
+        if isinstance(box, dict) and all(
+            isinstance(box.get(k), (int, float)) and not isinstance(box.get(k), bool) for k in _OVERLAY_BOX_KEYS
+        ):
+            positions[field] = {k: box[k] for k in _OVERLAY_BOX_KEYS}
+        else:
+            positions[field] = dict(_DEFAULT_OVERLAY_POSITIONS[field])
+    return positions
+
+
+class _OverlayLayout:
+    """Validated overlay positions plus each field's precomputed CSS box. Treat as read-only."""
+
+    __slots__ = ("positions", "styles", "version")
+
+    def __init__(self, positions: dict[str, dict[str, float]]) -> None:
+        self.positions = positions
+        self.styles = {
+            k: f"left:{p['left']}%; top:{p['top']}%; width:{p['width']}%; height:{p['height']}%;"
+            for k, p in positions.items()
+        }
+        # Content-derived so render caches can key on it across processes
+        self.version = hashlib.sha256(json.dumps(positions, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+class _OverlayStore:
+    """Process-wide parsed copy of assets/overlay.json, reloaded only when its mtime changes."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.loads = 0
+        self._lock = threading.Lock()
+        self._stamp: int | None = None
+        self._layout: _OverlayLayout | None = None
+
+    def get(self) -> _OverlayLayout:
+        try:
+            stamp: int | None = self.path.stat().st_mtime_ns
+        except OSError:
+            stamp = None  # no file: serve defaults without reading anything
+        with self._lock:
+            if self._layout is None or stamp != self._stamp:
+                data = None
+                if stamp is not None:
+                    try:
+                        data = json.loads(self.path.read_text(encoding="utf-8"))
+                    except (OSError, ValueError):
+                        data = None
+                    self.loads += 1
+                self._layout = _OverlayLayout(_validate_overlay_positions(data))
+                self._stamp = stamp
+            return self._layout
+
+
+@st.cache_resource(show_spinner=False)
+def _overlay_store() -> _OverlayStore:
+    return _OverlayStore(Path("assets/overlay.json"))
+
+
+def _overlay_layout() -> _OverlayLayout:
+    return _overlay_store().get()
 
 
 def _load_overlay_positions() -> dict:
-    try:
-        p = Path("assets/overlay.json")
-        if p.exists():
-            data = json.loads(p.read_text(encoding="utf-8"))
-            return data
-    except Exception:
-        pass
-    return st.session_state.get("overlay_positions", {})
+    return _overlay_layout().positions
+
+
+_SLOT_MARK = "\x00"
+
+
+def _slot(name: str) -> str:
+    """Placeholder for a per-session value inside HTML passed to _HtmlTemplate."""
+    return f"{_SLOT_MARK}{name}{_SLOT_MARK}"
+
+
+class _HtmlTemplate:
+    """Prebuilt HTML with named slots that are filled with escaped values at render time."""
+
+    __slots__ = ("literals", "slots")
+
+    def __init__(self, source: str) -> None:
+        pieces = source.split(_SLOT_MARK)
+        self.literals = tuple(pieces[0::2])
+        self.slots = tuple(pieces[1::2])
+
+    @profiling.timed("html")
+    def fill(self, values: dict[str, str] | None = None) -> str:
+        if not self.slots:
+            return self.literals[0]
+        out = [self.literals[0]]
+        for name, literal in zip(self.slots, self.literals[1:]):
+            out.append(html.escape(values[name]))
+            out.append(literal)
+        return "".join(out)
+
+
+class _FragmentCache:
+    """Process-wide LRU of check HTML templates and prebuilt frames.
+
+    Keys carry the scenario, step, overlay layout version and background URL (content
+    hashed, or the cached data URL object), so a template is rebuilt only when one of
+    them changes. Sessions share templates and fill in their own values.
+    """
+
+    def __init__(self, maxsize: int = 512) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple, object] = OrderedDict()
+
+    def _lookup(self, key: tuple, build: Callable[[], object]) -> object:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+        value = build()
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = value
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def get(self, key: tuple, build: Callable[[], str]) -> _HtmlTemplate:
+        return self._lookup(key, lambda: _HtmlTemplate(build()))
+
+    def frames(self, key: tuple, build: Callable[[], list[str]]) -> tuple[str, ...]:
+        """Finished HTML strings that are built together, such as every step of a walkthrough."""
+        return self._lookup(key, lambda: tuple(build()))
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+@st.cache_resource(show_spinner=False)
+def _fragment_cache() -> _FragmentCache:
+    return _FragmentCache()
+
+
+def _record_cache_stats() -> None:
+    for name, stats in (("assets", _asset_cache().stats()), ("check_html", _fragment_cache().stats())):
+        metrics.cache_stats(name, stats["hits"], stats["misses"], stats["entries"])
+    info = _instructions.cache_info()
+    metrics.cache_stats("we_do_instructions", info.hits, info.misses, info.currsize)
 
 
 def _save_overlay_positions(data: dict) -> None:
@@ -663,6 +973,7 @@ def _save_overlay_positions(data: dict) -> None:
     Path("assets/overlay.json").write_text(json.dumps(data, indent=2), encoding="utf-8")
 
 
+@_profiled
 def render_top_nav() -> None:
     with st.container():
         st.markdown('<div class="ngpf-container">', unsafe_allow_html=True)
@@ -671,28 +982,34 @@ def render_top_nav() -> None:
             if st.button("Reset", type="secondary"):
                 _reset_all_state()
                 st.rerun()
+        state = _state()
         with cols[1]:
             step_map = {"i_do": 1, "we_do": 2, "you_do": 3}
-            current = step_map.get(st.session_state.screen, 1)
+            current = step_map.get(state.screen, 1)
             st.progress(current / 3.0, text=f"Step {current}/3")
         with cols[2]:
-            back_enabled = st.session_state.screen in {"we_do", "you_do"}
+            back_enabled = state.screen in {"we_do", "you_do"}
             if st.button("Back", disabled=not back_enabled):
-                if st.session_state.screen == "we_do":
-                    st.session_state.screen = "i_do"
-                elif st.session_state.screen == "you_do":
-                    st.session_state.screen = "we_do"
+                if state.screen == "we_do":
+                    state.screen = "i_do"
+                elif state.screen == "you_do":
+                    state.screen = "we_do"
                 st.rerun()
         # Dev-only calibrate
         if st.query_params.get("dev") == "1":
             if st.button("Calibrate overlays"):
-                st.session_state.screen = "calibrate"
+                state.screen = "calibrate"
                 st.rerun()
+            stats = _asset_cache().stats()
+            st.caption(f"Asset cache: {stats['hits']} hits / {stats['misses']} misses ({stats['entries']} files)")
+            stats = _fragment_cache().stats()
+            st.caption(f"Check HTML cache: {stats['hits']} hits / {stats['misses']} misses ({stats['entries']} templates)")
         st.markdown("</div>", unsafe_allow_html=True)
 
 
+@_profiled
 def render_scenario_screen() -> None:
-    scenarios = _get_scenarios()
+    scenarios = _get_catalog().scenarios
     with st.container():
         st.markdown('<div class="ngpf-container">', unsafe_allow_html=True)
         st.markdown("### Choose a scenario")
@@ -700,31 +1017,74 @@ def render_scenario_screen() -> None:
         for i, sc in enumerate(scenarios):
             col = rows[i % 3]
             with col:
-                if st.button(sc["title"], key=f"scenario_{i}"):
-                    st.session_state.selected_scenario = i
-                    st.session_state.screen = "i_do"
-                    st.session_state.guided_step = -1
+                if st.button(sc.title, key=f"scenario_{sc.id}"):
+                    state = _state()
+                    state.i_do.scenario = sc.id
+                    state.i_do.step = -1
+                    state.screen = "i_do"
                     st.rerun()
         st.markdown("</div>", unsafe_allow_html=True)
 
 
+@_profiled
 def render_check_static() -> None:
-    scenario = _get_scenarios()[st.session_state.selected_scenario]
+    scenario = _scenario(_state().i_do.scenario)
     with st.container():
         st.markdown('<div class="ngpf-container">', unsafe_allow_html=True)
         st.markdown("#### Scenario", help="Use this prompt to fill out the check in later sprints.")
-        st.info(scenario["prompt"])
+        st.info(scenario.prompt)
 
         # Static visual: only the image background with no overlay labels
         check_html = """
         <div class="check-real" role="img" aria-label="Check background"></div>
         """
-        st.markdown(check_html, unsafe_allow_html=True)
+        with profiling.section("st.markdown"):
+            st.markdown(check_html, unsafe_allow_html=True)
         st.markdown("</div>", unsafe_allow_html=True)
 
 
-def _compute_filled_fields(scenario_idx: int, step_index: int) -> dict[str, str]:
-    guided = _get_guided_scenarios()[scenario_idx]
+def _scenario(key: int | str) -> Scenario:
+    """Look up a scenario by catalog id or by position in the catalog."""
+    catalog = _get_catalog()
+    if isinstance(key, str):
+        seed = _generated_seed(key)
+        if seed is not None:
+            return _generate_scenario(seed)
+        return catalog.by_id[key]
+    return catalog.scenarios[key]
+
+
+_PRACTICE_POOL_SIZE = 20
+
+
+def _you_do_scenario() -> Scenario:
+    """Current You do check: ``?seed=N`` on first visit, else the catalog's You do scenario."""
+    you = _state().you_do
+    if not you.scenario:
+        seed = _parse_seed(st.query_params.get("seed", ""))
+        you.scenario = _generate_scenario(seed).id if seed is not None else _get_catalog().first("you_do").id
+    return _scenario(you.scenario)
+
+
+def _next_practice_check() -> None:
+    """Move You do to the next check in this session's pre-generated seed pool."""
+    you = _state().you_do
+    if not you.seeds:
+        you.seeds = _generate_pool(random.randrange(2**32), _PRACTICE_POOL_SIZE)
+    you.scenario = _generate_scenario(you.seeds.pop(0)).id
+    you.inputs.clear()
+
+
+def _validation_mode() -> str:
+    """"server" grades You do only on "Check my work"; ``?validate=client`` adds inline browser feedback."""
+    return "client" if st.query_params.get("validate") == "client" else "server"
+
+
+def _you_clear() -> None:
+    _state().you_do.inputs.clear()
+
+
+def _compute_filled_fields(scenario: int | str, step_index: int) -> dict[str, str]:
     fields: dict[str, str] = {
         "date": "",
         "payee": "",
@@ -733,348 +1093,400 @@ def _compute_filled_fields(scenario_idx: int, step_index: int) -> dict[str, str]
         "memo": "",
         "signature": "",
     }
-    steps = guided.get("steps") or []
-    if not steps:
-        # If steps are not explicitly defined, fill in default order up to index
-        default_order = [
-            ("date", guided.get("date", "")),
-            ("payee", guided.get("payee", "")),
-            ("amount_numeric", guided.get("amount_numeric", "")),
-            ("amount_words", guided.get("amount_words", "")),
-            ("memo", guided.get("memo", "")),
-            ("signature", guided.get("signature", "")),
-        ]
-        for i, (f, v) in enumerate(default_order):
-            if i <= step_index:
-                fields[f] = v
-        return fields
-
-    for i, step in enumerate(steps):
+    for i, step in enumerate(_scenario(scenario).steps):
         if i <= step_index:
-            fields[step["field"]] = step["value"]
+            fields[step.field] = step.value
     return fields
 
 
+@profiling.timed("html")
+def _i_do_check_html(guided: Scenario, current_clamped: int, layout: _OverlayLayout, bg_url: str | None) -> str:
+    """Check HTML for an I do step. Depends only on its arguments, so _fragment_cache can reuse it."""
+    steps = guided.steps
+    fields = _compute_filled_fields(guided.id, current_clamped)
+    # Percent-based hotspot positions to align with typical personal check layout
+    positions = layout.positions
+
+    # Use native HTML overlay in I do to avoid component load timing in some environments
+    def style_box(key: str, active: bool) -> str:
+        box = layout.styles[key]
+        return box + " outline:2px solid var(--color-bright-blue); outline-offset:2px;" if active else box
+
+    if bg_url:
+        parts = [f"<div class='check-real' style=\"background-image:url('{bg_url}'); background-size:cover; background-position:center;\">"]
+    else:
+        parts = ["<div class='check-real'>"]
+    parts.append(f"<div class='hotspot' style='{style_box('date', current_clamped==0)}'><div class='fill'>{fields['date']}</div></div>")
+    parts.append(f"<div class='hotspot' style='{style_box('payee', current_clamped==1)}'><div class='fill'>{fields['payee']}</div></div>")
+    # Remove leading $ if present, since the check already shows it
+    amt = fields['amount_numeric'].lstrip('$').strip()
+    parts.append(f"<div class='hotspot' style='{style_box('amount_numeric', current_clamped==2)}'><div class='fill' style='right:10px; left:auto;'>{amt}</div></div>")
+    parts.append(f"<div class='hotspot' style='{style_box('amount_words', current_clamped==3)}'><div class='fill'>{fields['amount_words']}</div></div>")
+    parts.append(f"<div class='hotspot' style='{style_box('memo', current_clamped==4)}'><div class='fill'>{fields['memo']}</div></div>")
+    parts.append(f"<div class='hotspot' style='{style_box('signature', current_clamped==5)}'><div class='fill signature-text'>{fields['signature']}</div></div>")
+    # Popover tip near the active field
+    if current_clamped >= 0:
+        active = steps[current_clamped].field
+        p = positions[active]
+        # Force above for dollar amount and signature to avoid covering content
+        force_above = active in {"amount_numeric", "signature"}
+        place_above = force_above or (p['top'] > 12)
+        if place_above:
+            # Offset by the field's height plus extra margin
+            tip_top = max(0, p['top'] - (p['height'] + 6))
+            cls = 'tip above'
+        else:
+            tip_top = p['top'] + p['height'] + 2
+            cls = 'tip below'
+        # Prefer placing a bit to the right; clamp within bounds
+        tip_left = min(95, max(0, p['left'] + 4))
+        parts.append(
+            f"<div class='{cls}' style='left:{tip_left}%; top:{tip_top}%;'>{steps[current_clamped].explanation}</div>"
+        )
+    parts.append("</div>")
+    return "\n".join(parts)
+
+
+def _i_do_go_to(step: int) -> None:
+    _state().i_do.step = step
+
+
+def _i_do_mode() -> str:
+    """"server" renders each I do step on a rerun; ``?ido=client`` plays the walkthrough in the browser."""
+    return "client" if st.query_params.get("ido") == "client" else "server"
+
+
+def _i_do_frames(guided: Scenario, layout: _OverlayLayout, bg_url: str | None) -> tuple[str, ...]:
+    """Check HTML for every I do step, -1 (blank) through the last, built together once per process.
+
+    Index with ``step + 1``.
+    """
+    return _fragment_cache().frames(
+        ("i_do", guided.id, layout.version, bg_url),
+        lambda: [_i_do_check_html(guided, step, layout, bg_url) for step in range(-1, len(guided.steps))],
+    )
+
+
+_I_DO_PLAYER_HEIGHT = 640
+
+
+@profiling.timed("html")
+def _i_do_player_html(guided: Scenario, layout: _OverlayLayout, bg_url: str | None, static: bool) -> str:
+    """Self-contained page that steps through the precomputed I do frames with its own buttons."""
+    # Frames without the inline background: the stylesheet sets it once for every frame
+    frames = _i_do_frames(guided, layout, None)
+    steps = [{"explanation": step.explanation} for step in guided.steps]
+    payload = json.dumps({"frames": frames, "steps": steps}).replace("</", "<\\/")
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8">
+{_global_stylesheet(bg_url, static)}
+<style>
+  body {{ margin: 0; padding: 4px 2px; font-family: Montserrat, sans-serif; color: var(--color-navy-blue); }}
+  .player-status {{ font-size: 14px; margin-bottom: 8px; }}
+  .player-bar {{ height: 6px; border-radius: 3px; background: var(--color-light-gray-blue); margin-bottom: 12px; }}
+  .player-bar div {{ height: 100%; border-radius: 3px; background: var(--color-bright-blue); transition: width .2s; }}
+  .player-explanation {{ margin: 16px 0 12px; padding: 12px 16px; border-radius: 8px; background: var(--color-ice-blue); }}
+  .player-controls button {{ font: inherit; padding: 6px 14px; margin-right: 8px; border-radius: 8px; cursor: pointer;
+    border: 1px solid var(--color-bright-blue); background: #fff; color: var(--color-bright-blue); }}
+  .player-controls button.primary {{ background: var(--color-bright-blue); color: #fff; }}
+  .player-controls button:disabled {{ opacity: .5; cursor: default; }}
+</style></head>
+<body>
+<div class="player-status" id="status" role="status" aria-live="polite"></div>
+<div class="player-bar"><div id="bar"></div></div>
+<div id="frame"></div>
+<div class="player-explanation" id="explanation"></div>
+<div class="player-controls">
+  <button class="primary" id="next" type="button">Next</button>
+  <button id="replay" type="button">Replay</button>
+</div>
+<script>
+  const DATA = {payload};
+  const total = DATA.steps.length;
+  let step = -1;
+  function show(){{
+    document.getElementById('frame').innerHTML = DATA.frames[step + 1];
+    document.getElementById('status').textContent = `Step ${{Math.max(0, step + 1)}} of ${{total}}`;
+    document.getElementById('bar').style.width = `${{100 * (step + 1) / total}}%`;
+    document.getElementById('explanation').textContent =
+      step >= 0 ? DATA.steps[step].explanation : 'Click Next to begin the guided walkthrough.';
+    document.getElementById('next').disabled = step >= total - 1;
+  }}
+  document.getElementById('next').addEventListener('click', () => {{ step = Math.min(step + 1, total - 1); show(); }});
+  document.getElementById('replay').addEventListener('click', () => {{ step = -1; show(); }});
+  show();
+</script>
+</body></html>"""
+
+
+def _embed_html(page: str, height: int) -> None:
+    """Show a self-contained HTML page in an iframe: st.iframe where available, else components.html."""
+    iframe = getattr(st, "iframe", None)
+    if iframe is not None:
+        iframe(page, height=height)
+    else:
+        components.html(page, height=height)
+
+
+def _i_do_player(guided: Scenario, layout: _OverlayLayout, bg_url: str | None) -> str:
+    static = _static_serving_enabled()
+    key = ("i_do_player", guided.id, layout.version, bg_url, static)
+    return _fragment_cache().get(key, lambda: _i_do_player_html(guided, layout, bg_url, static)).fill()
+
+
+# The check areas are fragments: their widgets rerun only that region, and the state
+# changes they make go through callbacks so the region renders once per interaction.
+# Anything that changes the screen lives in main() and reruns the whole app.
+@st.fragment
+@_metered
+@_profiled
 def render_check_guided() -> None:
-    scenario_idx = 0  # I do uses first scenario
-    guided = _get_guided_scenarios()[scenario_idx]
-    steps = guided.get("steps") or [
-        {"field": "date", "value": guided.get("date", ""), "explanation": "Date"},
-        {"field": "payee", "value": guided.get("payee", ""), "explanation": "Payee"},
-        {
-            "field": "amount_numeric",
-            "value": guided.get("amount_numeric", ""),
-            "explanation": "Numeric amount",
-        },
-        {
-            "field": "amount_words",
-            "value": guided.get("amount_words", ""),
-            "explanation": "Amount in words",
-        },
-        {"field": "memo", "value": guided.get("memo", ""), "explanation": "Memo"},
-        {
-            "field": "signature",
-            "value": guided.get("signature", ""),
-            "explanation": "Signature",
-        },
-    ]
+    guided = _get_catalog().first("i_do")
+    steps = guided.steps
 
     total_steps = len(steps)
-    current = st.session_state.guided_step
+    i_do = _state().i_do
+    current = i_do.step
     current_clamped = max(-1, min(current, total_steps - 1))
-    fields = _compute_filled_fields(scenario_idx, current_clamped)
 
     with st.container():
         st.markdown('<div class="ngpf-container">', unsafe_allow_html=True)
         st.markdown("#### I do — Guided walkthrough")
-        if guided.get("context"):
-            st.info(guided["context"])
+        if guided.context:
+            st.info(guided.context)
+
+        layout = _overlay_layout()
+        bg_url = _get_check_bg_url()
+        if _i_do_mode() == "client":
+            # One payload holds every step; Next and Replay never reach the server
+            _embed_html(_i_do_player(guided, layout, bg_url), _I_DO_PLAYER_HEIGHT)
+            st.markdown("</div>", unsafe_allow_html=True)
+            return
 
         # Progress info
         progress_ratio = 0.0 if current_clamped < 0 else (current_clamped + 1) / total_steps
         st.progress(progress_ratio, text=f"Step {max(0, current_clamped + 1)} of {total_steps}")
 
-        # Percent-based hotspot positions to align with typical personal check layout
-        positions = _load_overlay_positions()
-        # Ensure background image is applied inline to avoid CSS timing issues
-        bg_url = _get_check_bg_data_url()
-
-        # Use native HTML overlay in I do to avoid component load timing in some environments
-        def style_box(key: str, active: bool) -> str:
-            p = positions[key]
-            hi = "outline:2px solid var(--color-bright-blue); outline-offset:2px;" if active else ""
-            return f"left:{p['left']}%; top:{p['top']}%; width:{p['width']}%; height:{p['height']}%; {hi}"
-
-        if bg_url:
-            parts = [f"<div class='check-real' style=\"background-image:url('{bg_url}'); background-size:cover; background-position:center;\">"]
-        else:
-            parts = ["<div class='check-real'>"]
-        parts.append(f"<div class='hotspot' style='{style_box('date', current_clamped==0)}'><div class='fill'>{fields['date']}</div></div>")
-        parts.append(f"<div class='hotspot' style='{style_box('payee', current_clamped==1)}'><div class='fill'>{fields['payee']}</div></div>")
-        # Remove leading $ if present, since the check already shows it
-        amt = fields['amount_numeric'].lstrip('$').strip()
-        parts.append(f"<div class='hotspot' style='{style_box('amount_numeric', current_clamped==2)}'><div class='fill' style='right:10px; left:auto;'>{amt}</div></div>")
-        parts.append(f"<div class='hotspot' style='{style_box('amount_words', current_clamped==3)}'><div class='fill'>{fields['amount_words']}</div></div>")
-        parts.append(f"<div class='hotspot' style='{style_box('memo', current_clamped==4)}'><div class='fill'>{fields['memo']}</div></div>")
-        parts.append(f"<div class='hotspot' style='{style_box('signature', current_clamped==5)}'><div class='fill signature-text'>{fields['signature']}</div></div>")
-        # Popover tip near the active field
-        if current_clamped >= 0:
-            active = steps[current_clamped]["field"]
-            p = positions[active]
-            # Force above for dollar amount and signature to avoid covering content
-            force_above = active in {"amount_numeric", "signature"}
-            place_above = force_above or (p['top'] > 12)
-            if place_above:
-                # Offset by the field's height plus extra margin
-                tip_top = max(0, p['top'] - (p['height'] + 6))
-                cls = 'tip above'
-            else:
-                tip_top = p['top'] + p['height'] + 2
-                cls = 'tip below'
-            # Prefer placing a bit to the right; clamp within bounds
-            tip_left = min(95, max(0, p['left'] + 4))
-            parts.append(
-                f"<div class='{cls}' style='left:{tip_left}%; top:{tip_top}%;'>{steps[current_clamped]['explanation']}</div>"
-            )
-        parts.append("</div>")
-        st.markdown("\n".join(parts), unsafe_allow_html=True)
+        # Background applied inline to avoid CSS timing issues; frames are shared across sessions
+        frame = _i_do_frames(guided, layout, bg_url)[current_clamped + 1]
+        with profiling.section("st.markdown"):
+            st.markdown(frame, unsafe_allow_html=True)
 
         # Explanation for current step
         if current_clamped >= 0:
-            st.info(steps[current_clamped]["explanation"])
+            st.info(steps[current_clamped].explanation)
         else:
             st.caption("Click Next to begin the guided walkthrough.")
 
         cols = st.columns([1, 1, 4])
         with cols[0]:
-            if st.button("Next", type="primary", disabled=current_clamped >= total_steps - 1):
-                st.session_state.guided_step = min(current_clamped + 1, total_steps - 1)
-                st.rerun()
+            st.button(
+                "Next", type="primary", disabled=current_clamped >= total_steps - 1,
+                on_click=_i_do_go_to, args=(min(current_clamped + 1, total_steps - 1),),
+            )
         with cols[1]:
-            if st.button("Replay", type="secondary"):
-                st.session_state.guided_step = -1
-                st.rerun()
+            st.button("Replay", type="secondary", on_click=_i_do_go_to, args=(-1,))
 
         st.markdown("</div>", unsafe_allow_html=True)
 
 
-def _normalize_text(value: str) -> str:
-    return " ".join(value.strip().lower().split())
+def _save_current_field_from_form(field_name: str, step_idx: int) -> None:
+    """Helper to save the current field value from form data"""
+    # This will be called when Next is clicked to auto-save current field
+    # For now, we'll use JavaScript to get the value
+    pass  # The actual saving happens in the form submission handler
 
 
-def _parse_currency(value: str) -> float | None:
-    try:
-        cleaned = value.replace("$", "").replace(",", "").strip()
-        return float(cleaned)
-    except Exception:
-        return None
+_WE_FIELDS = FIELD_NAMES
 
 
-def _validate_date(value: str) -> tuple[bool, str | None]:
-    from datetime import datetime
-
-    formats = ["%m/%d/%Y", "%m/%d/%y", "%m-%d-%Y", "%m-%d-%y"]
-    for fmt in formats:
-        try:
-            datetime.strptime(value.strip(), fmt)
-            return True, None
-        except Exception:
-            pass
-    return False, "Use a valid date like 10/15/2025."
+def _we_nav_mode() -> str:
+    """"callbacks" keeps We do navigation inside the session; ``?nav=links`` selects the legacy page-reload links."""
+    return "links" if st.query_params.get("nav") == "links" else "callbacks"
 
 
-def _validate_payee(value: str, expected: str) -> tuple[bool, str | None]:
-    if _normalize_text(value) == _normalize_text(expected):
-        return True, None
-    return False, f"Expected: {expected}"
+def _we_navigate(nav_action: str) -> None:
+    """Apply a We do Back/Next/Done action to session state, validating the current field first."""
+    we = _state().we_do
+    current_step = we.step
+    guided = _get_catalog().first("we_do")
 
+    if nav_action == "back" and current_step > 0:
+        we.step = current_step - 1
+        we.error = ""  # Clear any validation error
+    elif nav_action == "next" and current_step < len(FIELD_SPECS) - 1:
+        # Validate current field before allowing progression
+        spec = FIELD_SPECS[current_step]
+        with profiling.section("validation"):
+            can_advance, error_msg = _check_step(spec, getattr(we.inputs, spec.name), guided.expected, guided.cents)
+        metrics.validation("we_do", spec.name, can_advance)
+        if can_advance:
+            we.step = current_step + 1
+            we.error = ""  # Clear any validation error
+        else:
+            we.error = error_msg
+    elif nav_action == "done":
+        # Validate the final field before completion
+        spec = FIELD_SPECS[-1]
+        with profiling.section("validation"):
+            can_finish, error_msg = _check_step(spec, getattr(we.inputs, spec.name), guided.expected, guided.cents)
+        metrics.validation("we_do", spec.name, can_finish)
+        if can_finish:
+            we.completed = True
+            we.error = ""
+        else:
+            we.error = error_msg
 
-def _validate_amount_numeric(value: str, expected: str) -> tuple[bool, str | None]:
-    target = _parse_currency(expected)
-    got = _parse_currency(value)
-    if target is not None and got is not None and abs(target - got) < 0.005:
-        return True, None
-    return False, f"Expected: {expected}"
 
+def _we_save_helper(field: str) -> None:
+    """on_click for the legacy Save button: store the helper widget's value."""
+    setattr(_state().we_do.inputs, field, FIELDS_BY_NAME[field].normalize(st.session_state[f"helper_{field}"]))
 
-def _normalize_amount_words(text: str) -> str:
-    """Looser normalization for amount-in-words.
-    - case-insensitive
-    - ignore 'dollar(s)', 'and', 'only'
-    - allow hyphens vs spaces
-    - keep the cents fraction like 00/100
-    """
-    t = text.lower().strip()
-    t = t.replace('-', ' ')
-    # keep fraction intact, strip punctuation except / digits
-    allowed = set("abcdefghijklmnopqrstuvwxyz 0123456789/ ")
-    t = ''.join(ch if ch in allowed else ' ' for ch in t)
-    tokens = [tok for tok in t.split() if tok not in {"dollar", "dollars", "and", "only"}]
-    return " ".join(tokens)
 
+def _we_set_input(field: str) -> None:
+    """on_change callback for the We do input helper: copy the widget value into the We do inputs."""
+    setattr(_state().we_do.inputs, field, FIELDS_BY_NAME[field].normalize(st.session_state[f"we_input_{field}"]))
 
-def _validate_amount_words(value: str, expected: str) -> tuple[bool, str | None]:
-    if _normalize_amount_words(value) == _normalize_amount_words(expected):
-        return True, None
-    return False, f"Example: {expected} (format flexible)"
 
+@profiling.timed("html")
+def _we_do_check_html(
+    guided: Scenario, idx: int, links: bool, has_error: bool, layout: _OverlayLayout, bg_url: str | None
+) -> str:
+    """Check HTML for a We do step, with a slot per field value and one for the validation error."""
+    positions = layout.positions
+    we_fields = _WE_FIELDS
+    active_field = _WE_FIELDS[idx]
+    instruction_map = _instructions(guided.date, guided.payee, guided.cents)
 
-def _save_current_field_from_form(field_name: str, step_idx: int) -> None:
-    """Helper to save the current field value from form data"""
-    # This will be called when Next is clicked to auto-save current field
-    # For now, we'll use JavaScript to get the value
-    pass  # The actual saving happens in the form submission handler
+    # Legacy mode submits the overlays as a GET form; callback mode shows them read-only
+    # and takes input from the helper widget below, so nothing reloads the page
+    form_id = f"we_check_form_{idx}"
+    html_parts = [f"<form id='{form_id}' method='GET' style='position:relative;'>" if links else "<div style='position:relative;'>"]
+    html_parts.append(f"<div class='check-real' style=\"background-image:url('{bg_url or ''}'); background-size:cover; background-position:center;\">")
+    
+    # Add input overlays for ALL fields (all clickable)
+    for spec in FIELD_SPECS:
+        field = spec.name
+        is_active = (field == active_field)
+        
+        # All fields get functional inputs positioned exactly over the check
+        # Active field has blue border, others have subtle border
+        border_color = "var(--color-bright-blue)" if is_active else "rgba(0,0,0,0.2)"
+        input_style = f"position:absolute; {layout.styles[field]} border:2px solid {border_color}; border-radius:6px; background:rgba(255,255,255,0.95); padding:6px 10px; font-weight:600; color:var(--color-navy-blue); font-size:16px; outline:none; z-index:10; box-sizing:border-box;"
+        
+        input_style += spec.box_style
+        
+        # Generic placeholders, not the expected answers
+        placeholder_text = spec.placeholder
+        
+        # Use textarea for all fields since it's the only one that works
+        # Add autofocus to the active field
+        autofocus = ("autofocus" if is_active else "") if links else "readonly tabindex='-1'"
+        
+        if spec.multiline:
+            # Multi-line textarea for amount words
+            html_parts.append(f"<textarea name='we_{field}' style='{input_style} resize:none; font-family:inherit;' placeholder='{placeholder_text}' autocomplete='off' {autofocus}>{_slot(field)}</textarea>")
+        else:
+            # Single-line textarea for other fields (works better than input)
+            single_line_style = input_style + " overflow:hidden; white-space:nowrap;"
+            html_parts.append(f"<textarea name='we_{field}' style='{single_line_style} resize:none; font-family:inherit;' placeholder='{placeholder_text}' autocomplete='off' rows='1' {autofocus}>{_slot(field)}</textarea>")
+
+    # Add yellow guidance tooltip (like I Do section) - simplified without navigation buttons
+    if idx < len(we_fields):
+        p = positions[active_field]
+        # Force above for dollar amount and signature to avoid covering content
+        force_above = active_field in {"amount_numeric", "signature"}
+        place_above = force_above or (p['top'] > 12)
+        if place_above:
+            # Offset by the field's height plus extra margin
+            tip_top = max(0, p['top'] - (p['height'] + 8))
+            cls = 'tip above'
+        else:
+            tip_top = p['top'] + p['height'] + 2
+            cls = 'tip below'
+        # Prefer placing a bit to the right; clamp within bounds
+        tip_left = min(85, max(0, p['left'] + 4))
+        
+        # Create guidance content for yellow tooltip
+        guidance_text = instruction_map[active_field]
+        
+        # Create navigation buttons HTML for inside the yellow box
+        back_disabled = idx == 0
+        is_last_step = idx >= len(we_fields) - 1
+        
+        # Simple link-based navigation buttons (avoid React conflicts); legacy mode only
+        buttons_html = "<div style='margin-top:12px; display:flex; gap:8px; justify-content:space-between;'>"
+        
+        if not back_disabled:
+            buttons_html += f"<a href='?we_nav=back&screen=we_do&nav=links' style='padding:6px 12px; border:1px solid #ccc; border-radius:4px; background:#f5f5f5; color:#666; text-decoration:none; display:inline-block;'>Back</a>"
+        else:
+            buttons_html += "<span style='padding:6px 12px; border:1px solid #ccc; border-radius:4px; background:#f5f5f5; color:#666; opacity:0.5; display:inline-block;'>Back</span>"
+        
+        if is_last_step:
+            buttons_html += f"<a href='?we_nav=done&screen=we_do&nav=links' style='padding:6px 12px; border:1px solid var(--color-bright-blue); border-radius:4px; background:var(--color-bright-blue); color:white; text-decoration:none; display:inline-block;'>Done</a>"
+        else:
+            buttons_html += f"<a href='?we_nav=next&screen=we_do&nav=links' style='padding:6px 12px; border:1px solid var(--color-bright-blue); border-radius:4px; background:var(--color-bright-blue); color:white; text-decoration:none; display:inline-block;'>Next</a>"
+        
+        buttons_html += "</div>"
+        if not links:
+            buttons_html = ""
+        
+        # Add validation error display if present
+        error_html = ""
+        if has_error:
+            error_html = f"<div style='margin-top:8px; padding:8px; background:#ffebee; border:1px solid #f44336; border-radius:4px; color:#d32f2f; font-size:14px;'><strong>⚠️ {_slot('error')}</strong></div>"
+        
+        html_parts.append(
+            f"<div class='{cls}' style='left:{tip_left}%; top:{tip_top}%; min-width:300px; z-index:1000;'>"
+            f"<strong>Step {idx+1} of {len(we_fields)}</strong><br>"
+            f"{guidance_text}<br>"
+            f"{error_html}"
+            f"{buttons_html}"
+            f"</div>"
+        )
+
+    # Add hidden submit button for form
+    if links:
+        html_parts.append("<input type='submit' style='display:none;' />")
+    html_parts.append("</div>")
+    html_parts.append("</form>" if links else "</div>")
+    return "\n".join(html_parts)
 
 
+@st.fragment
+@_metered
+@_profiled
 def render_check_we_do() -> None:
-    scenario_idx = 1  # We do uses second scenario (guided with prompts)
-    guided = _get_guided_scenarios()[scenario_idx]
-    expected = {
-        "date": guided.get("date", ""),
-        "payee": guided.get("payee", ""),
-        "amount_numeric": guided.get("amount_numeric", ""),
-        "amount_words": guided.get("amount_words", ""),
-        "memo": guided.get("memo", ""),
-        "signature": guided.get("signature", ""),
-    }
+    guided = _get_catalog().first("we_do")
+    expected = guided.expected
 
     with st.container():
         st.markdown('<div class="ngpf-container">', unsafe_allow_html=True)
         st.markdown("#### We do — Semi-guided practice")
-        we_context = guided.get("context", "Scenario (Nov 1, 2025): Jordan Patel pays Oakwood Apartments $1,200.00.")
-        st.info(we_context)
-
-        positions = _load_overlay_positions()
-        bg_url = _get_check_bg_data_url()
-        we_fields = ["date","payee","amount_numeric","amount_words","memo","signature"]
-        idx = max(0, min(st.session_state.we_step, len(we_fields)-1))
-        active_field = we_fields[idx]
+        st.info(guided.context or guided.prompt)
+
+        layout = _overlay_layout()
+        bg_url = _get_check_bg_url()
+        we_fields = _WE_FIELDS
+        we = _state().we_do
+        inputs = we.inputs
+        idx = max(0, min(we.step, len(we_fields)-1))
+        links = _we_nav_mode() == "links"
+        active_spec = FIELD_SPECS[idx]
+        active_field = active_spec.name
 
         # Show instructional guidance
-        instruction_map = {
-            "date": "Enter the date in MM/DD/YYYY format (e.g., 11/01/2025)",
-            "payee": "Type the payee exactly: Oakwood Apartments",
-            "amount_numeric": "Enter the numeric amount: 1200.00",
-            "amount_words": "Write the amount in words with the cents fraction",
-            "memo": "Add a memo (optional field)",
-            "signature": "Sign your name (flexible)",
-        }
+        instruction_map = _instructions(guided.date, guided.payee, guided.cents)
         st.markdown(f"**Step {idx+1} of {len(we_fields)}:** {instruction_map[active_field]}")
 
-        # Get current values
-        current_values = {
-            "date": st.session_state.we_date,
-            "payee": st.session_state.we_payee,
-            "amount_numeric": st.session_state.we_amount_numeric,
-            "amount_words": st.session_state.we_amount_words,
-            "memo": st.session_state.we_memo,
-            "signature": st.session_state.we_signature,
-        }
-
-        # Create check with functional input overlays using HTML form
-        form_id = f"we_check_form_{idx}"
-        html_parts = [f"<form id='{form_id}' method='GET' style='position:relative;'>"]
-        html_parts.append(f"<div class='check-real' style=\"background-image:url('{bg_url or ''}'); background-size:cover; background-position:center;\">")
-        
-        # Add input overlays for ALL fields (all clickable)
-        for field in we_fields:
-            p = positions[field]
-            val = current_values.get(field, "")
-            is_active = (field == active_field)
-            
-            # All fields get functional inputs positioned exactly over the check
-            # Active field has blue border, others have subtle border
-            border_color = "var(--color-bright-blue)" if is_active else "rgba(0,0,0,0.2)"
-            input_style = f"position:absolute; left:{p['left']}%; top:{p['top']}%; width:{p['width']}%; height:{p['height']}%; border:2px solid {border_color}; border-radius:6px; background:rgba(255,255,255,0.95); padding:6px 10px; font-weight:600; color:var(--color-navy-blue); font-size:16px; outline:none; z-index:10; box-sizing:border-box;"
-            
-            if field == "signature":
-                input_style += "font-family:'Dancing Script', cursive;"
-            if field == "amount_numeric":
-                input_style += "text-align:right;"
-            
-            # Generic placeholders, not the expected answers
-            placeholder_map = {
-                "date": "MM/DD/YYYY",
-                "payee": "Name or company",
-                "amount_numeric": "0.00",
-                "amount_words": "Amount in words",
-                "memo": "(optional)",
-                "signature": "Your signature"
-            }
-            placeholder_text = placeholder_map.get(field, "")
-            
-            # Use textarea for all fields since it's the only one that works
-            # Add autofocus to the active field
-            autofocus = "autofocus" if is_active else ""
-            
-            if field == "amount_words":
-                # Multi-line textarea for amount words
-                html_parts.append(f"<textarea name='we_{field}' style='{input_style} resize:none; font-family:inherit;' placeholder='{placeholder_text}' autocomplete='off' {autofocus}>{val}</textarea>")
-            else:
-                # Single-line textarea for other fields (works better than input)
-                single_line_style = input_style + " overflow:hidden; white-space:nowrap;"
-                html_parts.append(f"<textarea name='we_{field}' style='{single_line_style} resize:none; font-family:inherit;' placeholder='{placeholder_text}' autocomplete='off' rows='1' {autofocus}>{val}</textarea>")
-
-        # Add yellow guidance tooltip (like I Do section) - simplified without navigation buttons
-        if idx < len(we_fields):
-            p = positions[active_field]
-            # Force above for dollar amount and signature to avoid covering content
-            force_above = active_field in {"amount_numeric", "signature"}
-            place_above = force_above or (p['top'] > 12)
-            if place_above:
-                # Offset by the field's height plus extra margin
-                tip_top = max(0, p['top'] - (p['height'] + 8))
-                cls = 'tip above'
-            else:
-                tip_top = p['top'] + p['height'] + 2
-                cls = 'tip below'
-            # Prefer placing a bit to the right; clamp within bounds
-            tip_left = min(85, max(0, p['left'] + 4))
-            
-            # Create guidance content for yellow tooltip
-            guidance_text = instruction_map[active_field]
-            
-            # Check for validation error (only show if user tried to advance)
-            validation_error = st.session_state.get("we_validation_error", "")
-            
-            # Create navigation buttons HTML for inside the yellow box
-            back_disabled = idx == 0
-            is_last_step = idx >= len(we_fields) - 1
-            
-            # Simple link-based navigation buttons (avoid React conflicts)
-            buttons_html = "<div style='margin-top:12px; display:flex; gap:8px; justify-content:space-between;'>"
-            
-            if not back_disabled:
-                buttons_html += f"<a href='?we_nav=back&screen=we_do' style='padding:6px 12px; border:1px solid #ccc; border-radius:4px; background:#f5f5f5; color:#666; text-decoration:none; display:inline-block;'>Back</a>"
-            else:
-                buttons_html += "<span style='padding:6px 12px; border:1px solid #ccc; border-radius:4px; background:#f5f5f5; color:#666; opacity:0.5; display:inline-block;'>Back</span>"
-            
-            if is_last_step:
-                buttons_html += f"<a href='?we_nav=done&screen=we_do' style='padding:6px 12px; border:1px solid var(--color-bright-blue); border-radius:4px; background:var(--color-bright-blue); color:white; text-decoration:none; display:inline-block;'>Done</a>"
-            else:
-                buttons_html += f"<a href='?we_nav=next&screen=we_do' style='padding:6px 12px; border:1px solid var(--color-bright-blue); border-radius:4px; background:var(--color-bright-blue); color:white; text-decoration:none; display:inline-block;'>Next</a>"
-            
-            buttons_html += "</div>"
-            
-            # Add validation error display if present
-            error_html = ""
-            if validation_error:
-                error_html = f"<div style='margin-top:8px; padding:8px; background:#ffebee; border:1px solid #f44336; border-radius:4px; color:#d32f2f; font-size:14px;'><strong>⚠️ {validation_error}</strong></div>"
-            
-            html_parts.append(
-                f"<div class='{cls}' style='left:{tip_left}%; top:{tip_top}%; min-width:300px; z-index:1000;'>"
-                f"<strong>Step {idx+1} of {len(we_fields)}</strong><br>"
-                f"{guidance_text}<br>"
-                f"{error_html}"
-                f"{buttons_html}"
-                f"</div>"
-            )
-
-        # Add hidden submit button for form
-        html_parts.append("<input type='submit' style='display:none;' />")
-        html_parts.append("</div>")
-        html_parts.append("</form>")
-        st.markdown("\n".join(html_parts), unsafe_allow_html=True)
+        # Shared HTML per step and layout; this session's answers and error are filled in escaped
+        key = ("we_do", guided.id, idx, links, bool(we.error), layout.version, bg_url)
+        template = _fragment_cache().get(
+            key, lambda: _we_do_check_html(guided, idx, links, bool(we.error), layout, bg_url)
+        )
+        check_html = template.fill({**inputs.as_dict(), "error": we.error})
+        with profiling.section("st.markdown"):
+            st.markdown(check_html, unsafe_allow_html=True)
 
         # Navigation and input processing is now handled in main() before this function runs
         
@@ -1082,48 +1494,40 @@ def render_check_we_do() -> None:
         st.markdown("---")
         st.markdown(f"**💡 Input Helper for Step {idx+1}:**")
         
-        col1, col2 = st.columns([3, 1])
-        with col1:
-            current_val = current_values.get(active_field, "")
-            if active_field == "amount_words":
-                new_val = st.text_area(f"Enter {active_field.replace('_', ' ')}", value=current_val, key=f"helper_{active_field}", height=60)
+        if not links:
+            # One incremental rerun per edit or step change: widgets write through callbacks
+            input_key = f"we_input_{active_field}"
+            if input_key not in st.session_state:
+                st.session_state[input_key] = getattr(inputs, active_field)
+            label = f"Enter {active_field.replace('_', ' ')}"
+            if active_spec.multiline:
+                st.text_area(label, key=input_key, height=60, on_change=_we_set_input, args=(active_field,))
             else:
-                new_val = st.text_input(f"Enter {active_field.replace('_', ' ')}", value=current_val, key=f"helper_{active_field}")
+                st.text_input(label, key=input_key, on_change=_we_set_input, args=(active_field,))
+            nav_cols = st.columns([1, 1, 6])
+            with nav_cols[0]:
+                st.button("Back", key="we_back", disabled=idx == 0, on_click=_we_navigate, args=("back",))
+            with nav_cols[1]:
+                if idx >= len(we_fields) - 1:
+                    st.button("Done", key="we_done", type="primary", on_click=_we_navigate, args=("done",))
+                else:
+                    st.button("Next", key="we_next", type="primary", on_click=_we_navigate, args=("next",))
+        else:
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                current_val = getattr(inputs, active_field)
+                if active_spec.multiline:
+                    st.text_area(f"Enter {active_field.replace('_', ' ')}", value=current_val, key=f"helper_{active_field}", height=60)
+                else:
+                    st.text_input(f"Enter {active_field.replace('_', ' ')}", value=current_val, key=f"helper_{active_field}")
         
-        with col2:
-            if st.button("💾 Save", key=f"save_{active_field}"):
-                # Update session state with the new value
-                if active_field == "date":
-                    st.session_state.we_date = new_val
-                elif active_field == "payee":
-                    st.session_state.we_payee = new_val
-                elif active_field == "amount_numeric":
-                    st.session_state.we_amount_numeric = new_val.lstrip('$').strip()
-                elif active_field == "amount_words":
-                    st.session_state.we_amount_words = new_val
-                elif active_field == "memo":
-                    st.session_state.we_memo = new_val
-                elif active_field == "signature":
-                    st.session_state.we_signature = new_val
-                st.rerun()
+            with col2:
+                st.button("💾 Save", key=f"save_{active_field}", on_click=_we_save_helper, args=(active_field,))
 
         # Validation for current field
-        ok, msg = False, None
-        current_value = current_values[active_field]
-        
-        if active_field == "date":
-            ok, msg = _validate_date(current_value) if current_value else (False, None)
-        elif active_field == "payee":
-            ok, msg = _validate_payee(current_value, expected["payee"]) if current_value else (False, None)
-        elif active_field == "amount_numeric":
-            ok, msg = _validate_amount_numeric(current_value, expected["amount_numeric"]) if current_value else (False, None)
-        elif active_field == "amount_words":
-            ok, msg = _validate_amount_words(current_value, expected["amount_words"]) if current_value else (False, None)
-        elif active_field == "memo":
-            ok, msg = True, None  # Memo is always valid
-        elif active_field == "signature":
-            ok = len(current_value.strip()) > 0
-            msg = None if ok else "Add your signature"
+        current_value = getattr(inputs, active_field)
+        with profiling.section("validation"):
+            ok, msg = active_spec.validate(current_value, expected, guided.cents) if current_value else (False, None)
 
         # Show validation feedback if needed
         if current_value and msg is not None:
@@ -1133,38 +1537,20 @@ def render_check_we_do() -> None:
             )
 
         # Show completion validation if Done was clicked or all steps are done
-        if st.session_state.get("we_completed", False) or (idx >= len(we_fields) - 1 and all(current_values.values())):
+        if we.completed or (idx >= len(we_fields) - 1 and all(getattr(inputs, f) for f in we_fields)):
             st.markdown("### 🎉 Check Complete!")
             st.success("Great job! You've filled out all the fields. Let's validate your check:")
             
-            # Run validation on all fields
-            all_valid = True
-            validations = {}
-            
-            # Validate each field
-            validations["Date"] = _validate_date(current_values["date"])
-            validations["Payee"] = _validate_payee(current_values["payee"], expected["payee"])
-            validations["Amount Numeric"] = _validate_amount_numeric(current_values["amount_numeric"], expected["amount_numeric"])
-            validations["Amount Words"] = _validate_amount_words(current_values["amount_words"], expected["amount_words"])
-            
-            # Show results
-            for label, (valid, error_msg) in validations.items():
-                if valid:
-                    st.markdown(f"✅ **{label}**: Correct")
-                else:
-                    st.markdown(f"❌ **{label}**: {error_msg}")
-                    all_valid = False
-            
-            # Check memo and signature
-            if current_values["signature"].strip():
-                st.markdown("✅ **Signature**: Present")
-            else:
-                st.markdown("⚠️ **Signature**: Add your signature")
-                all_valid = False
-                
-            if current_values["memo"].strip():
-                st.markdown("ℹ️ **Memo**: Added (optional)")
-            
+            # Run validation on every field in one pass
+            values = inputs.as_dict()
+            with profiling.section("validation"):
+                results = _validate_check(values, expected)
+            for spec in FIELD_SPECS:
+                line = _summary_line(spec, values[spec.name], *results[spec.name])
+                if line is not None:
+                    st.markdown(f"{line[0]} **{spec.label}**: {line[1]}")
+            all_valid = all(ok for ok, _ in results.values())
+
             if all_valid:
                 st.balloons()
                 st.success("🎉 Perfect! Your check is complete and correct!")
@@ -1172,109 +1558,69 @@ def render_check_we_do() -> None:
         st.markdown("</div>", unsafe_allow_html=True)
 
 
+@st.fragment
+@_metered
+@_profiled
 def render_check_you_do() -> None:
-    scenario_idx = 2  # You do uses third scenario (independent)
-    guided = _get_guided_scenarios()[scenario_idx]
-    expected = {
-        "date": guided.get("date", ""),
-        "payee": guided.get("payee", ""),
-        "amount_numeric": guided.get("amount_numeric", ""),
-        "amount_words": guided.get("amount_words", ""),
-        "memo": guided.get("memo", ""),
-        "signature": guided.get("signature", ""),
-    }
-
-    # Keep separate state keys for You do so We do inputs are preserved when switching tabs
-    for key in [
-        "you_date",
-        "you_payee",
-        "you_amount_numeric",
-        "you_amount_words",
-        "you_memo",
-        "you_signature",
-    ]:
-        st.session_state.setdefault(key, "")
+    guided = _you_do_scenario()
+    expected = guided.expected
+    # You do keeps its own inputs so We do answers are preserved when switching tabs
+    you = _state().you_do
 
     with st.container():
         st.markdown('<div class="ngpf-container">', unsafe_allow_html=True)
         st.markdown("#### You do — Independent practice")
-        scenario = _get_scenarios()[scenario_idx]
-        st.info(scenario["prompt"])  # Minimal prompting per requirements
-
-        positions = _load_overlay_positions()
+        st.info(guided.prompt)  # Minimal prompting per requirements
+        seed = _generated_seed(guided.id)
+        if seed is not None:
+            st.caption(f"Practice check #{seed} — add ?seed={seed} to the URL to show this same check.")
+
+        layout = _overlay_layout()
+        positions = layout.positions
+        # The component iframe cannot resolve app-relative static URLs
         bg = _get_check_bg_data_url()
-        values = {
-            "date": st.session_state.you_date,
-            "payee": st.session_state.you_payee,
-            "amount_numeric": st.session_state.you_amount_numeric,
-            "amount_words": st.session_state.you_amount_words,
-            "memo": st.session_state.you_memo,
-            "signature": st.session_state.you_signature,
-        }
+        values = you.inputs.as_dict()
+        # Client mode checks each field in the browser as it is typed; "Check my work" stays authoritative
+        with profiling.section("validation"):
+            rules = _client_rules(expected) if _validation_mode() == "client" else None
         try:
-            updated = _check_overlay_component(bg_url=bg, positions=positions, values=values, editable=True)
+            updated = _check_overlay_component(
+                bg_url=bg, positions=positions, values=values, editable=True, rules=rules
+            )
         except Exception:
             html = ["<div class='check-real'>"]
             def ip(name):
-                p = positions[name]
-                style = f"left:{p['left']}%; top:{p['top']}%; width:{p['width']}%; height:{p['height']}%;"
                 val = values.get(name, "")
-                return f"<textarea style='position:absolute; {style}; resize:none; border:2px dashed var(--color-bright-blue); border-radius:6px; background:rgba(255,255,255,0.02); padding:6px 10px;' name='{name}'>{val}</textarea>"
-            for k in ["date","payee","amount_numeric","amount_words","memo","signature"]:
+                return f"<textarea style='position:absolute; {layout.styles[name]} resize:none; border:2px dashed var(--color-bright-blue); border-radius:6px; background:rgba(255,255,255,0.02); padding:6px 10px;' name='{name}'>{val}</textarea>"
+            for k in FIELD_NAMES:
                 html.append(ip(k))
             html.append("</div>")
             st.markdown("\n".join(html), unsafe_allow_html=True)
             updated = values
-        st.session_state.you_date = updated.get("date", "")
-        st.session_state.you_payee = updated.get("payee", "")
-        st.session_state.you_amount_numeric = updated.get("amount_numeric", "").lstrip('$').strip()
-        st.session_state.you_amount_words = updated.get("amount_words", "")
-        st.session_state.you_memo = updated.get("memo", "")
-        st.session_state.you_signature = updated.get("signature", "")
+        you.inputs.update({spec.name: spec.normalize(updated.get(spec.name, "")) for spec in FIELD_SPECS})
 
-        cols = st.columns([1, 1, 6])
+        cols = st.columns([1, 1, 1, 5])
         show_summary = False
         with cols[0]:
             if st.button("Check my work", type="primary"):
                 show_summary = True
         with cols[1]:
-            if st.button("Clear", type="secondary"):
-                for k in [
-                    "you_date",
-                    "you_payee",
-                    "you_amount_numeric",
-                    "you_amount_words",
-                    "you_memo",
-                    "you_signature",
-                ]:
-                    st.session_state[k] = ""
-                st.rerun()
+            st.button("Clear", type="secondary", on_click=_you_clear)
+        with cols[2]:
+            st.button("New check", type="secondary", on_click=_next_practice_check)
 
         if show_summary:
-            checks = {
-                "Date": _validate_date(st.session_state.you_date),
-                "Payee": _validate_payee(st.session_state.you_payee, expected["payee"]),
-                "$ Amount": _validate_amount_numeric(st.session_state.you_amount_numeric, expected["amount_numeric"]),
-                "Amount in Words": _validate_amount_words(st.session_state.you_amount_words, expected["amount_words"]),
-            }
+            with profiling.section("validation"):
+                results = _validate_check(updated, expected)
             st.markdown("### Results")
-            all_ok = True
-            for label, (ok, msg) in checks.items():
-                if ok:
-                    st.markdown(f"- ✅ {label}: Correct")
-                else:
-                    st.markdown(f"- ❌ {label}: {msg}")
-                    all_ok = False
-            # Memo and signature lightweight checks
-            if st.session_state.you_signature.strip():
-                st.markdown("- ✅ Signature: Present")
-            else:
-                st.markdown("- ⚠️ Signature: Add your name")
-                all_ok = False
-            if st.session_state.you_memo.strip():
-                st.markdown("- ℹ️ Memo: Not required, but helpful")
-
-            if all_ok:
+            for spec in FIELD_SPECS:
+                ok, msg = results[spec.name]
+                metrics.validation("you_do", spec.name, ok)
+                line = _summary_line(spec, updated.get(spec.name, ""), ok, msg)
+                if line is not None:
+                    st.markdown(f"- {line[0]} {spec.label}: {line[1]}")
+
+            if all(ok for ok, _ in results.values()):
                 st.success("Great job! Everything looks correct.")
             else:
                 st.info("Review the items marked above and try again.")
@@ -1282,186 +1628,85 @@ def render_check_you_do() -> None:
         st.markdown("</div>", unsafe_allow_html=True)
 
 
+@_metered
+@_profiled
 def main() -> None:
     inject_global_styles()
-    _ensure_session_state_defaults()
+    state = _state()
+    we = state.we_do
     
-    # Handle We Do input updates and navigation BEFORE _ensure_flow_defaults to prevent screen reset
+    # Handle legacy We Do input updates and navigation before rendering
     qp = st.query_params
     
-    # Process input field updates first
-    we_fields = ["date","payee","amount_numeric","amount_words","memo","signature"]
+    # Process input field updates first; the legacy form submits every field at once
     input_updated = False
-    for field in we_fields:
-        param_name = f"we_{field}"
+    for spec in FIELD_SPECS:
+        param_name = f"we_{spec.name}"
         if param_name in qp:
-            new_value = qp[param_name]
-            # Update session state
-            if field == "date":
-                if new_value != st.session_state.get("we_date", ""):
-                    st.session_state.we_date = new_value
-                    input_updated = True
-            elif field == "payee":
-                if new_value != st.session_state.get("we_payee", ""):
-                    st.session_state.we_payee = new_value
-                    input_updated = True
-            elif field == "amount_numeric":
-                clean_value = new_value.lstrip('$').strip()
-                if clean_value != st.session_state.get("we_amount_numeric", ""):
-                    st.session_state.we_amount_numeric = clean_value
-                    input_updated = True
-            elif field == "amount_words":
-                if new_value != st.session_state.get("we_amount_words", ""):
-                    st.session_state.we_amount_words = new_value
-                    input_updated = True
-            elif field == "memo":
-                if new_value != st.session_state.get("we_memo", ""):
-                    st.session_state.we_memo = new_value
-                    input_updated = True
-            elif field == "signature":
-                if new_value != st.session_state.get("we_signature", ""):
-                    st.session_state.we_signature = new_value
-                    input_updated = True
-            break
+            new_value = spec.normalize(qp[param_name])
+            if new_value != getattr(we.inputs, spec.name):
+                setattr(we.inputs, spec.name, new_value)
+                input_updated = True
     
     # If input was updated, clear params and rerun
     if input_updated:
         st.query_params.clear()
         st.rerun()
     
-    # Handle navigation actions  
+    # Handle navigation actions from the legacy link mode
     if "we_nav" in qp:
         # Preserve screen context from URL
         if "screen" in qp:
-            st.session_state.screen = qp["screen"]
-        nav_action = qp["we_nav"]
-        current_step = st.session_state.we_step
-        we_fields = ["date","payee","amount_numeric","amount_words","memo","signature"]
-        
-        # Get current field and value for validation
-        current_field = we_fields[current_step] if current_step < len(we_fields) else None
-        current_values = {
-            "date": st.session_state.we_date,
-            "payee": st.session_state.we_payee,
-            "amount_numeric": st.session_state.we_amount_numeric,
-            "amount_words": st.session_state.we_amount_words,
-            "memo": st.session_state.we_memo,
-            "signature": st.session_state.we_signature,
-        }
-        
-        # Get expected values from scenario
-        scenarios = _get_guided_scenarios()
-        we_scenario = scenarios[1] if len(scenarios) > 1 else scenarios[0]  # "We Do" is index 1, fallback to 0
-        expected = {
-            "date": we_scenario.get("date", ""),
-            "payee": we_scenario.get("payee", ""),
-            "amount_numeric": we_scenario.get("amount_numeric", ""),
-            "amount_words": we_scenario.get("amount_words", ""),
-            "memo": we_scenario.get("memo", ""),
-            "signature": we_scenario.get("signature", ""),
-        }
-        
-        if nav_action == "back" and current_step > 0:
-            st.session_state.we_step = current_step - 1
-            st.session_state.we_validation_error = ""  # Clear any validation error
-        elif nav_action == "next" and current_step < len(we_fields) - 1:
-            # Validate current field before allowing progression
-            can_advance = True
-            error_msg = ""
-            
-            if current_field:
-                current_value = current_values.get(current_field, "")
-                
-                if current_field == "date":
-                    if not current_value:
-                        can_advance, error_msg = False, "Please enter a date before continuing"
-                    else:
-                        ok, msg = _validate_date(current_value)
-                        can_advance, error_msg = ok, msg or "Please enter a valid date (MM/DD/YYYY)"
-                elif current_field == "payee":
-                    if not current_value:
-                        can_advance, error_msg = False, "Please enter the payee name before continuing"
-                    else:
-                        ok, msg = _validate_payee(current_value, expected["payee"])
-                        can_advance, error_msg = ok, msg or f"Please enter '{expected['payee']}'"
-                elif current_field == "amount_numeric":
-                    if not current_value:
-                        can_advance, error_msg = False, "Please enter the dollar amount before continuing"
-                    else:
-                        ok, msg = _validate_amount_numeric(current_value, expected["amount_numeric"])
-                        can_advance, error_msg = ok, msg or f"Please enter '{expected['amount_numeric']}'"
-                elif current_field == "amount_words":
-                    if not current_value:
-                        can_advance, error_msg = False, "Please write out the amount in words before continuing"
-                    else:
-                        ok, msg = _validate_amount_words(current_value, expected["amount_words"])
-                        can_advance, error_msg = ok, msg or f"Please write '{expected['amount_words']}'"
-                elif current_field == "memo":
-                    # Memo is optional, always allow advancement
-                    can_advance = True
-                elif current_field == "signature":
-                    if not current_value or len(current_value.strip()) == 0:
-                        can_advance, error_msg = False, "Please add your signature before continuing"
-                    else:
-                        can_advance = True
-            
-            if can_advance:
-                st.session_state.we_step = current_step + 1
-                st.session_state.we_validation_error = ""  # Clear any validation error
-            else:
-                st.session_state.we_validation_error = error_msg
-                
-        elif nav_action == "done":
-            # Validate final field (signature) before completion
-            signature_value = current_values.get("signature", "")
-            if signature_value and len(signature_value.strip()) > 0:
-                st.session_state.we_completed = True
-                st.session_state.we_validation_error = ""
-            else:
-                st.session_state.we_validation_error = "Please add your signature before finishing"
-        
+            state.screen = qp["screen"]
+        _we_navigate(qp["we_nav"])
         # Clear query params and rerun
+        nav_mode = qp.get("nav")
         st.query_params.clear()
+        if nav_mode:
+            st.query_params["nav"] = nav_mode
         st.rerun()
     
-    # Now set defaults AFTER navigation is handled
-    _ensure_flow_defaults()
-    
+    # Clear validation error when starting fresh (step 0 with no input)
+    if we.step == 0 and we.inputs.is_blank():
+        we.error = ""
+
     render_header()
     render_top_nav()
 
-    screen = st.session_state.screen
+    screen = state.screen
     if screen == "i_do":
         # auto-fill walkthrough
-        st.session_state.mode = "I do"
+        state.mode = "I do"
         render_check_guided()
         cols = st.columns([1, 1, 6])
         with cols[0]:
             if st.button("Next: We do", type="primary"):
-                st.session_state.screen = "we_do"
+                state.screen = "we_do"
                 st.rerun()
     elif screen == "we_do":
-        st.session_state.mode = "We do"
+        state.mode = "We do"
         render_check_we_do()
         cols = st.columns([1, 1, 6])
         with cols[0]:
             if st.button("Next: You do", type="primary"):
-                st.session_state.screen = "you_do"
+                state.screen = "you_do"
                 st.rerun()
     elif screen == "you_do":
-        st.session_state.mode = "You do"
+        state.mode = "You do"
         render_check_you_do()
         cols = st.columns([1, 1, 6])
         with cols[0]:
             if st.button("Finish", type="primary"):
-                st.session_state.screen = "scenario"
+                state.screen = "scenario"
                 st.rerun()
     elif screen == "calibrate":
         render_calibrate()
 
 
+@_profiled
 def render_calibrate() -> None:
-    positions = _load_overlay_positions() or st.session_state["overlay_positions"]
+    # Sliders edit a private copy; the cached layout is shared by every session
+    positions = {k: dict(p) for k, p in _load_overlay_positions().items()}
     with st.container():
         st.markdown('<div class="ngpf-container">', unsafe_allow_html=True)
         st.markdown("### Calibrate overlays (dev-only)")
@@ -1511,13 +1756,51 @@ def render_calibrate() -> None:
                 st.success("Saved to assets/overlay.json")
         with cancel_col:
             if st.button("Back to I do"):
-                st.session_state.screen = "i_do"
+                _state().screen = "i_do"
                 st.rerun()
 
         st.markdown('</div>', unsafe_allow_html=True)
 
 
+def render_profile_panel() -> None:
+    """Dev panel for ``?profile=``: the last rerun's sections, recent reruns and dumps."""
+    history = st.session_state.get(_PROFILES_KEY)
+    if not history:
+        return
+    last = history[-1]
+    with st.expander(f"Rerun profile: {last.name} {last.total_ms:.1f} ms", expanded=False):
+        st.dataframe(last.rows(), hide_index=True)
+        split = last.ownership()
+        if split is not None:
+            st.caption(
+                f"Self time (cProfile): app {split['app']:.1f} ms, Streamlit {split['streamlit']:.1f} ms, "
+                f"other {split['other']:.1f} ms"
+            )
+        st.caption("Recent reruns: " + ", ".join(f"{p.name} {p.total_ms:.0f} ms" for p in reversed(history)))
+        cols = st.columns(2)
+        with cols[0]:
+            st.download_button(
+                "Speedscope JSON",
+                profiling.speedscope(history),
+                file_name="reruns.speedscope.json",
+                mime="application/json",
+                on_click="ignore",
+            )
+        pstats_dump = last.pstats_bytes()
+        with cols[1]:
+            if pstats_dump is not None:
+                st.download_button(
+                    "pstats (last rerun)", pstats_dump, file_name="rerun.pstats", on_click="ignore"
+                )
+            elif last.cprofile_busy:
+                st.caption("Another session is running ?profile=full; this rerun has sections only")
+            else:
+                st.caption("Add ?profile=full for a cProfile/pstats dump")
+
+
 if __name__ == "__main__":
     main()
+    if _profile_mode() is not None:
+        render_profile_panel()
 
 
@@ -0,0 +1,52 @@
+"""Per-rerun cost of the I do / We do check HTML: building it vs a cached frame or template.
+
+Run from the project root:  python benchmarks/bench_check_html.py
+"""
+
+from __future__ import annotations
+
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import app  # noqa: E402
+from state import CheckInputs  # noqa: E402
+
+
+def main() -> None:
+    layout = app._overlay_layout()
+    bg_url = app._get_check_bg_url()
+    i_do = app._get_catalog().first("i_do")
+    we_do = app._get_catalog().first("we_do")
+    inputs = CheckInputs(date="10/20/2025", payee="Oakwood Apartments", amount_numeric="1200.00")
+    cache = app._FragmentCache()
+    n = 20_000
+
+    cases = {
+        "I do step 3": (
+            lambda: app._i_do_check_html(i_do, 2, layout, bg_url),
+            lambda: cache.frames(("i_do", i_do.id, layout.version, bg_url),
+                                 lambda: [app._i_do_check_html(i_do, s, layout, bg_url) for s in range(-1, 6)])[3],
+        ),
+        "We do step 3": (
+            lambda: app._HtmlTemplate(app._we_do_check_html(we_do, 2, False, True, layout, bg_url)).fill(
+                {**inputs.as_dict(), "error": "Please enter '1200.00'"}),
+            lambda: cache.get(("we_do", we_do.id, 2, False, True, layout.version, bg_url),
+                              lambda: app._we_do_check_html(we_do, 2, False, True, layout, bg_url)).fill(
+                {**inputs.as_dict(), "error": "Please enter '1200.00'"}),
+        ),
+    }
+    print(f"background: {'none' if not bg_url else bg_url[:40]}  ({len(bg_url or '')} chars)")
+    for label, (build, cached) in cases.items():
+        assert build() == cached()
+        build_us = min(timeit.repeat(build, number=n, repeat=3)) / n * 1e6
+        cached_us = min(timeit.repeat(cached, number=n, repeat=3)) / n * 1e6
+        print(f"{label:<14} build {build_us:7.2f} us   cached {cached_us:6.2f} us   ({build_us / cached_us:.1f}x)")
+    player = app._i_do_player(i_do, layout, bg_url)
+    print(f"I do client player: {len(player.encode('utf-8'))} bytes once, then 0 server runs per Next/Replay")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Time the network critical path to the first styled check, bundled fonts vs the CDN.
+
+Starts ``streamlit run app.py`` on a free port, then replays what the browser must
+fetch before the check renders with its final fonts: the page shell, the published
+stylesheet and its preloads, whatever the stylesheet pulls in (the Google Fonts CSS
+and its WOFF2 files, or the bundled WOFF2 files), and the check background. Fetches
+that a browser issues together run in parallel. A CDN that is blocked shows up as a
+failure after ``--timeout`` seconds, which is how long the stylesheet's @import holds
+up the check in a locked-down network.
+
+Run from the project root:  python benchmarks/bench_first_render.py
+Without assets/fonts (see tools/fetch_fonts.py), pass --synthetic-fonts to time the
+bundled path with same-sized placeholder files.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import app  # noqa: E402
+
+IMPORT_RE = re.compile(r"@import url\('([^']+)'\)")
+PRELOAD_RE = re.compile(r"<link rel='preload' href='([^']+)'")
+URL_RE = re.compile(r"url\('?([^')]+)'?\)")
+LATIN_WOFF2_RE = re.compile(r"/\* latin \*/\s*@font-face\s*{[^}]*?url\((https://[^)]+\.woff2)\)", re.S)
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+SYNTHETIC_FONT_BYTES = 18_000  # typical Latin-subset WOFF2
+
+
+class Fetcher:
+    def __init__(self, timeout: float) -> None:
+        self.timeout = timeout
+        self.requests = 0
+        self.bytes = 0
+        self.errors: list[str] = []
+
+    def get(self, url: str) -> bytes:
+        self.requests += 1
+        request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                body = response.read()
+        except OSError as exc:
+            self.errors.append(f"{urllib.parse.urlsplit(url).netloc}: {exc}")
+            return b""
+        self.bytes += len(body)
+        return body
+
+    def get_all(self, urls: list[str]) -> list[bytes]:
+        if not urls:
+            return []
+        with ThreadPoolExecutor(len(urls)) as pool:
+            return list(pool.map(self.get, urls))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_server(port: int) -> subprocess.Popen:
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", "app.py", "--server.port", str(port), "--server.headless", "true"],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1).read()
+            return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise SystemExit("streamlit did not start")
+
+
+def critical_path(base: str, payload: str, bg_url: str | None, timeout: float) -> tuple[float, Fetcher]:
+    fetch = Fetcher(timeout)
+    start = time.perf_counter()
+    fetch.get(base)  # page shell
+    sheet_href = IMPORT_RE.search(payload).group(1)
+    sheet_base = urllib.parse.urljoin(base, sheet_href)
+    preloads = [urllib.parse.urljoin(base, u) for u in PRELOAD_RE.findall(payload)]
+    sheet, *_ = fetch.get_all([sheet_base, *preloads])
+
+    css = sheet.decode("utf-8", "replace")
+    wave = []
+    for imported in IMPORT_RE.findall(css):
+        # The CDN font CSS must arrive before its WOFF2 URLs are known
+        font_css = fetch.get(urllib.parse.urljoin(sheet_base, imported)).decode("utf-8", "replace")
+        wave += LATIN_WOFF2_RE.findall(font_css)
+    for url in URL_RE.findall(css):
+        absolute = urllib.parse.urljoin(sheet_base, url)
+        if not url.startswith("http") and absolute not in preloads:
+            wave.append(absolute)
+    if bg_url and not bg_url.startswith("data:") and urllib.parse.urljoin(base, bg_url) not in wave:
+        wave.append(urllib.parse.urljoin(base, bg_url))
+    fetch.get_all(wave)
+    return (time.perf_counter() - start) * 1000, fetch
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=10.0, help="seconds before a fetch counts as blocked")
+    parser.add_argument("--synthetic-fonts", action="store_true", help="time the bundled path with placeholder files")
+    args = parser.parse_args()
+
+    if args.synthetic_fonts:
+        fonts_dir = Path(tempfile.mkdtemp())
+        for _, _, stem, _ in app._FONT_FACES:
+            (fonts_dir / f"{stem}.woff2").write_bytes(bytes(SYNTHETIC_FONT_BYTES))
+        app._FONTS_DIR = fonts_dir
+
+    port = _free_port()
+    proc = _start_server(port)
+    base = f"http://127.0.0.1:{port}/"
+    try:
+        bg_url = app._get_check_bg_url()
+        modes = [("CDN (Google Fonts @import)", False)]
+        if app._bundled_fonts(app._STATIC_DIR) is not None:
+            modes.insert(0, ("bundled (app/static WOFF2)", True))
+        else:
+            print("assets/fonts is empty: run tools/fetch_fonts.py or pass --synthetic-fonts")
+        for label, bundled in modes:
+            payload = app._global_stylesheet(bg_url, True, bundled)
+            times, last = [], None
+            for _ in range(args.rounds):
+                elapsed, last = critical_path(base, payload, bg_url, args.timeout)
+                times.append(elapsed)
+            status = f"blocked ({last.errors[0]})" if last.errors else "ok"
+            print(
+                f"{label:<28} median {statistics.median(times):8.1f} ms   "
+                f"{last.requests} requests  {last.bytes:>7} bytes   {status}"
+            )
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
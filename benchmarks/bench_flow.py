@@ -0,0 +1,249 @@
+"""Scripted I do -> We do -> You do flow, gated against a stored baseline.
+
+Drives app.py through AppTest the way a student does: I do Next and Replay, We do
+typing with Next/Done and the legacy ``?nav=links`` Save, You do "Check my work",
+New check and Reset. Every interaction is one AppTest run. Per screen the harness
+reports the median wall time per rerun, the median ForwardMsg delta bytes per rerun
+and the tracemalloc peak of the screen's heaviest rerun (taken in a separate pass,
+since tracing slows the script down), then compares them with
+benchmarks/baseline_flow.json. Any metric more than the threshold above its baseline
+fails the run with exit status 1. Wall times depend on the machine, so record the
+baseline on the machine that runs the gate. As in bench_fragments.py, one
+ScriptCache is shared across runs, as the server's Runtime does.
+
+Run from the project root:
+  python benchmarks/bench_flow.py                    compare with the baseline
+  python benchmarks/bench_flow.py --update-baseline  record a new baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import streamlit  # noqa: E402
+import streamlit.testing.v1.app_test as app_test  # noqa: E402
+import streamlit.testing.v1.local_script_runner as local_script_runner  # noqa: E402
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner  # noqa: E402
+
+from fields import FIELD_SPECS  # noqa: E402
+from scenarios import get_catalog  # noqa: E402
+
+APP = str(ROOT / "app.py")
+BASELINE = Path(__file__).with_name("baseline_flow.json")
+SCREENS = ("i_do", "we_do", "we_do_links", "you_do")
+METRICS = ("ms_per_rerun", "delta_bytes_per_rerun", "peak_kib")
+DEFAULT_THRESHOLD = 25.0
+ROUNDS = 5
+_last_msgs: list = []
+
+
+@contextmanager
+def _instrumented() -> Iterator[None]:
+    """Share one ScriptCache across AppTest runs and keep each run's ForwardMsgs."""
+    original_run = LocalScriptRunner.run
+    original_caches = app_test.ScriptCache, local_script_runner.ScriptCache
+    shared = ScriptCache()
+
+    def recording_run(self, *args, **kwargs):
+        try:
+            return original_run(self, *args, **kwargs)
+        finally:
+            _last_msgs[:] = list(self.forward_msgs())
+
+    LocalScriptRunner.run = recording_run
+    app_test.ScriptCache = local_script_runner.ScriptCache = lambda: shared
+    try:
+        yield
+    finally:
+        LocalScriptRunner.run = original_run
+        app_test.ScriptCache, local_script_runner.ScriptCache = original_caches
+
+
+class _Recorder:
+    """Time one interaction at a time and file the sample under its screen."""
+
+    def __init__(self, trace_memory: bool) -> None:
+        self.trace_memory = trace_memory
+        self.samples: dict[str, list[tuple[float, int, int]]] = defaultdict(list)
+
+    def __call__(self, screen: str, action: Callable[[], object]) -> None:
+        base = 0
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        action()
+        ms = (time.perf_counter() - start) * 1000
+        peak = tracemalloc.get_traced_memory()[1] - base if self.trace_memory else 0
+        delta_bytes = sum(m.ByteSize() for m in _last_msgs if m.HasField("delta"))
+        self.samples[screen].append((ms, delta_bytes, peak))
+
+
+def _button(at: AppTest, label: str):
+    return next(b for b in at.button if b.label == label)
+
+
+def _expect(condition: bool, what: str) -> None:
+    # A flow that silently stops advancing would time the wrong screens
+    if not condition:
+        raise RuntimeError(f"flow did not reach the expected state: {what}")
+
+
+def _answers(scenario) -> dict[str, str]:
+    return {**scenario.expected, "memo": scenario.memo, "signature": scenario.signature}
+
+
+def run_flow(record: _Recorder) -> None:
+    """One student through all three modes, then a legacy-links We do session."""
+    catalog = get_catalog()
+    at = AppTest.from_file(APP, default_timeout=30)
+    record("i_do", at.run)
+    state = at.session_state["check"]
+    for _ in catalog.first("i_do").steps:
+        record("i_do", lambda: _button(at, "Next").click().run())
+    record("i_do", lambda: _button(at, "Replay").click().run())
+    record("we_do", lambda: _button(at, "Next: We do").click().run())
+    _expect(state.screen == "we_do", "We do screen")
+
+    answers = _answers(catalog.first("we_do"))
+    for spec in FIELD_SPECS:
+        key = f"we_input_{spec.name}"
+        widget = at.text_area(key=key) if spec.multiline else at.text_input(key=key)
+        record("we_do", lambda: widget.input(answers[spec.name]).run())
+        nav = "we_done" if spec is FIELD_SPECS[-1] else "we_next"
+        record("we_do", lambda: at.button(key=nav).click().run())
+    _expect(state.we_do.completed, "We do completed")
+
+    record("you_do", lambda: _button(at, "Next: You do").click().run())
+    _expect(state.screen == "you_do", "You do screen")
+    state.you_do.inputs.update(_answers(catalog.first("you_do")))
+    record("you_do", lambda: _button(at, "Check my work").click().run())
+    _expect(any("Results" in m.value for m in at.markdown), "You do results")
+    record("you_do", lambda: _button(at, "New check").click().run())
+    record("you_do", lambda: _button(at, "Reset").click().run())
+    _expect(at.session_state["check"].screen == "i_do", "reset to I do")
+
+    links = AppTest.from_file(APP, default_timeout=30)
+    links.query_params["nav"] = "links"
+    links.run()
+    links.session_state["check"].screen = "we_do"
+    record("we_do_links", links.run)
+    for spec in FIELD_SPECS:
+        key = f"helper_{spec.name}"
+        widget = links.text_area(key=key) if spec.multiline else links.text_input(key=key)
+        widget.set_value(answers[spec.name])
+        record("we_do_links", lambda: links.button(key=f"save_{spec.name}").click().run())
+        if spec is not FIELD_SPECS[-1]:
+            # The legacy Next link reloads the page with ?we_nav=next
+            links.query_params.update({"we_nav": "next", "screen": "we_do"})
+            record("we_do_links", links.run)
+    _expect(links.session_state["check"].we_do.inputs.signature == answers["signature"], "links Save")
+
+
+def measure(rounds: int = ROUNDS) -> dict[str, dict[str, float]]:
+    """Per-screen medians over ``rounds`` timed flows plus one traced flow for memory."""
+    with _instrumented():
+        run_flow(_Recorder(trace_memory=False))  # warm caches and the shared ScriptCache
+        timed = _Recorder(trace_memory=False)
+        for _ in range(rounds):
+            run_flow(timed)
+        traced = _Recorder(trace_memory=True)
+        tracemalloc.start()
+        try:
+            run_flow(traced)
+        finally:
+            tracemalloc.stop()
+    return {
+        screen: {
+            "ms_per_rerun": round(statistics.median(s[0] for s in timed.samples[screen]), 2),
+            "delta_bytes_per_rerun": round(statistics.median(s[1] for s in timed.samples[screen])),
+            "peak_kib": round(max(s[2] for s in traced.samples[screen]) / 1024, 1),
+        }
+        for screen in SCREENS
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Regressions of more than ``threshold`` percent against the baseline's screens."""
+    regressions = []
+    for screen, base_metrics in baseline["screens"].items():
+        current = results.get(screen)
+        if current is None:
+            regressions.append(f"{screen}: not measured in this run")
+            continue
+        for metric in METRICS:
+            value, base = current[metric], base_metrics.get(metric)
+            if base and value > base * (1 + threshold / 100):
+                regressions.append(f"{screen} {metric}: {value:g} vs baseline {base:g} (+{(value / base - 1) * 100:.0f}%)")
+    return regressions
+
+
+def _change(value: float, base: float | None) -> str:
+    return f"{(value / base - 1) * 100:+6.0f}%" if base else "       "
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=ROUNDS, help="timed flows per run")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--threshold", type=float, help="allowed increase in percent (default: the baseline's)")
+    parser.add_argument("--update-baseline", action="store_true", help="write this run as the new baseline")
+    args = parser.parse_args(argv)
+
+    results = measure(args.rounds)
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline.exists() else None
+    base_screens = baseline["screens"] if baseline else {}
+    print(f"{'screen':<13}{'ms/rerun':>10}{'':>8}{'delta B/rerun':>15}{'':>8}{'peak KiB':>10}{'':>8}")
+    for screen, metrics in results.items():
+        base = base_screens.get(screen, {})
+        print(
+            f"{screen:<13}{metrics['ms_per_rerun']:>10.1f} {_change(metrics['ms_per_rerun'], base.get('ms_per_rerun'))}"
+            f"{metrics['delta_bytes_per_rerun']:>15} {_change(metrics['delta_bytes_per_rerun'], base.get('delta_bytes_per_rerun'))}"
+            f"{metrics['peak_kib']:>10.1f} {_change(metrics['peak_kib'], base.get('peak_kib'))}"
+        )
+
+    if args.update_baseline:
+        threshold = args.threshold or (baseline or {}).get("threshold_pct", DEFAULT_THRESHOLD)
+        args.baseline.write_text(
+            json.dumps(
+                {
+                    "threshold_pct": threshold,
+                    "python": sys.version.split()[0],
+                    "streamlit": streamlit.__version__,
+                    "screens": results,
+                },
+                indent=2,
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+        print(f"baseline written to {args.baseline}")
+        return 0
+    if baseline is None:
+        print(f"no baseline at {args.baseline}; record one with --update-baseline")
+        return 1
+
+    threshold = args.threshold if args.threshold is not None else baseline.get("threshold_pct", DEFAULT_THRESHOLD)
+    regressions = compare(results, baseline, threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    print(f"{len(regressions)} regression(s) over {threshold:g}% of baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""Time an interaction inside the check area: full-app rerun vs fragment-scoped rerun.
+
+Before the check renderers were fragments, every click or edit in the check re-ran
+main(): styles, header, top nav and the screen. Now an interaction in the check
+reruns only its fragment. AppTest always runs the whole script, so this harness
+queues the check fragment's id on the runner, as the browser does for a widget
+inside a fragment, and compares it with a full run of the same session. It reports
+script time (SCRIPT_STARTED to finished, inside the runner thread) and the
+ForwardMsg bytes sent to the browser per interaction. AppTest recompiles app.py on
+every run, which a server does once per process, so the harness shares one
+ScriptCache across runs as the server's Runtime does.
+
+Run from the project root:  python benchmarks/bench_fragments.py
+"""
+
+from __future__ import annotations
+
+import functools
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import streamlit.testing.v1.app_test as app_test  # noqa: E402
+import streamlit.testing.v1.local_script_runner as local_script_runner  # noqa: E402
+from streamlit.runtime.scriptrunner import ScriptRunnerEvent  # noqa: E402
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner  # noqa: E402
+
+APP = str(ROOT / "app.py")
+ROUNDS = 30
+_last_msgs: list = []
+_script_ms: list[float] = []
+_original_run = LocalScriptRunner.run
+_FINISHED = {
+    ScriptRunnerEvent.SCRIPT_STOPPED_WITH_SUCCESS,
+    ScriptRunnerEvent.SCRIPT_STOPPED_WITH_COMPILE_ERROR,
+    ScriptRunnerEvent.SCRIPT_STOPPED_FOR_RERUN,
+    ScriptRunnerEvent.FRAGMENT_STOPPED_WITH_SUCCESS,
+}
+
+
+def _recording_run(self, *args, **kwargs):
+    started: list[float] = []
+
+    def on_event(sender, event, **_):
+        if event == ScriptRunnerEvent.SCRIPT_STARTED:
+            started.append(time.perf_counter())
+        elif event in _FINISHED and started:
+            _script_ms.append((time.perf_counter() - started.pop()) * 1000)
+
+    self.on_event.connect(on_event, weak=False)
+    try:
+        return _original_run(self, *args, **kwargs)
+    finally:
+        _last_msgs[:] = list(self.forward_msgs())
+
+
+LocalScriptRunner.run = _recording_run
+_shared_script_cache = ScriptCache()
+app_test.ScriptCache = local_script_runner.ScriptCache = lambda: _shared_script_cache
+
+
+def _fragment_ids() -> list[str]:
+    return list(dict.fromkeys(m.delta.fragment_id for m in _last_msgs if m.HasField("delta") and m.delta.fragment_id))
+
+
+def _payload_bytes() -> int:
+    return sum(m.ByteSize() for m in _last_msgs)
+
+
+def _run_fragment(at: AppTest, fragment_id: str) -> None:
+    original = local_script_runner.RerunData
+    local_script_runner.RerunData = functools.partial(original, fragment_id_queue=[fragment_id])
+    try:
+        at.run()
+    finally:
+        local_script_runner.RerunData = original
+
+
+def _session(screen: str) -> tuple[AppTest, str]:
+    at = AppTest.from_file(APP, default_timeout=30)
+    at.run()
+    at.session_state["check"].screen = screen
+    at.session_state["check"].we_do.inputs.date = "10/20/2025"
+    at.run()
+    (fragment_id,) = _fragment_ids()
+    return at, fragment_id
+
+
+def _measure(step) -> tuple[float, int]:
+    sizes = []
+    _script_ms.clear()
+    for _ in range(ROUNDS):
+        step()
+        sizes.append(_payload_bytes())
+    return statistics.median(_script_ms), int(statistics.median(sizes))
+
+
+def main() -> None:
+    print(f"{'screen':<8} {'full app rerun':>24} {'fragment rerun':>24}   (median script time, bytes sent)")
+    for screen in ("i_do", "we_do", "you_do"):
+        at, fragment_id = _session(screen)
+        full_ms, full_bytes = _measure(at.run)
+        frag_ms, frag_bytes = _measure(lambda: _run_fragment(at, fragment_id))
+        print(
+            f"{screen:<8} {full_ms:8.1f} ms {full_bytes:>8} B    {frag_ms:8.1f} ms {frag_bytes:>8} B"
+            f"   ({full_ms / frag_ms:.1f}x time, {full_bytes / frag_bytes:.1f}x bytes)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""Measure bytes sent per rerun for the global stylesheet.
+
+Run from the project root:  python benchmarks/bench_payload.py
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import app  # noqa: E402
+
+
+def main() -> None:
+    data_url = app._get_check_bg_data_url()
+    rows = [
+        ("before: f-string with inline base64", "<style>" + app._build_global_css(data_url) + "</style>"),
+        ("minified, inline base64 (static off)", app._global_stylesheet(data_url, False)),
+        ("minified, no background", app._global_stylesheet(None, False)),
+        ("static mode @import stub", app._global_stylesheet(app._get_check_bg_url(), True)),
+    ]
+    for label, payload in rows:
+        print(f"{label:<40} {len(payload.encode('utf-8')):>8} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Per-session memory and per-rerun setup cost: flat session_state keys vs state.SessionModel.
+
+The legacy layout is reproduced from the pre-SessionModel app: ~25 top-level keys plus
+each session's own copy of the default overlay positions. Both layouts are filled with
+the same typed-in answers so only the container overhead differs.
+
+Run from the project root:  python benchmarks/bench_session_memory.py
+"""
+
+from __future__ import annotations
+
+import copy
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from state import STATE_KEY, SessionModel  # noqa: E402
+
+SESSIONS = 500
+FIELDS = ("date", "payee", "amount_numeric", "amount_words", "memo", "signature")
+DEFAULT_OVERLAY_POSITIONS = {
+    "date": {"top": 13, "left": 62, "width": 32, "height": 7},
+    "payee": {"top": 30, "left": 8, "width": 70, "height": 8},
+    "amount_numeric": {"top": 30, "left": 80, "width": 12, "height": 7},
+    "amount_words": {"top": 44, "left": 8, "width": 80, "height": 8},
+    "memo": {"top": 73, "left": 8, "width": 40, "height": 7},
+    "signature": {"top": 73, "left": 58, "width": 34, "height": 7},
+}
+
+
+class _Attrs(dict):
+    """Stand-in for st.session_state's attribute access."""
+
+    __getattr__ = dict.__getitem__
+    __setattr__ = dict.__setitem__
+
+
+# --- legacy setup, as it ran on every rerun -------------------------------------------
+def legacy_setup(session: _Attrs) -> None:
+    if "selected_scenario" not in session:
+        session.selected_scenario = 0
+    if "mode" not in session:
+        session.mode = "I do"
+    if "guided_step" not in session:
+        session.guided_step = -1
+    if "_last_scenario" not in session:
+        session._last_scenario = session.selected_scenario
+    if "_last_mode" not in session:
+        session._last_mode = session.mode
+    for key, default in [
+        ("we_date", ""), ("we_payee", ""), ("we_amount_numeric", ""), ("we_amount_words", ""),
+        ("we_memo", ""), ("we_signature", ""), ("we_validation_error", ""), ("we_step", 0),
+    ]:
+        session.setdefault(key, default)
+    if session.get("we_step", 0) == 0 and not any([
+        session.get("we_date", ""), session.get("we_payee", ""), session.get("we_amount_numeric", ""),
+        session.get("we_amount_words", ""), session.get("we_memo", ""), session.get("we_signature", ""),
+    ]):
+        session.we_validation_error = ""
+    session.setdefault("screen", "i_do")
+    session.setdefault("selected_scenario", 0)
+    session.setdefault("guided_step", -1)
+    session.setdefault("mode", "I do")
+    if "overlay_positions" not in session:
+        session.overlay_positions = copy.deepcopy(DEFAULT_OVERLAY_POSITIONS)
+    for key in [f"you_{f}" for f in FIELDS]:
+        session.setdefault(key, "")
+
+
+def model_setup(session: dict) -> SessionModel:
+    state = session.get(STATE_KEY)
+    if state is None:
+        state = session[STATE_KEY] = SessionModel()
+    return state
+
+
+def _answers(i: int) -> dict[str, str]:
+    return {
+        "date": f"10/{i % 28 + 1:02d}/2025", "payee": f"Student {i} Payee", "amount_numeric": f"{i}.50",
+        "amount_words": f"Amount {i} and 50/100", "memo": f"memo {i}", "signature": f"Student {i}",
+    }
+
+
+def legacy_session(i: int) -> _Attrs:
+    session = _Attrs()
+    legacy_setup(session)
+    for name, value in _answers(i).items():
+        session[f"we_{name}"] = value
+    return session
+
+
+def model_session(i: int) -> dict:
+    session: dict = {}
+    model_setup(session).we_do.inputs.update(_answers(i))
+    return session
+
+
+def _per_session_bytes(build) -> float:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    sessions = [build(i) for i in range(SESSIONS)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del sessions
+    return total / SESSIONS
+
+
+def main() -> None:
+    legacy_bytes = _per_session_bytes(legacy_session)
+    model_bytes = _per_session_bytes(model_session)
+    print(f"{SESSIONS} sessions with We do answers filled in")
+    print(f"  flat keys      {legacy_bytes:8.0f} B/session   {legacy_bytes * SESSIONS / 1024:8.1f} KiB total")
+    print(f"  SessionModel   {model_bytes:8.0f} B/session   {model_bytes * SESSIONS / 1024:8.1f} KiB total")
+
+    warm_legacy, warm_model = legacy_session(1), model_session(1)
+    n = 100_000
+    legacy_us = min(timeit.repeat(lambda: legacy_setup(warm_legacy), number=n, repeat=3)) / n * 1e6
+    model_us = min(timeit.repeat(lambda: model_setup(warm_model), number=n, repeat=3)) / n * 1e6
+    print(f"per-rerun setup: flat keys {legacy_us:.2f} us, SessionModel {model_us:.3f} us")
+
+
+if __name__ == "__main__":
+    main()
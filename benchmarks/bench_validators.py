@@ -0,0 +1,175 @@
+"""Micro-benchmark: validators.py against the original per-call implementations.
+
+Run from the project root:  python benchmarks/bench_validators.py
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import fields  # noqa: E402
+import validators  # noqa: E402
+
+# Representative student answers for the $1,200.00 rent check
+VALUES = {
+    "date": "11/01/2025",
+    "payee": "oakwood   apartments",
+    "amount_numeric": "1,200.00",
+    "amount_words": "One thousand two-hundred dollars and 00/100",
+    "memo": "November rent",
+    "signature": "Jordan Patel",
+}
+EXPECTED = {
+    "date": "11/01/2025",
+    "payee": "Oakwood Apartments",
+    "amount_numeric": "$1,200.00",
+    "amount_words": "One thousand two hundred dollars and 00/100",
+    "memo": "November rent",
+    "signature": "Jordan Patel",
+}
+
+
+# --- original implementations from app.py, kept verbatim for comparison ---
+
+def legacy_normalize_text(value):
+    return " ".join(value.strip().lower().split())
+
+
+def legacy_parse_currency(value):
+    try:
+        cleaned = value.replace("$", "").replace(",", "").strip()
+        return float(cleaned)
+    except Exception:
+        return None
+
+
+def legacy_validate_date(value):
+    from datetime import datetime
+
+    formats = ["%m/%d/%Y", "%m/%d/%y", "%m-%d-%Y", "%m-%d-%y"]
+    for fmt in formats:
+        try:
+            datetime.strptime(value.strip(), fmt)
+            return True, None
+        except Exception:
+            pass
+    return False, "Use a valid date like 10/15/2025."
+
+
+def legacy_validate_payee(value, expected):
+    if legacy_normalize_text(value) == legacy_normalize_text(expected):
+        return True, None
+    return False, f"Expected: {expected}"
+
+
+def legacy_validate_amount_numeric(value, expected):
+    target = legacy_parse_currency(expected)
+    got = legacy_parse_currency(value)
+    if target is not None and got is not None and abs(target - got) < 0.005:
+        return True, None
+    return False, f"Expected: {expected}"
+
+
+def legacy_normalize_amount_words(text):
+    t = text.lower().strip()
+    t = t.replace('-', ' ')
+    allowed = set("abcdefghijklmnopqrstuvwxyz 0123456789/ ")
+    t = ''.join(ch if ch in allowed else ' ' for ch in t)
+    tokens = [tok for tok in t.split() if tok not in {"dollar", "dollars", "and", "only"}]
+    return " ".join(tokens)
+
+
+def legacy_validate_amount_words(value, expected):
+    if legacy_normalize_amount_words(value) == legacy_normalize_amount_words(expected):
+        return True, None
+    return False, f"Example: {expected} (format flexible)"
+
+
+def legacy_validate_check(values, expected):
+    return {
+        "date": legacy_validate_date(values["date"]),
+        "payee": legacy_validate_payee(values["payee"], expected["payee"]),
+        "amount_numeric": legacy_validate_amount_numeric(values["amount_numeric"], expected["amount_numeric"]),
+        "amount_words": legacy_validate_amount_words(values["amount_words"], expected["amount_words"]),
+        "memo": (True, None),
+        "signature": (True, None) if values["signature"].strip() else (False, "Add your signature"),
+    }
+
+
+def _case_variant(text: str, i: int) -> str:
+    """Same text with letter case set by the bits of ``i`` (unique, same length)."""
+    return "".join(ch.upper() if i >> (k % 20) & 1 else ch.lower() for k, ch in enumerate(text))
+
+
+def _cold_inputs(n: int) -> list[dict[str, str]]:
+    """Distinct answers, more than the LRU caches hold, so every call is a miss."""
+    rows = []
+    for i in range(n):
+        rows.append({
+            "date": f"{1 + i % 12}/{1 + i // 12 % 28}/{1990 + i // 336 % 60}",
+            "payee": f"oakwood  apartments {i}",
+            "amount_numeric": f"{i:,}.{i % 100:02d}",
+            "amount_words": _case_variant(VALUES["amount_words"], i),
+            "memo": "",
+            "signature": "Jordan Patel",
+        })
+    return rows
+
+
+COLD = _cold_inputs(10000)
+TARGET_SPEEDUP = 5.0  # whole-check goal; reached on warm reruns only
+
+CASES = [
+    ("date, valid (warm)", lambda: legacy_validate_date("11-01-25"), lambda: validators.validate_date("11-01-25")),
+    ("date, invalid (warm)", lambda: legacy_validate_date("13/40/2025"), lambda: validators.validate_date("13/40/2025")),
+    (
+        "amount in words (warm)",
+        lambda: legacy_validate_amount_words(VALUES["amount_words"], EXPECTED["amount_words"]),
+        lambda: validators.validate_amount_words(VALUES["amount_words"], EXPECTED["amount_words"]),
+    ),
+    (
+        "whole check (rerun, warm)",
+        lambda: legacy_validate_check(VALUES, EXPECTED),
+        lambda: fields.validate_check(VALUES, EXPECTED),
+    ),
+]
+
+COLD_CASE = (
+    "whole check (cold)",
+    lambda: [legacy_validate_check(v, EXPECTED) for v in COLD],
+    lambda: [fields.validate_check(v, EXPECTED) for v in COLD],
+)
+
+
+def _best(fn, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+def main() -> None:
+    assert legacy_validate_check(VALUES, EXPECTED) == fields.validate_check(VALUES, EXPECTED)
+    number = 20000
+    print(f"{'case':<28}{'legacy us':>11}{'new us':>10}{'speedup':>10}")
+    rows = [(label, _best(old, number), _best(new, number)) for label, old, new in CASES]
+    label, old, new = COLD_CASE
+    rows.append((label, _best(old, 1) / len(COLD), _best(new, 1) / len(COLD)))
+    for label, t_old, t_new in rows:
+        print(f"{label:<28}{t_old * 1e6:>11.2f}{t_new * 1e6:>10.2f}{t_old / t_new:>9.1f}x")
+    for label, t_old, t_new in rows[-2:]:
+        verdict = "met" if t_old / t_new >= TARGET_SPEEDUP else "not met"
+        print(f"{TARGET_SPEEDUP:g}x target, {label}: {verdict}")
+
+    # Generator throughput on distinct amounts, bypassing the LRU cache
+    rng = random.Random(7)
+    amounts = [rng.randrange(0, 10**9) for _ in range(50000)]
+    convert = validators.amount_to_words.__wrapped__
+    elapsed = min(timeit.repeat(lambda: [convert(c) for c in amounts], number=1, repeat=3))
+    print(f"amount_to_words: {len(amounts) / elapsed:,.0f} conversions/s (uncached)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Time a We do step change in callback mode against the legacy link mode.
+
+Legacy links (``?nav=links``) reload the page: the browser opens a new session, the
+script runs with ``?we_nav=...``, clears the params and forces a second run. Callback
+mode sends one button event to the running session. This harness drives both with
+Streamlit's AppTest and reports script runs and wall time per step change; the real
+legacy cost is higher still (page load, new websocket, static assets).
+
+Run from the project root:  python benchmarks/bench_we_nav.py
+"""
+
+from __future__ import annotations
+
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+from streamlit.runtime.scriptrunner import ScriptRunnerEvent  # noqa: E402
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner  # noqa: E402
+
+APP = str(ROOT / "app.py")
+ROUNDS = 30
+_runs = 0
+_original_run = LocalScriptRunner.run
+
+
+def _counting_run(self, *args, **kwargs):
+    # Each AppTest.run() uses a fresh runner; count every script start, including st.rerun()
+    global _runs
+    try:
+        return _original_run(self, *args, **kwargs)
+    finally:
+        _runs += self.events.count(ScriptRunnerEvent.SCRIPT_STARTED)
+
+
+LocalScriptRunner.run = _counting_run
+
+
+def _we_do_session() -> AppTest:
+    at = AppTest.from_file(APP, default_timeout=30)
+    at.run()
+    state = at.session_state["check"]
+    state.screen = "we_do"
+    state.we_do.inputs.date = "10/20/2025"
+    at.run()
+    return at
+
+
+def legacy_step() -> None:
+    # Each link click is a fresh page: new session, then the forced rerun inside main()
+    at = AppTest.from_file(APP, default_timeout=30)
+    at.query_params.update({"we_nav": "next", "screen": "we_do", "nav": "links"})
+    at.run()
+
+
+def callback_step(at: AppTest) -> None:
+    at.session_state["check"].we_do.step = 0
+    at.button(key="we_next").click().run()
+
+
+def _measure(label: str, step) -> None:
+    global _runs
+    times = []
+    _runs = 0
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        step()
+        times.append((time.perf_counter() - start) * 1000)
+    print(
+        f"{label:<28} median {statistics.median(times):7.1f} ms   "
+        f"p95 {sorted(times)[int(len(times) * 0.95) - 1]:7.1f} ms   "
+        f"script runs/step {_runs / ROUNDS:.1f}"
+    )
+
+
+def main() -> None:
+    legacy_step()  # warm process caches for both modes
+    at = _we_do_session()
+    _measure("legacy links (page reload)", legacy_step)
+    _measure("callbacks (in session)", lambda: callback_step(at))
+
+
+if __name__ == "__main__":
+    main()
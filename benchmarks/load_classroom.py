@@ -0,0 +1,292 @@
+"""Simulated classroom against a local ``streamlit run app.py``: rerun latency, server CPU and RSS.
+
+Starts the app on a free port (or targets ``--url``), then for each class size N opens
+N websocket sessions on /_stcore/stream and speaks the browser's protocol: BackMsg
+rerun requests carrying widget states, ForwardMsg deltas back until script_finished.
+Each student loads the page, steps through I do, types every We do field and presses
+Next/Done, then fills the You do check through the overlay component and presses
+"Check my work". Clicks inside the check area carry its fragment id, as the browser
+sends them. Rerun latency is request sent to final script_finished; CPU is the
+server's user+system time over the level's wall time (100% = one core) and RSS is
+the peak of /proc samples. Everything runs offline on one box. The websockets
+client is listed in requirements.txt for this script.
+
+Run from the project root:
+  python benchmarks/load_classroom.py                       classes of 1, 5, 10 and 25
+  python benchmarks/load_classroom.py --students 10,50,100 --think-ms 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import websockets  # noqa: E402
+from streamlit.proto.BackMsg_pb2 import BackMsg  # noqa: E402
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg  # noqa: E402
+
+from fields import FIELD_SPECS  # noqa: E402
+from scenarios import get_catalog  # noqa: E402
+
+RERUN_TIMEOUT_S = 30
+_WIDGET_TYPES = ("button", "text_input", "text_area", "component_instance")
+_FINAL = {ForwardMsg.FINISHED_SUCCESSFULLY, ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY}
+
+
+class _Widget:
+    __slots__ = ("id", "fragment_id")
+
+    def __init__(self, widget_id: str, fragment_id: str) -> None:
+        self.id = widget_id
+        self.fragment_id = fragment_id
+
+
+class Student:
+    """One browser session: tracks the widgets on screen and the values it has sent."""
+
+    def __init__(self, url: str, rng: random.Random, think_s: float, latencies: list[float]) -> None:
+        self.url = url
+        self.rng = rng
+        self.think_s = think_s
+        self.latencies = latencies
+        self.errors = 0
+        self.graded = False  # "Check my work" showed its results
+        self.widgets: dict[str, _Widget] = {}  # by key, or by label for unkeyed widgets
+        self.values: dict[str, dict] = {}  # widget id -> non-trigger WidgetState fields
+        self.ws = None
+
+    async def rerun(self, trigger: str | None = None, fragment_id: str = "") -> None:
+        msg = BackMsg()
+        client = msg.rerun_script
+        for widget_id, value in self.values.items():
+            state = client.widget_states.widgets.add(id=widget_id)
+            for field, v in value.items():
+                setattr(state, field, v)
+        if trigger is not None:
+            client.widget_states.widgets.add(id=trigger, trigger_value=True)
+        client.fragment_id = fragment_id
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        seen: dict[str, _Widget] = {}
+        while True:
+            fwd = ForwardMsg()
+            fwd.ParseFromString(await asyncio.wait_for(self.ws.recv(), RERUN_TIMEOUT_S))
+            kind = fwd.WhichOneof("type")
+            if kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                self._note_element(fwd, seen)
+            elif kind == "script_finished" and fwd.script_finished in _FINAL:
+                break
+        self.latencies.append((time.perf_counter() - start) * 1000)
+        if fragment_id:
+            self.widgets.update(seen)
+        else:
+            self.widgets = seen
+
+    def _note_element(self, fwd: ForwardMsg, seen: dict[str, _Widget]) -> None:
+        element = fwd.delta.new_element
+        kind = element.WhichOneof("type")
+        if kind == "exception":
+            self.errors += 1
+        elif kind == "markdown" and element.markdown.body.startswith("### Results"):
+            self.graded = True
+        if kind not in _WIDGET_TYPES:
+            return
+        proto = getattr(element, kind)
+        widget = _Widget(proto.id, fwd.delta.fragment_id)
+        key = proto.id.rsplit("-", 1)[-1]  # "$$ID-<hash>-<user key or None>"
+        seen[proto.label if kind == "button" and key == "None" else key] = widget
+        if kind == "component_instance":
+            seen["component"] = widget
+
+    async def click(self, name: str) -> None:
+        widget = self.widgets[name]
+        await self.think()
+        await self.rerun(widget.id, widget.fragment_id)
+
+    async def type(self, name: str, text: str) -> None:
+        widget = self.widgets[name]
+        await self.think()
+        self.values[widget.id] = {"string_value": text}
+        await self.rerun(fragment_id=widget.fragment_id)
+
+    async def edit_check(self, changes: dict[str, str], batch: int) -> None:
+        # The overlay component reports debounced edits as {batch, seq, changes}
+        widget = self.widgets["component"]
+        await self.think()
+        self.values[widget.id] = {"json_value": json.dumps({"batch": batch, "seq": 1, "changes": changes})}
+        await self.rerun(fragment_id=widget.fragment_id)
+
+    async def think(self) -> None:
+        if self.think_s:
+            await asyncio.sleep(self.rng.uniform(0.5, 1.5) * self.think_s)
+
+    async def lesson(self) -> None:
+        """I do -> We do -> You do, as one student works through the app."""
+        catalog = get_catalog()
+        async with websockets.connect(
+            f"{self.url.replace('http', 'ws', 1)}/_stcore/stream", subprotocols=["streamlit"], max_size=None
+        ) as self.ws:
+            await self.rerun()
+            for _ in catalog.first("i_do").steps:
+                await self.click("Next")
+            await self.click("Next: We do")
+
+            we_do = catalog.first("we_do")
+            answers = {**we_do.expected, "memo": we_do.memo, "signature": we_do.signature}
+            for spec in FIELD_SPECS:
+                await self.type(f"we_input_{spec.name}", answers[spec.name])
+                await self.click("we_done" if spec is FIELD_SPECS[-1] else "we_next")
+            await self.click("Next: You do")
+
+            you_do = catalog.first("you_do")
+            await self.edit_check({**you_do.expected, "memo": you_do.memo, "signature": you_do.signature}, batch=1)
+            await self.click("Check my work")
+            if not self.graded:
+                raise RuntimeError("You do was submitted but no results came back")
+
+
+class _ProcSampler:
+    """CPU seconds and peak RSS of one process, read from /proc."""
+
+    def __init__(self, pid: int | None) -> None:
+        self.pid = pid
+        self.peak_rss = 0
+
+    def cpu_seconds(self) -> float:
+        if self.pid is None:
+            return 0.0
+        fields = Path(f"/proc/{self.pid}/stat").read_text().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")  # utime + stime
+
+    def sample_rss(self) -> None:
+        if self.pid is None:
+            return
+        for line in Path(f"/proc/{self.pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                self.peak_rss = max(self.peak_rss, int(line.split()[1]) * 1024)
+
+    async def watch(self, interval: float = 0.2) -> None:
+        while True:
+            self.sample_rss()
+            await asyncio.sleep(interval)
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def _run_level(url: str, students: int, args: argparse.Namespace, sampler: _ProcSampler) -> dict:
+    latencies: list[float] = []
+    rng = random.Random(args.seed + students)
+    class_ = [Student(url, random.Random(rng.random()), args.think_ms / 1000, latencies) for _ in range(students)]
+
+    async def arrive(student: Student) -> Exception | None:
+        await asyncio.sleep(rng.uniform(0, args.ramp_s))
+        try:
+            await student.lesson()
+        except Exception as exc:  # a dropped or stuck session counts as a failure, not a crash
+            return exc
+        return None
+
+    watcher = asyncio.create_task(sampler.watch())
+    cpu_before, start = sampler.cpu_seconds(), time.perf_counter()
+    outcomes = await asyncio.gather(*(arrive(s) for s in class_))
+    wall = time.perf_counter() - start
+    cpu = sampler.cpu_seconds() - cpu_before
+    watcher.cancel()
+    sampler.sample_rss()
+    failed = [exc for exc in outcomes if exc is not None]
+    if failed:
+        print(f"  {len(failed)} session(s) failed, first: {failed[0]!r}")
+    return {
+        "students": students,
+        "reruns": len(latencies),
+        "failed": len(failed) + sum(s.errors for s in class_),
+        "p50": _percentile(latencies, 50) if latencies else 0.0,
+        "p95": _percentile(latencies, 95) if latencies else 0.0,
+        "p99": _percentile(latencies, 99) if latencies else 0.0,
+        "reruns_per_s": len(latencies) / wall,
+        "cpu_pct": cpu / wall * 100,
+        "rss_mib": sampler.peak_rss / 2**20,
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_server(port: int) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", str(ROOT / "app.py"),
+            f"--server.port={port}", "--server.address=127.0.0.1", "--server.headless=true",
+            "--browser.gatherUsageStats=false", "--server.fileWatcherType=none",
+        ],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return server
+        except OSError:
+            if server.poll() is not None:
+                break
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("streamlit did not become healthy within 60 s")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", default="1,5,10,25", help="comma-separated class sizes, run in order")
+    parser.add_argument("--think-ms", type=float, default=300, help="mean pause before each action")
+    parser.add_argument("--ramp-s", type=float, default=2, help="students arrive spread over this many seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--url", help="use a running server instead of starting one, e.g. http://127.0.0.1:8501")
+    parser.add_argument("--pid", type=int, help="server pid for CPU/RSS when --url is given")
+    args = parser.parse_args(argv)
+    sizes = [int(n) for n in args.students.split(",")]
+
+    server = None
+    if args.url:
+        url, pid = args.url.rstrip("/"), args.pid
+    else:
+        port = _free_port()
+        server = _start_server(port)
+        url, pid = f"http://127.0.0.1:{port}", server.pid
+    sampler = _ProcSampler(pid)
+    try:
+        asyncio.run(_run_level(url, 1, argparse.Namespace(**{**vars(args), "think_ms": 0, "ramp_s": 0}), sampler))  # warm up
+        print(f"{'students':>8}{'reruns':>8}{'failed':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'reruns/s':>10}{'CPU %':>8}{'RSS MiB':>9}")
+        for n in sizes:
+            r = asyncio.run(_run_level(url, n, args, sampler))
+            print(
+                f"{r['students']:>8}{r['reruns']:>8}{r['failed']:>8}{r['p50']:>9.1f}{r['p95']:>9.1f}{r['p99']:>9.1f}"
+                f"{r['reruns_per_s']:>10.1f}{r['cpu_pct']:>8.0f}{r['rss_mib'] if pid else float('nan'):>9.1f}"
+            )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+// Browser port of validators.py for inline feedback. Every table, regex and expected
+// answer comes from validators.client_rules(), so this file holds only the control
+// flow; tests/test_client_rules.py runs both engines over tests/validation_vectors.json.
+// Amounts are Numbers: exact up to 2**53 cents, far beyond any check.
+(function (global) {
+  'use strict';
+
+  const compiled = new WeakMap();
+
+  function compile(rules) {
+    let c = compiled.get(rules);
+    if (!c) {
+      const full = (src) => new RegExp(`^(?:${src})$`);
+      c = {
+        date: full(rules.patterns.date),
+        currency: full(rules.patterns.currency),
+        token: new RegExp(rules.patterns.words_token, 'g'),
+        fraction: full(rules.patterns.fraction),
+        stop: new Set(rules.words_stop),
+        numbers: new Map(Object.entries(rules.number_tokens)),
+      };
+      compiled.set(rules, c);
+    }
+    return c;
+  }
+
+  function tokens(c, text) {
+    return text.toLowerCase().match(c.token) || [];
+  }
+
+  function isLeap(year) {
+    return year % 4 === 0 && (year % 100 !== 0 || year % 400 === 0);
+  }
+
+  function validateDate(rules, value) {
+    const c = compile(rules);
+    const fail = [false, rules.date_message];
+    const m = c.date.exec(value.trim());
+    if (!m) return fail;
+    const month = parseInt(m[1], 10);
+    const day = parseInt(m[3], 10);
+    let year = parseInt(m[4], 10);
+    if (m[4].length === 2) {
+      year += year >= 69 ? 1900 : 2000;
+    } else if (year === 0) {
+      return fail;
+    }
+    const limit = month === 2 && isLeap(year) ? 29 : rules.days_in_month[month - 1];
+    return day > limit ? fail : [true, null];
+  }
+
+  function normalizeText(value) {
+    return value.trim().toLowerCase().split(/\s+/).filter(Boolean).join(' ');
+  }
+
+  function parseCents(rules, value) {
+    const m = compile(rules).currency.exec(value);
+    if (!m) return null;
+    const [, dollars, cents, bareCents] = m;
+    if (dollars === undefined) return parseInt(bareCents.padEnd(2, '0'), 10);
+    return parseInt(dollars.replace(/,/g, ''), 10) * 100 + (cents ? parseInt(cents.padEnd(2, '0'), 10) : 0);
+  }
+
+  function normalizeAmountWords(rules, text) {
+    const c = compile(rules);
+    return tokens(c, text).filter((tok) => !c.stop.has(tok)).join(' ');
+  }
+
+  function joinSegments(segments) {
+    if (!segments.length) return null;
+    let [value, tail] = segments[0];
+    for (const [segValue, segTail] of segments.slice(1)) {
+      if (segValue >= tail) return null;
+      value += segValue;
+      tail = segTail;
+    }
+    return value;
+  }
+
+  function wordsToCents(rules, text) {
+    const c = compile(rules);
+    const K = rules.kinds;
+    let dollars = null;
+    let cents = null;
+    let segments = [];
+    let total = 0;
+    let current = 0;
+    let last = null;
+    let tail = 1;
+    let minScale = rules.max_scale;
+
+    for (const tok of tokens(c, text)) {
+      const entry = c.numbers.get(tok);
+      if (entry !== undefined) {
+        const [kind, n] = entry;
+        if (kind === K.unit) {
+          if (![null, K.tens, K.hundred, K.scale].includes(last)) return null;
+          current += n;
+          tail = 1;
+        } else if (kind === K.teen || kind === K.tens) {
+          if (![null, K.hundred, K.scale].includes(last)) return null;
+          current += n;
+          tail = 1;
+        } else if (kind === K.hundred) {
+          if (![K.unit, K.teen, K.tens].includes(last) || current >= 100) return null;
+          if (total && current >= 10) return null;
+          current *= 100;
+          tail = 100;
+        } else if (kind === K.scale) {
+          if (![K.unit, K.teen, K.tens, K.hundred].includes(last) || n >= minScale) return null;
+          total += current * n;
+          current = 0;
+          minScale = tail = n;
+        } else if (last !== null) {
+          return null;
+        }
+        last = kind;
+        continue;
+      }
+
+      if (last !== null) {
+        if (last === K.zero && segments.length) return null;
+        segments.push([total + current, tail]);
+        total = current = 0;
+        last = null;
+        tail = 1;
+        minScale = rules.max_scale;
+      }
+
+      if (tok === 'and' || tok === 'only') continue;
+      if (tok === 'dollar' || tok === 'dollars') {
+        if (!segments.length && cents !== null) continue;
+        if (dollars !== null) return null;
+        dollars = joinSegments(segments);
+        if (dollars === null) return null;
+        segments = [];
+      } else if (tok === 'cent' || tok === 'cents') {
+        const value = joinSegments(segments);
+        if (cents !== null || value === null || value >= 100) return null;
+        cents = value;
+        segments = [];
+      } else {
+        const m = c.fraction.exec(tok);
+        if (!m || cents !== null) return null;
+        cents = m[1] === 'xx' || m[1] === 'no' ? 0 : parseInt(m[1], 10);
+        if (segments.length) {
+          if (dollars !== null) return null;
+          dollars = joinSegments(segments);
+          if (dollars === null) return null;
+          segments = [];
+        }
+      }
+    }
+
+    if (last !== null || segments.length || cents === null || dollars === null) return null;
+    return dollars * 100 + cents;
+  }
+
+  function validateField(rules, field, value) {
+    switch (field) {
+      case 'date':
+        return validateDate(rules, value);
+      case 'payee':
+        return normalizeText(value) === rules.payee.normalized ? [true, null] : [false, rules.payee.message];
+      case 'amount_numeric': {
+        const target = rules.amount_numeric.cents;
+        return target !== null && parseCents(rules, value) === target ? [true, null] : [false, rules.amount_numeric.message];
+      }
+      case 'amount_words': {
+        const expected = rules.amount_words;
+        const got = expected.cents !== null ? wordsToCents(rules, value) : null;
+        const ok = got !== null ? got === expected.cents : normalizeAmountWords(rules, value) === expected.normalized;
+        return ok ? [true, null] : [false, expected.message];
+      }
+      default:
+        return [true, null];
+    }
+  }
+
+  const CheckRules = { validateField, parseCents, wordsToCents, normalizeAmountWords, normalizeText };
+  if (typeof module !== 'undefined' && module.exports) module.exports = CheckRules;
+  else global.CheckRules = CheckRules;
+})(typeof window !== 'undefined' ? window : globalThis);
@@ -0,0 +1,31 @@
+// Minimal Streamlit component protocol (components v1, API version 1).
+// Exposes the same window.Streamlit surface as streamlit-component-lib, which only
+// ships a CommonJS build and cannot be loaded with a plain <script> tag.
+(function () {
+  'use strict';
+
+  const RENDER_EVENT = 'streamlit:render';
+  const events = new EventTarget();
+
+  function send(type, data) {
+    window.parent.postMessage(Object.assign({ isStreamlitMessage: true, type: type }, data), '*');
+  }
+
+  window.addEventListener('message', function (event) {
+    const data = event.data;
+    if (!data || data.type !== RENDER_EVENT) return;
+    events.dispatchEvent(new CustomEvent(RENDER_EVENT, {
+      detail: { args: data.args || {}, disabled: !!data.disabled, theme: data.theme },
+    }));
+  });
+
+  window.Streamlit = {
+    RENDER_EVENT: RENDER_EVENT,
+    events: events,
+    setComponentReady: function () { send('streamlit:componentReady', { apiVersion: 1 }); },
+    setFrameHeight: function (height) {
+      send('streamlit:setFrameHeight', { height: height === undefined ? document.body.scrollHeight : height });
+    },
+    setComponentValue: function (value) { send('streamlit:setComponentValue', { value: value, dataType: 'json' }); },
+  };
+})();
@@ -0,0 +1,132 @@
+"""Check field registry: one row per field drives input handling, validation and messages.
+
+app.py loops over FIELD_SPECS instead of branching on field names (We do steps, both
+results summaries, ``validate_check``), so adding a field (a check number, a routing
+line) means adding a row here and an attribute on state.CheckInputs.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Callable, Mapping, NamedTuple
+
+from validators import (
+    parse_cents,
+    validate_amount_numeric,
+    validate_amount_words,
+    validate_date,
+    validate_payee,
+    validate_signature,
+)
+
+# (value, expected answers, expected amount in cents) -> (ok, message)
+Validator = Callable[[str, Mapping[str, str], int | None], tuple[bool, str | None]]
+
+
+class FieldSpec(NamedTuple):
+    name: str  # attribute on state.CheckInputs and key in Scenario.expected
+    label: str
+    normalize: Callable[[str], str]  # applied to raw input before it is stored
+    validate: Validator
+    required: bool
+    missing: str  # Next pressed with the field empty
+    retry: str  # validator gave no message; formatted with the expected answers
+    instruction: str  # We do hint; formatted with date, payee and amount
+    placeholder: str
+    graded: bool = True  # compared with the expected answer, not just checked for presence
+    present: str = ""  # results summary text for an ungraded field that has a value
+    multiline: bool = False
+    box_style: str = ""  # extra inline CSS for the field's overlay box
+
+
+def _unchanged(value: str) -> str:
+    return value
+
+
+def _strip_dollar(value: str) -> str:
+    return value.lstrip("$").strip()
+
+
+def _always_ok(value: str, expected: Mapping[str, str], cents: int | None) -> tuple[bool, str | None]:
+    return True, None
+
+
+FIELD_SPECS: tuple[FieldSpec, ...] = (
+    FieldSpec(
+        "date", "Date", _unchanged,
+        lambda value, expected, cents: validate_date(value),
+        True, "Please enter a date before continuing", "Please enter a valid date (MM/DD/YYYY)",
+        "Enter the date in MM/DD/YYYY format (e.g., {date})", "MM/DD/YYYY",
+    ),
+    FieldSpec(
+        "payee", "Payee", _unchanged,
+        lambda value, expected, cents: validate_payee(value, expected.get("payee", "")),
+        True, "Please enter the payee name before continuing", "Please enter '{payee}'",
+        "Type the payee exactly: {payee}", "Name or company",
+    ),
+    FieldSpec(
+        "amount_numeric", "Amount Numeric", _strip_dollar,
+        lambda value, expected, cents: validate_amount_numeric(value, expected.get("amount_numeric", ""), cents),
+        True, "Please enter the dollar amount before continuing", "Please enter '{amount_numeric}'",
+        "Enter the numeric amount: {amount}", "0.00", box_style="text-align:right;",
+    ),
+    FieldSpec(
+        "amount_words", "Amount Words", _unchanged,
+        lambda value, expected, cents: validate_amount_words(value, expected.get("amount_words", ""), cents),
+        True, "Please write out the amount in words before continuing", "Please write '{amount_words}'",
+        "Write the amount in words with the cents fraction", "Amount in words", multiline=True,
+    ),
+    FieldSpec(
+        "memo", "Memo", _unchanged, _always_ok,
+        False, "", "",
+        "Add a memo (optional field)", "(optional)", graded=False, present="Added (optional)",
+    ),
+    FieldSpec(
+        "signature", "Signature", _unchanged,
+        lambda value, expected, cents: validate_signature(value),
+        True, "Please add your signature before finishing", "Add your signature",
+        "Sign your name (flexible)", "Your signature", graded=False, present="Present",
+        box_style="font-family:'Dancing Script', cursive;",
+    ),
+)
+FIELD_NAMES = tuple(spec.name for spec in FIELD_SPECS)
+FIELDS_BY_NAME: Mapping[str, FieldSpec] = MappingProxyType({spec.name: spec for spec in FIELD_SPECS})
+
+
+def check_step(spec: FieldSpec, value: str, expected: Mapping[str, str], cents: int | None) -> tuple[bool, str]:
+    """Whether a We do step may advance, with the message to show when it may not."""
+    if not spec.required:
+        return True, ""
+    if not value.strip():
+        return False, spec.missing
+    ok, message = spec.validate(value, expected, cents)
+    return ok, "" if ok else (message or spec.retry.format(**expected))
+
+
+def validate_check(values: Mapping[str, str], expected: Mapping[str, str]) -> dict[str, tuple[bool, str | None]]:
+    """Validate every field of a check in one call: ``{field: (ok, message)}`` in registry order.
+
+    The expected amount is parsed to cents once and shared by the amount validators;
+    ``expected["amount_words"]`` may be omitted and is then generated from it.
+    """
+    cents = parse_cents(expected.get("amount_numeric", ""))
+    return {spec.name: spec.validate(values.get(spec.name, ""), expected, cents) for spec in FIELD_SPECS}
+
+
+def summary_line(spec: FieldSpec, value: str, ok: bool, message: str | None) -> tuple[str, str] | None:
+    """Icon and text for a field's row in a results summary; None for an empty optional field."""
+    if spec.graded:
+        return ("✅", "Correct") if ok else ("❌", message or "")
+    if not spec.required:
+        return ("ℹ️", spec.present) if value.strip() else None
+    return ("✅", spec.present) if ok else ("⚠️", message or spec.retry)
+
+
+@lru_cache(maxsize=256)
+def instructions(date: str, payee: str, cents: int) -> Mapping[str, str]:
+    """We do hints for a scenario, formatted once per distinct scenario."""
+    amount = f"{cents // 100}.{cents % 100:02d}"
+    return MappingProxyType(
+        {spec.name: spec.instruction.format(date=date, payee=payee, amount=amount) for spec in FIELD_SPECS}
+    )
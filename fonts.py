@@ -0,0 +1,18 @@
+"""Web fonts the app can bundle instead of importing Google Fonts.
+
+Shared by app.py and tools/fetch_fonts.py; importing it has no side effects, so the
+build-time download does not load Streamlit or the app.
+"""
+
+from pathlib import Path
+
+FONTS_DIR = Path(__file__).resolve().parent / "assets" / "fonts"
+
+# (family, weight, file stem in assets/fonts, preload); tools/fetch_fonts.py downloads them
+FONT_FACES = (
+    ("Montserrat", 400, "montserrat-400", True),
+    ("Montserrat", 500, "montserrat-500", False),
+    ("Montserrat", 700, "montserrat-700", True),
+    ("PT Sans", 700, "pt-sans-700", True),
+    ("Dancing Script", 700, "dancing-script-700", False),
+)
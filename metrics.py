@@ -0,0 +1,214 @@
+"""Process-wide operational metrics in Prometheus text format.
+
+Off unless an exporter is configured, so the default app keeps the README's promise
+of no analytics:
+
+* ``CHECK_METRICS_FILE=/path/check.prom`` rewrites that file every
+  ``CHECK_METRICS_INTERVAL`` seconds (default 15), atomically, for node_exporter's
+  textfile collector or any sidecar that ships files.
+* ``CHECK_METRICS_PORT=9464`` serves ``/metrics`` over HTTP on ``CHECK_METRICS_ADDR``
+  (default 127.0.0.1, so nothing leaves the container unless asked).
+
+Under serve.py each worker gets its own file (``check-worker0.prom``...) or port
+(9464, 9465...), and every series carries a ``worker`` label.
+
+Only counts and timings are kept. Labels are fixed vocabularies (screen, run kind,
+field name, outcome, cache name); no typed-in value, scenario text or session id is
+ever exported. Active sessions are counted from session ids held in memory for
+``ACTIVE_WINDOW_S`` and then forgotten.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator, Mapping
+
+ACTIVE_WINDOW_S = 300  # a session with no rerun for this long no longer counts as active
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SCREENS = ("i_do", "we_do", "you_do")  # any other screen value is labeled "other"
+
+_LOGGER = logging.getLogger(__name__)
+_lock = threading.Lock()
+_started = False
+_enabled = False
+_worker: str | None = None  # serve.py worker number, added to every series
+_in_rerun: ContextVar[bool] = ContextVar("metrics_in_rerun", default=False)
+
+_reruns: dict[tuple[str, str], int] = {}  # (kind, screen) -> count
+_durations: dict[str, list] = {}  # screen -> [bucket counts..., +Inf count, sum]
+_validations: dict[tuple[str, str, str], int] = {}  # (mode, field, outcome) -> count
+_caches: dict[str, tuple[int, int, int]] = {}  # cache -> (hits, misses, entries), latest snapshot
+_last_seen: dict[str, float] = {}  # session id -> monotonic time of its last rerun
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable() -> None:
+    """Record metrics in this process without starting an exporter (tests, embedding)."""
+    global _enabled
+    _enabled = True
+
+
+def start_from_env(environ: Mapping[str, str] = os.environ) -> None:
+    """Start the exporters configured in the environment, once per process."""
+    global _started, _worker
+    with _lock:
+        if _started:
+            return
+        _started = True
+    _worker = environ.get("CHECK_METRICS_WORKER")
+    path = environ.get("CHECK_METRICS_FILE")
+    port = environ.get("CHECK_METRICS_PORT")
+    if path:
+        interval = float(environ.get("CHECK_METRICS_INTERVAL", "15"))
+        threading.Thread(target=_write_loop, args=(Path(path), interval), name="metrics-file", daemon=True).start()
+        enable()
+    if port:
+        try:
+            server = ThreadingHTTPServer((environ.get("CHECK_METRICS_ADDR", "127.0.0.1"), int(port)), _Handler)
+        except OSError as exc:
+            _LOGGER.warning("metrics endpoint not started on port %s: %s", port, exc)
+        else:
+            threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+            enable()
+
+
+@contextmanager
+def rerun(kind: str, screen: str, session: str | None) -> Iterator[None]:
+    """Count and time one script run of ``screen``.
+
+    Nested calls (main() rendering a fragment function) record nothing.
+    """
+    if not _enabled or _in_rerun.get():
+        yield
+        return
+    if screen not in SCREENS:  # state.screen can come from a legacy ?screen= link
+        screen = "other"
+    token = _in_rerun.set(True)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        _in_rerun.reset(token)
+        with _lock:
+            _reruns[(kind, screen)] = _reruns.get((kind, screen), 0) + 1
+            hist = _durations.setdefault(screen, [0] * (len(DURATION_BUCKETS) + 1) + [0.0])
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if elapsed <= bound:
+                    hist[i] += 1
+            hist[len(DURATION_BUCKETS)] += 1
+            hist[-1] += elapsed
+            if session is not None:
+                _last_seen[session] = time.monotonic()
+
+
+def validation(mode: str, field: str, ok: bool) -> None:
+    """Count one graded field: We do Next/Done or You do "Check my work". Never the value."""
+    if not _enabled:
+        return
+    key = (mode, field, "ok" if ok else "error")
+    with _lock:
+        _validations[key] = _validations.get(key, 0) + 1
+
+
+def cache_stats(cache: str, hits: int, misses: int, entries: int) -> None:
+    """Latest cumulative counters of one of the app's caches."""
+    if not _enabled:
+        return
+    with _lock:
+        _caches[cache] = (hits, misses, entries)
+
+
+def _escape(value: str) -> str:
+    """A label value escaped per the text exposition format: backslash, quote, newline."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    if _worker is not None:
+        labels["worker"] = _worker
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def render() -> str:
+    """All metrics in Prometheus text exposition format 0.0.4."""
+    now = time.monotonic()
+    with _lock:
+        for session, seen in list(_last_seen.items()):
+            if now - seen > ACTIVE_WINDOW_S:
+                del _last_seen[session]
+        lines = [
+            "# HELP check_sessions_active Sessions with a rerun in the last 5 minutes.",
+            "# TYPE check_sessions_active gauge",
+            f"check_sessions_active{_labels() if _worker is not None else ''} {len(_last_seen)}",
+            "# HELP check_reruns_total Script runs, full app or check-area fragment, by screen.",
+            "# TYPE check_reruns_total counter",
+        ]
+        lines += [f"check_reruns_total{_labels(kind=k, screen=s)} {n}" for (k, s), n in sorted(_reruns.items())]
+        lines += [
+            "# HELP check_rerun_duration_seconds Time in the app script per rerun, by screen.",
+            "# TYPE check_rerun_duration_seconds histogram",
+        ]
+        for screen, hist in sorted(_durations.items()):
+            for bound, count in zip(DURATION_BUCKETS, hist):
+                lines.append(f"check_rerun_duration_seconds_bucket{_labels(screen=screen, le=f'{bound:g}')} {count}")
+            lines.append(f"check_rerun_duration_seconds_bucket{_labels(screen=screen, le='+Inf')} {hist[len(DURATION_BUCKETS)]}")
+            lines.append(f"check_rerun_duration_seconds_sum{_labels(screen=screen)} {hist[-1]:.6f}")
+            lines.append(f"check_rerun_duration_seconds_count{_labels(screen=screen)} {hist[len(DURATION_BUCKETS)]}")
+        lines += [
+            "# HELP check_validation_total Graded fields by mode, field and outcome.",
+            "# TYPE check_validation_total counter",
+        ]
+        lines += [
+            f"check_validation_total{_labels(mode=m, field=f, outcome=o)} {n}" for (m, f, o), n in sorted(_validations.items())
+        ]
+        for name, index, kind, help_text in (
+            ("check_cache_hits_total", 0, "counter", "Cache lookups served from the cache."),
+            ("check_cache_misses_total", 1, "counter", "Cache lookups that built or loaded the entry."),
+            ("check_cache_entries", 2, "gauge", "Entries held by the cache."),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            lines += [f"{name}{_labels(cache=c)} {stats[index]}" for c, stats in sorted(_caches.items())]
+    return "\n".join(lines) + "\n"
+
+
+def write(path: Path) -> None:
+    """Replace ``path`` with the current metrics; readers never see a partial file."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(render(), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _write_loop(path: Path, interval: float) -> None:
+    while True:
+        try:
+            write(path)
+        except OSError as exc:
+            _LOGGER.warning("could not write metrics to %s: %s", path, exc)
+        time.sleep(interval)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:  # scrapes every few seconds; keep the log quiet
+        pass
@@ -0,0 +1,202 @@
+"""Opt-in per-rerun profiling, enabled with ``?dev=1&profile=1``.
+
+A RerunProfile records the nested, named sections of one script run (main() or a
+fragment rerun) with perf_counter. timed() and section() cost one ContextVar lookup
+while no profile is active in the current thread, so they can stay on hot paths, and
+a profiled rerun never affects other sessions. ``?profile=full`` also runs cProfile,
+for a pstats dump and a split of self time between the app's files and Streamlit's;
+only one rerun in the process runs cProfile at a time, and others that ask for it
+while it is busy record sections only.
+Profiles export as speedscope JSON (https://www.speedscope.app) from the section
+events, so the nesting shows as a timeline.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import functools
+import json
+import marshal
+import pstats
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, TypeVar
+
+_APP_DIR = str(Path(__file__).resolve().parent)
+_current: ContextVar["RerunProfile | None"] = ContextVar("rerun_profile", default=None)
+_NOT_PROFILING = nullcontext()
+_cprofile_lock = threading.Lock()  # held by the rerun whose cProfile is running
+
+F = TypeVar("F", bound=Callable)
+
+
+class RerunProfile:
+    """Section timings, section events and (optionally) cProfile stats for one rerun."""
+
+    def __init__(self, name: str, cprofile: bool = False) -> None:
+        self.name = name
+        self.started_at = time.time()
+        self.total_ms = 0.0
+        self.frames: list[str] = []  # speedscope frame table, one entry per section name
+        self.events: list[tuple[str, int, float]] = []  # ("O" | "C", frame index, ms since start)
+        self.sections: dict[str, list[float]] = {}  # name -> [calls, total ms, self ms]
+        self.profiler = cProfile.Profile() if cprofile else None
+        self.cprofile_busy = False  # cProfile was asked for but another rerun held it
+        self._t0 = time.perf_counter()
+        self._stack: list[list] = []  # [name, start ms, child ms]
+
+    def _now(self) -> float:
+        return (time.perf_counter() - self._t0) * 1000
+
+    def _frame(self, name: str) -> int:
+        try:
+            return self.frames.index(name)
+        except ValueError:
+            self.frames.append(name)
+            return len(self.frames) - 1
+
+    @contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        start = self._now()
+        self.events.append(("O", self._frame(name), start))
+        self._stack.append([name, start, 0.0])
+        try:
+            yield
+        finally:
+            end = self._now()
+            _, _, child_ms = self._stack.pop()
+            elapsed = end - start
+            stats = self.sections.setdefault(name, [0, 0.0, 0.0])
+            stats[0] += 1
+            if all(entry[0] != name for entry in self._stack):
+                stats[1] += elapsed  # recursion: count the outermost call only
+            stats[2] += elapsed - child_ms
+            if self._stack:
+                self._stack[-1][2] += elapsed
+            self.events.append(("C", self._frame(name), end))
+
+    def rows(self) -> list[dict[str, object]]:
+        """Sections by self time, with each one's share of the rerun."""
+        total = self.total_ms or 1.0
+        return [
+            {
+                "section": name,
+                "calls": int(calls),
+                "self ms": round(self_ms, 2),
+                "total ms": round(total_ms, 2),
+                "% of rerun": round(self_ms / total * 100, 1),
+            }
+            for name, (calls, total_ms, self_ms) in sorted(self.sections.items(), key=lambda item: -item[1][2])
+        ]
+
+    def _stats(self) -> dict | None:
+        if self.profiler is None:
+            return None
+        return pstats.Stats(self.profiler).stats  # type: ignore[attr-defined]
+
+    def ownership(self) -> dict[str, float] | None:
+        """cProfile self time in ms: the app's own files, Streamlit, everything else."""
+        stats = self._stats()
+        if stats is None:
+            return None
+        split = {"app": 0.0, "streamlit": 0.0, "other": 0.0}
+        for (filename, _, _), (_, _, self_s, _, _) in stats.items():
+            if filename.startswith(_APP_DIR) and "site-packages" not in filename:
+                split["app"] += self_s * 1000
+            elif "streamlit" in Path(filename).parts:
+                split["streamlit"] += self_s * 1000
+            else:
+                split["other"] += self_s * 1000
+        return split
+
+    def pstats_bytes(self) -> bytes | None:
+        """The rerun's cProfile stats in the format ``pstats.Stats(path)`` loads."""
+        stats = self._stats()
+        return None if stats is None else marshal.dumps(stats)
+
+
+def active() -> RerunProfile | None:
+    """The profile recording the current thread's rerun, if any."""
+    return _current.get()
+
+
+@contextmanager
+def record(name: str, cprofile: bool = False) -> Iterator[RerunProfile]:
+    """Profile one rerun; ``name`` becomes its root section.
+
+    ``cprofile`` is honoured only if no other rerun is running cProfile; otherwise the
+    profile records sections only and has ``cprofile_busy`` set.
+    """
+    owns_cprofile = cprofile and _cprofile_lock.acquire(blocking=False)
+    profile = RerunProfile(name, owns_cprofile)
+    profile.cprofile_busy = cprofile and not owns_cprofile
+    token = _current.set(profile)
+    try:
+        if profile.profiler is not None:
+            profile.profiler.enable()
+        with profile.section(name):
+            yield profile
+    finally:
+        if profile.profiler is not None:
+            profile.profiler.disable()
+            _cprofile_lock.release()
+        profile.total_ms = profile._now()
+        _current.reset(token)
+
+
+def section(name: str):
+    """Time a block as ``name`` when a profile is active; a shared no-op otherwise."""
+    profile = _current.get()
+    return _NOT_PROFILING if profile is None else profile.section(name)
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """Decorator form of section()."""
+
+    def decorate(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            profile = _current.get()
+            if profile is None:
+                return fn(*args, **kwargs)
+            with profile.section(name):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def speedscope(profiles: Iterable[RerunProfile]) -> str:
+    """Evented speedscope JSON with one profile per rerun and a shared frame table."""
+    frames: list[str] = []
+    out = []
+    for profile in profiles:
+        index = []
+        for name in profile.frames:
+            if name not in frames:
+                frames.append(name)
+            index.append(frames.index(name))
+        started = time.strftime("%H:%M:%S", time.localtime(profile.started_at))
+        out.append(
+            {
+                "type": "evented",
+                "name": f"{profile.name} at {started}",
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": round(profile.total_ms, 3),
+                "events": [{"type": kind, "frame": index[frame], "at": round(at, 3)} for kind, frame, at in profile.events],
+            }
+        )
+    return json.dumps(
+        {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": [{"name": name} for name in frames]},
+            "profiles": out,
+            "name": "check-writing reruns",
+            "exporter": "check-writing profiling.py",
+        }
+    )
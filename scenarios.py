@@ -0,0 +1,276 @@
+"""Scenario catalog loaded from assets/scenarios.json.
+
+The file is parsed and validated once per process into immutable records indexed by
+id and by mode, and reloaded when its mtime changes. Amount-in-words and per-step
+values are derived from the scenario's own fields, so the JSON only needs to state
+them once. ``generate_scenario`` builds unlimited seeded practice checks for You do.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import random
+import threading
+from datetime import date, timedelta
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping, NamedTuple
+
+from validators import amount_to_words, parse_cents, validate_date
+
+FIELDS = ("date", "payee", "amount_numeric", "amount_words", "memo", "signature")
+MODES = ("i_do", "we_do", "you_do")
+DEFAULT_PATH = Path("assets/scenarios.json")
+
+# Explanations for scenarios that do not script their own steps
+_DEFAULT_EXPLANATIONS = {
+    "date": "Date",
+    "payee": "Payee",
+    "amount_numeric": "Numeric amount",
+    "amount_words": "Amount in words",
+    "memo": "Memo",
+    "signature": "Signature",
+}
+
+_LOGGER = logging.getLogger(__name__)
+
+# Generated practice checks use ids like "gen-48213"; the number is the seed
+GENERATED_PREFIX = "gen-"
+MAX_SEED_DIGITS = 18  # int() refuses very long digit strings; seeds never need more
+
+# (payee, memo, min dollars, max dollars) for generated practice checks
+_PAYEE_POOL = (
+    ("FreshMart", "Groceries", 12, 180),
+    ("Oakwood Apartments", "Rent", 650, 2400),
+    ("City Water Utility", "Water bill", 25, 140),
+    ("Lincoln High PTA", "Field trip fee", 10, 95),
+    ("Community Fund", "Donation", 5, 250),
+    ("Plumbing Inc", "Service call", 85, 900),
+    ("Bright Smile Dental", "Cleaning copay", 20, 300),
+    ("Greenway Lawn Care", "Mowing", 30, 160),
+    ("Riverside Auto Repair", "Brake repair", 120, 1800),
+    ("Maple Street Daycare", "Weekly tuition", 150, 420),
+    ("Harbor Insurance Co", "Renters insurance", 15, 95),
+    ("Sunrise Piano Studio", "Lessons", 40, 240),
+    ("Valley Electric", "Electric bill", 45, 260),
+    ("Northside Youth Soccer", "Registration", 35, 180),
+    ("Corner Hardware", "Supplies", 8, 320),
+)
+_SIGNER_POOL = (
+    "Jordan Patel", "Avery Thompson", "Riley Chen", "Morgan Diaz", "Casey Nguyen",
+    "Taylor Brooks", "Jamie Rivera", "Alex Kim", "Sam Okafor", "Drew Martinez",
+)
+_MONTH_NAMES = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+)
+_GENERATED_START = date(2025, 1, 1)
+_DEFAULT_STEPS_SPEC = tuple((f, _DEFAULT_EXPLANATIONS[f]) for f in FIELDS)
+
+
+class Step(NamedTuple):
+    field: str
+    value: str
+    explanation: str
+
+
+class Scenario(NamedTuple):
+    id: str
+    title: str
+    prompt: str
+    context: str
+    modes: tuple[str, ...]
+    date: str
+    payee: str
+    amount_numeric: str
+    amount_words: str
+    memo: str
+    signature: str
+    cents: int
+    steps: tuple[Step, ...]
+    expected: Mapping[str, str]
+
+
+class Catalog:
+    """All scenarios in file order, with id and mode indexes."""
+
+    __slots__ = ("scenarios", "by_id", "by_mode")
+
+    def __init__(self, scenarios: tuple[Scenario, ...]) -> None:
+        self.scenarios = scenarios
+        self.by_id: Mapping[str, Scenario] = MappingProxyType({sc.id: sc for sc in scenarios})
+        self.by_mode: Mapping[str, tuple[Scenario, ...]] = MappingProxyType(
+            {mode: tuple(sc for sc in scenarios if mode in sc.modes) for mode in MODES}
+        )
+
+    def get(self, scenario_id: str) -> Scenario | None:
+        return self.by_id.get(scenario_id)
+
+    def for_mode(self, mode: str) -> tuple[Scenario, ...]:
+        return self.by_mode.get(mode, ())
+
+    def first(self, mode: str) -> Scenario:
+        return self.by_mode[mode][0]
+
+
+def _text(raw: dict, key: str, where: str, required: bool = True) -> str:
+    value = raw.get(key, "")
+    if not isinstance(value, str) or (required and not value.strip()):
+        raise ValueError(f"{where}: '{key}' must be a non-empty string")
+    return value
+
+
+def _parse_scenario(raw: object, index: int) -> Scenario:
+    where = f"scenario #{index}"
+    if not isinstance(raw, dict):
+        raise ValueError(f"{where}: expected an object")
+    scenario_id = _text(raw, "id", where)
+    where = f"scenario '{scenario_id}'"
+
+    modes = raw.get("modes", [])
+    if not isinstance(modes, list) or not modes or any(m not in MODES for m in modes):
+        raise ValueError(f"{where}: 'modes' must list one or more of {', '.join(MODES)}")
+
+    values = {field: _text(raw, field, where, required=field != "memo") for field in FIELDS if field != "amount_words"}
+    if not validate_date(values["date"])[0]:
+        raise ValueError(f"{where}: invalid date {values['date']!r}")
+    cents = parse_cents(values["amount_numeric"])
+    if cents is None:
+        raise ValueError(f"{where}: invalid amount {values['amount_numeric']!r}")
+    values["amount_words"] = raw.get("amount_words") or amount_to_words(cents)
+
+    raw_steps = raw.get("steps") or [{"field": f, "explanation": _DEFAULT_EXPLANATIONS[f]} for f in FIELDS]
+    if not isinstance(raw_steps, list):
+        raise ValueError(f"{where}: 'steps' must be a list")
+    steps = []
+    for raw_step in raw_steps:
+        field = raw_step.get("field") if isinstance(raw_step, dict) else None
+        if field not in FIELDS:
+            raise ValueError(f"{where}: step field must be one of {', '.join(FIELDS)}")
+        steps.append(Step(field, raw_step.get("value") or values[field], _text(raw_step, "explanation", where)))
+
+    return Scenario(
+        id=scenario_id,
+        title=_text(raw, "title", where),
+        prompt=_text(raw, "prompt", where),
+        context=_text(raw, "context", where, required=False),
+        modes=tuple(modes),
+        date=values["date"],
+        payee=values["payee"],
+        amount_numeric=values["amount_numeric"],
+        amount_words=values["amount_words"],
+        memo=values["memo"],
+        signature=values["signature"],
+        cents=cents,
+        steps=tuple(steps),
+        expected=MappingProxyType({field: values[field] for field in FIELDS}),
+    )
+
+
+@lru_cache(maxsize=1024)
+def generate_scenario(seed: int) -> Scenario:
+    """Build a You do practice check from ``seed``; the same seed always gives the same check."""
+    rng = random.Random(seed)
+    payee, memo, low, high = rng.choice(_PAYEE_POOL)
+    signer = rng.choice(_SIGNER_POOL)
+    cents = rng.randint(low, high) * 100 + (0 if rng.random() < 0.4 else rng.randint(1, 99))
+    day = _GENERATED_START + timedelta(days=rng.randrange(365))
+    date_text = f"{day.month:02d}/{day.day:02d}/{day.year}"
+    amount = f"${cents // 100:,}.{cents % 100:02d}"
+    values = {
+        "date": date_text,
+        "payee": payee,
+        "amount_numeric": amount,
+        "amount_words": amount_to_words(cents),
+        "memo": memo,
+        "signature": signer,
+    }
+    return Scenario(
+        id=f"{GENERATED_PREFIX}{seed}",
+        title=f"Practice check #{seed}",
+        prompt=(
+            f"On {_MONTH_NAMES[day.month - 1]} {day.day}, {day.year}, write a check to {payee} "
+            f"for {amount} ({memo.lower()}). Sign as {signer}."
+        ),
+        context="",
+        modes=("you_do",),
+        cents=cents,
+        steps=tuple(Step(f, values[f], explanation) for f, explanation in _DEFAULT_STEPS_SPEC),
+        expected=MappingProxyType(values),
+        **values,
+    )
+
+
+def parse_seed(text: str) -> int | None:
+    """``text`` as a seed if it is 1 to MAX_SEED_DIGITS ASCII digits, else None."""
+    # isdigit() also accepts "²", which int() rejects
+    if len(text) <= MAX_SEED_DIGITS and text.isascii() and text.isdecimal():
+        return int(text)
+    return None
+
+
+def generated_seed(scenario_id: str) -> int | None:
+    """Seed encoded in a generated scenario id, or None for catalog ids."""
+    if scenario_id.startswith(GENERATED_PREFIX):
+        return parse_seed(scenario_id[len(GENERATED_PREFIX):])
+    return None
+
+
+def generate_pool(seed: int, size: int) -> list[int]:
+    """Seeds for a session's next ``size`` practice checks, reproducible from ``seed``."""
+    rng = random.Random(seed)
+    return [rng.randrange(10**6) for _ in range(size)]
+
+
+def parse_catalog(data: object) -> Catalog:
+    """Validate decoded JSON into a Catalog; raises ValueError describing the first problem."""
+    raw_list = data.get("scenarios") if isinstance(data, dict) else None
+    if not isinstance(raw_list, list) or not raw_list:
+        raise ValueError("expected {\"scenarios\": [...]} with at least one scenario")
+    scenarios = tuple(_parse_scenario(raw, i) for i, raw in enumerate(raw_list))
+    seen: set[str] = set()
+    for sc in scenarios:
+        if sc.id in seen:
+            raise ValueError(f"duplicate scenario id '{sc.id}'")
+        seen.add(sc.id)
+    catalog = Catalog(scenarios)
+    missing = [mode for mode in MODES if not catalog.for_mode(mode)]
+    if missing:
+        raise ValueError(f"no scenario for mode(s): {', '.join(missing)}")
+    return catalog
+
+
+def load_catalog(path: Path) -> Catalog:
+    return parse_catalog(json.loads(path.read_text(encoding="utf-8")))
+
+
+_lock = threading.Lock()
+_loaded: dict[Path, tuple[int, Catalog]] = {}
+
+
+def get_catalog(path: Path = DEFAULT_PATH) -> Catalog:
+    """Process-wide catalog for ``path``, re-read only when the file's mtime changes.
+
+    A file that fails validation on reload, or is missing while a deploy replaces it,
+    is logged and the previous catalog is kept, so a bad edit during class does not
+    take the app down.
+    """
+    with _lock:
+        entry = _loaded.get(path)
+        stamp = None
+        try:
+            stamp = path.stat().st_mtime_ns
+            if entry is not None and entry[0] == stamp:
+                return entry[1]
+            catalog = load_catalog(path)
+        except (OSError, ValueError):
+            if entry is None:
+                raise
+            _LOGGER.warning("Keeping previous scenarios; %s failed to reload", path, exc_info=True)
+            catalog = entry[1]
+            if stamp is None:  # no file to stamp; look again on the next call
+                return catalog
+        _loaded[path] = (stamp, catalog)
+        return catalog
@@ -0,0 +1,383 @@
+"""Multi-process serving: K ``streamlit run app.py`` workers behind a sticky-session proxy.
+
+One Streamlit process runs every session's script under one GIL, so a busy school
+saturates a single core. This launcher starts K workers on 127.0.0.1 (ports from
+``--worker-port`` up) and an asyncio reverse proxy on ``--port``. A session's state,
+websocket and media files live in one worker's memory, so the proxy pins each
+browser to a worker with a ``check_worker`` cookie (the worker number, nothing else).
+The websocket upgrade and everything after it is spliced through unchanged. New
+browsers go to the healthy worker with the fewest open websockets, and a worker that
+exits is restarted; its students reconnect to a fresh session.
+
+The proxy handles plain HTTP one request at a time (upstream with ``Connection:
+close``, keep-alive towards the browser), which lets it route every request by
+cookie and mark ``/app/static/`` responses immutable: app.py publishes those files
+under content-hashed names.
+
+    python serve.py                          one worker per available CPU, proxy on :8501
+    python serve.py --workers 4 --port 8080
+    CHECK_WORKERS=2 python serve.py -- --server.baseUrlPath=check-writing
+
+Arguments after ``--`` go to every ``streamlit run``. The proxy answers
+``/_serve/health`` itself, whatever ``server.baseUrlPath`` is: 200 while at least one
+worker passes its health check (run every ``HEALTH_INTERVAL_S``), 503 otherwise. The
+Dockerfile's HEALTHCHECK uses it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import math
+import os
+import secrets
+import signal
+import subprocess
+import sys
+from pathlib import Path
+from typing import Sequence
+
+ROOT = Path(__file__).resolve().parent
+COOKIE = "check_worker"
+HEALTH_PATH = "/_serve/health"
+IMMUTABLE = b"Cache-Control: public, max-age=31536000, immutable"
+HEALTH_INTERVAL_S = 2.0
+MAX_HEAD_BYTES = 64 * 1024
+
+_LOGGER = logging.getLogger("serve")
+_HOP_BY_HOP = {b"connection", b"keep-alive", b"proxy-connection"}
+
+
+def available_cpus() -> int:
+    """CPUs this process may use: the affinity mask, capped by a cgroup v2 CPU quota."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # not Linux
+        cpus = os.cpu_count() or 1
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+class Worker:
+    """One backend port and what the proxy knows about it."""
+
+    def __init__(self, index: int, port: int) -> None:
+        self.index = index
+        self.port = port
+        self.healthy = False
+        self.sessions = 0  # open websockets
+        self.assigned = 0  # browsers sent here without a cookie
+
+    def __repr__(self) -> str:
+        return f"Worker({self.index}, port={self.port}, healthy={self.healthy}, sessions={self.sessions})"
+
+
+class _Head:
+    """A parsed HTTP/1.x request or response head; header names are matched case-insensitively."""
+
+    def __init__(self, raw: bytes) -> None:
+        lines = raw[:-4].split(b"\r\n")
+        self.start = lines[0]
+        self.headers = [tuple(line.split(b":", 1)) for line in lines[1:] if b":" in line]
+
+    def get(self, name: bytes) -> bytes | None:
+        values = [v.strip() for k, v in self.headers if k.strip().lower() == name]
+        return b", ".join(values) if values else None
+
+    def without(self, names: set[bytes]) -> list[bytes]:
+        return [k + b":" + v for k, v in self.headers if k.strip().lower() not in names]
+
+    def cookie(self, name: str) -> str | None:
+        for part in (self.get(b"cookie") or b"").decode("latin-1").replace(",", ";").split(";"):
+            key, _, value = part.strip().partition("=")
+            if key == name:
+                return value
+        return None
+
+    @property
+    def target(self) -> str:
+        parts = self.start.split(b" ")
+        return parts[1].decode("latin-1") if len(parts) > 1 else ""
+
+    @property
+    def status(self) -> int:
+        parts = self.start.split(b" ")
+        return int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 0
+
+    def is_upgrade(self) -> bool:
+        return (self.get(b"upgrade") or b"").lower() == b"websocket"
+
+    def wants_close(self) -> bool:
+        return b"close" in (self.get(b"connection") or b"").lower() or self.start.endswith(b"HTTP/1.0")
+
+
+def _response(status: str, body: bytes = b"") -> bytes:
+    return (
+        f"HTTP/1.1 {status}\r\nContent-Type: text/plain\r\nContent-Length: {len(body)}\r\n"
+        f"Connection: close\r\n\r\n"
+    ).encode("latin-1") + body
+
+
+async def _pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while chunk := await reader.read(65536):
+            writer.write(chunk)
+            await writer.drain()
+    except (ConnectionError, asyncio.CancelledError):
+        pass
+
+
+async def _close(writer: asyncio.StreamWriter) -> None:
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except (ConnectionError, OSError):
+        pass
+
+
+class Proxy:
+    """Cookie-sticky HTTP and websocket proxy over a fixed list of workers."""
+
+    def __init__(self, workers: Sequence[Worker], health_path: str = "/_stcore/health") -> None:
+        self.workers = list(workers)
+        self.health_path = health_path
+
+    def pick(self, request: _Head) -> tuple[Worker | None, bool]:
+        """The request's worker and whether the browser needs a (new) cookie."""
+        pinned = request.cookie(COOKIE)
+        if pinned is not None and pinned.isascii() and pinned.isdecimal() and int(pinned) < len(self.workers):
+            worker = self.workers[int(pinned)]
+            if worker.healthy:
+                return worker, False
+        healthy = [w for w in self.workers if w.healthy]
+        if not healthy:
+            return None, False
+        worker = min(healthy, key=lambda w: (w.sessions, w.assigned))
+        worker.assigned += 1
+        return worker, True
+
+    def _cookie_header(self, request: _Head, worker: Worker) -> bytes:
+        # Embedded cross-site (EMBEDDING.md) the cookie is only sent back if it is SameSite=None; Secure
+        https = (request.get(b"x-forwarded-proto") or b"").lower() == b"https"
+        attrs = "SameSite=None; Secure" if https else "SameSite=Lax"
+        return f"Set-Cookie: {COOKIE}={worker.index}; Path=/; HttpOnly; {attrs}".encode("latin-1")
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while await self._one_request(reader, writer):
+                pass
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            await _close(writer)
+
+    async def _one_request(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+        """Proxy one request; True if the browser connection can carry another."""
+        try:
+            raw = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            return False  # browser closed an idle keep-alive connection
+        except asyncio.LimitOverrunError:
+            writer.write(_response("431 Request Header Fields Too Large"))
+            return False
+        request = _Head(raw)
+        if request.target.split("?", 1)[0] == HEALTH_PATH:
+            healthy = sum(w.healthy for w in self.workers)
+            status = "200 OK" if healthy else "503 Service Unavailable"
+            writer.write(_response(status, f"{healthy}/{len(self.workers)} workers healthy\n".encode()))
+            return False
+        worker, assign = self.pick(request)
+        if worker is None:
+            writer.write(_response("503 Service Unavailable", b"no healthy worker\n"))
+            return False
+        try:
+            up_reader, up_writer = await asyncio.open_connection("127.0.0.1", worker.port, limit=MAX_HEAD_BYTES)
+        except OSError:
+            worker.healthy = False
+            writer.write(_response("502 Bad Gateway", b"worker unavailable\n"))
+            return False
+
+        try:
+            if request.is_upgrade() or request.get(b"transfer-encoding") is not None:
+                return await self._splice(request, raw, assign, worker, reader, writer, up_reader, up_writer)
+            lines = [request.start, *request.without(_HOP_BY_HOP), b"Connection: close"]
+            up_writer.write(b"\r\n".join(lines) + b"\r\n\r\n")
+            length = int(request.get(b"content-length") or 0)
+            if length:
+                up_writer.write(await reader.readexactly(length))
+            await up_writer.drain()
+
+            response = _Head(await up_reader.readuntil(b"\r\n\r\n"))
+            lines = [response.start]
+            static = "/app/static/" in request.target and response.status == 200
+            lines += response.without(_HOP_BY_HOP | ({b"cache-control"} if static else set()))
+            if static:
+                lines.append(IMMUTABLE)
+            if assign:
+                lines.append(self._cookie_header(request, worker))
+            framed = response.get(b"content-length") is not None or b"chunked" in (
+                response.get(b"transfer-encoding") or b""
+            ).lower() or response.status in (204, 304) or request.start.startswith(b"HEAD ")
+            keep_alive = framed and not request.wants_close()
+            lines.append(b"Connection: keep-alive" if keep_alive else b"Connection: close")
+            writer.write(b"\r\n".join(lines) + b"\r\n\r\n")
+            await _pipe(up_reader, writer)  # upstream closes after the body
+            await writer.drain()
+            return keep_alive
+        finally:
+            await _close(up_writer)
+
+    async def _splice(self, request, raw, assign, worker, reader, writer, up_reader, up_writer) -> bool:
+        """Websocket (or chunked upload): forward the head, then copy bytes both ways until either side closes."""
+        up_writer.write(raw)
+        await up_writer.drain()
+        if assign:
+            response = await up_reader.readuntil(b"\r\n\r\n")
+            writer.write(response[:-2] + self._cookie_header(request, worker) + b"\r\n\r\n")
+        upgraded = request.is_upgrade()
+        worker.sessions += upgraded
+        try:
+            tasks = [asyncio.ensure_future(_pipe(reader, up_writer)), asyncio.ensure_future(_pipe(up_reader, writer))]
+            _, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            worker.sessions -= upgraded
+        return False
+
+    async def check(self, worker: Worker) -> bool:
+        """GET the worker's health endpoint directly."""
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection("127.0.0.1", worker.port), 2)
+        except (OSError, asyncio.TimeoutError):
+            return False
+        try:
+            writer.write(f"GET {self.health_path} HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: close\r\n\r\n".encode())
+            await writer.drain()
+            status = await asyncio.wait_for(reader.readline(), 2)
+            return status.split(b" ")[1:2] == [b"200"]
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+            return False
+        finally:
+            await _close(writer)
+
+
+class Launcher:
+    """Starts, health-checks and restarts the Streamlit workers."""
+
+    def __init__(self, count: int, first_port: int, streamlit_args: Sequence[str]) -> None:
+        self.workers = [Worker(i, first_port + i) for i in range(count)]
+        self.streamlit_args = list(streamlit_args)
+        self.processes: dict[int, subprocess.Popen] = {}
+        self.env = dict(os.environ)
+        # Every worker must accept the others' signed cookies (XSRF, auth) after a reassignment
+        self.env.setdefault("STREAMLIT_SERVER_COOKIE_SECRET", secrets.token_hex(32))
+
+    def _worker_env(self, worker: Worker) -> dict[str, str]:
+        env = dict(self.env, CHECK_METRICS_WORKER=str(worker.index))
+        if env.get("CHECK_METRICS_FILE"):
+            path = Path(env["CHECK_METRICS_FILE"])
+            env["CHECK_METRICS_FILE"] = str(path.with_name(f"{path.stem}-worker{worker.index}{path.suffix}"))
+        if env.get("CHECK_METRICS_PORT"):
+            env["CHECK_METRICS_PORT"] = str(int(env["CHECK_METRICS_PORT"]) + worker.index)
+        return env
+
+    def start(self, worker: Worker) -> None:
+        worker.healthy = False
+        self.processes[worker.index] = subprocess.Popen(
+            [
+                sys.executable, "-m", "streamlit", "run", str(ROOT / "app.py"),
+                f"--server.port={worker.port}", "--server.address=127.0.0.1", "--server.headless=true",
+                "--server.fileWatcherType=none", *self.streamlit_args,
+            ],
+            cwd=ROOT,
+            env=self._worker_env(worker),
+        )
+
+    async def supervise(self, proxy: Proxy) -> None:
+        for worker in self.workers:
+            self.start(worker)
+        while True:
+            for worker in self.workers:
+                process = self.processes[worker.index]
+                if process.poll() is not None:
+                    _LOGGER.warning("worker %d exited with %s; restarting", worker.index, process.returncode)
+                    self.start(worker)
+                    continue
+                healthy = await proxy.check(worker)
+                if healthy != worker.healthy:
+                    _LOGGER.info("worker %d on port %d is %s", worker.index, worker.port, "up" if healthy else "down")
+                worker.healthy = healthy
+            await asyncio.sleep(HEALTH_INTERVAL_S)
+
+    def stop(self) -> None:
+        for process in self.processes.values():
+            process.terminate()
+        for process in self.processes.values():
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+def _health_path(streamlit_args: Sequence[str]) -> str:
+    base = os.environ.get("STREAMLIT_SERVER_BASE_URL_PATH", "")
+    for arg in streamlit_args:
+        if arg.startswith("--server.baseUrlPath="):
+            base = arg.split("=", 1)[1]
+    if not base:
+        from streamlit import config  # reads .streamlit/config.toml
+
+        base = config.get_option("server.baseUrlPath") or ""
+    base = base.strip("/")
+    return f"/{base}/_stcore/health" if base else "/_stcore/health"
+
+
+async def serve(args: argparse.Namespace) -> None:
+    launcher = Launcher(args.workers, args.worker_port, args.streamlit_args)
+    proxy = Proxy(launcher.workers, _health_path(args.streamlit_args))
+    server = await asyncio.start_server(proxy.handle, args.host, args.port, limit=MAX_HEAD_BYTES)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+    supervisor = asyncio.ensure_future(launcher.supervise(proxy))
+    _LOGGER.info("proxy on %s:%d, %d worker(s) from port %d", args.host, args.port, args.workers, args.worker_port)
+    try:
+        await stop.wait()
+    finally:
+        server.close()
+        supervisor.cancel()
+        # Let the supervisor unwind first so it cannot restart a worker we are stopping
+        await asyncio.gather(supervisor, return_exceptions=True)
+        launcher.stop()
+
+
+def main(argv: list[str] | None = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    streamlit_args: list[str] = []
+    if "--" in argv:
+        at = argv.index("--")
+        argv, streamlit_args = argv[:at], argv[at + 1:]
+    default_workers = os.environ.get("CHECK_WORKERS", "auto")
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", default=default_workers, help="worker processes, or 'auto' for one per available CPU")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", "8501")))
+    parser.add_argument("--worker-port", type=int, default=8600, help="first worker port; workers bind 127.0.0.1")
+    args = parser.parse_args(argv)
+    args.workers = available_cpus() if args.workers == "auto" else max(1, int(args.workers))
+    args.streamlit_args = streamlit_args
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s serve %(levelname)s %(message)s")
+    asyncio.run(serve(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Per-session state for the I do / We do / You do flow, stored under one session_state key.
+
+Each mode keeps its data in a ``__slots__`` dataclass. Defaults are class-level
+constants shared by every session, so a new session allocates a handful of small
+objects and a rerun needs one key lookup instead of walking dozens of keys. The
+classes live outside app.py because Streamlit re-executes that file on every rerun,
+which would redefine them and break isinstance checks on stored objects.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Mapping
+
+from scenarios import FIELDS
+
+STATE_KEY = "check"
+
+
+@dataclass(slots=True)
+class CheckInputs:
+    """What the student has written in each check field."""
+
+    date: str = ""
+    payee: str = ""
+    amount_numeric: str = ""
+    amount_words: str = ""
+    memo: str = ""
+    signature: str = ""
+
+    def as_dict(self) -> dict[str, str]:
+        return {name: getattr(self, name) for name in FIELDS}
+
+    def update(self, values: Mapping[str, str]) -> None:
+        for name in FIELDS:
+            if name in values:
+                setattr(self, name, values[name])
+
+    def clear(self) -> None:
+        for name in FIELDS:
+            setattr(self, name, "")
+
+    def is_blank(self) -> bool:
+        return not any(getattr(self, name) for name in FIELDS)
+
+
+@dataclass(slots=True)
+class IDoState:
+    scenario: int | str = 0
+    step: int = -1  # -1 = before first step
+
+
+@dataclass(slots=True)
+class WeDoState:
+    inputs: CheckInputs = field(default_factory=CheckInputs)
+    step: int = 0
+    error: str = ""
+    completed: bool = False
+
+
+@dataclass(slots=True)
+class YouDoState:
+    inputs: CheckInputs = field(default_factory=CheckInputs)
+    scenario: str = ""  # catalog or generated id; chosen on first visit
+    seeds: list[int] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class SessionModel:
+    screen: str = "i_do"  # i_do -> we_do -> you_do
+    mode: str = "I do"
+    i_do: IDoState = field(default_factory=IDoState)
+    we_do: WeDoState = field(default_factory=WeDoState)
+    you_do: YouDoState = field(default_factory=YouDoState)
@@ -0,0 +1,166 @@
+import importlib
+import json
+import types
+import sys
+import os
+import subprocess
+from pathlib import Path
+
+
+def load_app_module():
+    project_root = Path(__file__).resolve().parents[1]
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+    mod = importlib.import_module("app")
+    assert isinstance(mod, types.ModuleType)
+    return mod
+
+
+def test_asset_cache_encodes_once_and_invalidates_on_change(tmp_path):
+    app = load_app_module()
+    img = tmp_path / "Check.PNG"
+    img.write_bytes(b"\x89PNG first")
+    (tmp_path / "notes.txt").write_text("ignored")
+    cache = app._AssetCache(tmp_path)
+
+    url = cache.first_data_url("check")
+    assert url and url.startswith("data:image/png;base64,")
+    assert cache.first_data_url("check") == url
+    assert cache.stats()["misses"] == 1 and cache.stats()["hits"] == 1
+
+    img.write_bytes(b"\x89PNG second, longer")
+    os.utime(img, ns=(1, 1))
+    assert cache.first_data_url("check") != url
+    assert cache.stats()["misses"] == 2
+
+
+def test_asset_cache_missing_assets_dir(tmp_path):
+    app = load_app_module()
+    cache = app._AssetCache(tmp_path / "nope")
+    assert cache.first_data_url("logo") is None
+
+
+def test_static_url_is_content_hashed_and_prunes_stale_copies(tmp_path):
+    app = load_app_module()
+    assets, static = tmp_path / "assets", tmp_path / "static"
+    assets.mkdir()
+    img = assets / "check.PNG"
+    img.write_bytes(b"v1")
+    cache = app._AssetCache(assets)
+
+    url1 = cache.static_url(img, static)
+    assert url1.startswith("app/static/check.") and url1.endswith(".png")
+    assert cache.static_url(img, static) == url1
+
+    img.write_bytes(b"v2 changed")
+    url2 = cache.static_url(img, static)
+    assert url2 != url1
+    assert [p.name for p in static.iterdir()] == [url2.rsplit("/", 1)[1]]
+
+
+def test_minify_css_keeps_descendant_selectors():
+    app = load_app_module()
+    css = "/* c */ html, body, [x=\"y\"] * {\n  color : red ;\n}\n.a:hover > .b { margin: 0 8px; }"
+    assert app._minify_css(css) == 'html,body,[x="y"] *{color:red}.a:hover>.b{margin:0 8px}'
+    css = ".a :hover, .b :focus-visible { color : red }\n@media (max-width : 480px) { p :first-child { margin : 0 } }"
+    assert app._minify_css(css) == ".a :hover,.b :focus-visible{color:red}@media (max-width : 480px){p :first-child{margin:0}}"
+
+
+def test_global_stylesheet_static_mode_is_an_import_stub(tmp_path, monkeypatch):
+    app = load_app_module()
+    monkeypatch.setattr(app, "_STATIC_DIR", tmp_path)
+    app._global_stylesheet.clear()  # cached per process; publish into tmp_path, not static/
+    try:
+        inline = app._global_stylesheet(None, False)
+        stub = app._global_stylesheet(None, True, bundle_fonts=False)
+    finally:
+        app._global_stylesheet.clear()
+    assert inline.startswith("<style>") and "--color-royal-blue" in inline
+    assert stub.startswith("<style>@import url('app/static/styles.") and len(stub) < 100
+    assert [p.name for p in tmp_path.iterdir()] == [stub.split("app/static/", 1)[1].split("'", 1)[0]]
+
+
+def test_bundled_fonts_publish_local_faces_only_when_complete(tmp_path, monkeypatch):
+    app = load_app_module()
+    fonts_dir, static_dir = tmp_path / "fonts", tmp_path / "static"
+    fonts_dir.mkdir()
+    monkeypatch.setattr(app, "_FONTS_DIR", fonts_dir)
+    for _, _, stem, _ in app._FONT_FACES[:-1]:
+        (fonts_dir / f"{stem}.woff2").write_bytes(stem.encode())
+    assert app._bundled_fonts(static_dir) is None
+
+    last = app._FONT_FACES[-1][2]
+    (fonts_dir / f"{last}.woff2").write_bytes(b"x")
+    css, preloads = app._bundled_fonts(static_dir)
+    assert css.count("@font-face") == len(app._FONT_FACES) and "font-display: swap" in css
+    assert "url('montserrat-400." in css and "googleapis" not in css
+    assert preloads and all(u.startswith("app/static/") and u.endswith(".woff2") for u in preloads)
+    assert len(list(static_dir.glob("*.woff2"))) == len(app._FONT_FACES)
+    assert "googleapis" not in app._minify_css(app._build_global_css(None, css))
+
+
+def test_fetch_fonts_tool_imports_without_the_app():
+    # Runs at docker build time; importing app.py would start exporters and publish assets
+    root = Path(__file__).resolve().parents[1]
+    code = "import json, runpy, sys; runpy.run_path('tools/fetch_fonts.py', run_name='fetch'); print(json.dumps(list(sys.modules)))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+    loaded = set(json.loads(result.stdout))
+    assert "fonts" in loaded and not loaded & {"app", "streamlit", "metrics", "profiling"}
+
+
+def test_overlay_store_reloads_only_on_mtime_change(tmp_path):
+    app = load_app_module()
+    path = tmp_path / "overlay.json"
+    path.write_text('{"date": {"top": 1, "left": 2, "width": 3, "height": 4}, "memo": {"top": "x"}}')
+    store = app._OverlayStore(path)
+
+    layout = store.get()
+    assert store.get() is layout and store.loads == 1
+    assert layout.styles["date"] == "left:2%; top:1%; width:3%; height:4%;"
+    assert layout.positions["memo"] == app._DEFAULT_OVERLAY_POSITIONS["memo"]
+
+    path.write_text('{"date": {"top": 5, "left": 2, "width": 3, "height": 4}}')
+    os.utime(path, ns=(10**18, 10**18))
+    reloaded = store.get()
+    assert store.loads == 2 and reloaded.positions["date"]["top"] == 5
+    assert reloaded.version != layout.version
+
+
+def test_overlay_store_missing_file_uses_defaults(tmp_path):
+    app = load_app_module()
+    store = app._OverlayStore(tmp_path / "overlay.json")
+    assert store.get().positions == app._DEFAULT_OVERLAY_POSITIONS
+    assert store.loads == 0
+
+
+def test_fragment_cache_reuses_templates_and_escapes_values():
+    app = load_app_module()
+    cache = app._FragmentCache(maxsize=2)
+    builds = []
+
+    def build():
+        builds.append(1)
+        return f"<textarea>{app._slot('payee')}</textarea><b>{app._slot('error')}</b>"
+
+    template = cache.get(("we_do", 0), build)
+    assert cache.get(("we_do", 0), build) is template and len(builds) == 1
+    assert template.fill({"payee": "A&B <Co>", "error": ""}) == "<textarea>A&amp;B &lt;Co&gt;</textarea><b></b>"
+
+    cache.get(("we_do", 1), build)
+    cache.get(("we_do", 2), build)
+    assert cache.stats() == {"hits": 1, "misses": 3, "entries": 2}
+    assert app._HtmlTemplate("<div>static</div>").fill() == "<div>static</div>"
+
+
+def test_i_do_frames_are_built_together_and_player_ships_them_all():
+    app = load_app_module()
+    guided = app._get_catalog().first("i_do")
+    layout = app._overlay_layout()
+    frames = app._i_do_frames(guided, layout, None)
+    assert len(frames) == len(guided.steps) + 1
+    assert app._i_do_frames(guided, layout, None) is frames
+    assert frames[0] == app._i_do_check_html(guided, -1, layout, None)
+
+    player = app._i_do_player_html(guided, layout, None, False)
+    assert player.count("check-real") >= len(frames)
+    assert "</div>" not in player.split("<script>", 1)[1]  # frames are escaped inside the script
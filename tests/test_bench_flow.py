@@ -0,0 +1,29 @@
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import bench_flow  # noqa: E402
+
+
+def test_scripted_flow_reaches_every_screen():
+    record = bench_flow._Recorder(trace_memory=False)
+    with bench_flow._instrumented():
+        bench_flow.run_flow(record)
+    assert set(record.samples) == set(bench_flow.SCREENS)
+    assert all(delta_bytes > 0 for samples in record.samples.values() for _, delta_bytes, _ in samples)
+
+
+def test_compare_flags_only_metrics_over_the_threshold():
+    baseline = {"screens": {"i_do": {"ms_per_rerun": 10.0, "delta_bytes_per_rerun": 1000, "peak_kib": 100.0}}}
+    results = {"i_do": {"ms_per_rerun": 12.0, "delta_bytes_per_rerun": 1300, "peak_kib": 90.0}}
+    assert bench_flow.compare(results, baseline, 25) == ["i_do delta_bytes_per_rerun: 1300 vs baseline 1000 (+30%)"]
+    assert bench_flow.compare({}, baseline, 25) == ["i_do: not measured in this run"]
+
+
+def test_stored_baseline_covers_every_screen():
+    baseline = json.loads(bench_flow.BASELINE.read_text(encoding="utf-8"))
+    assert set(baseline["screens"]) == set(bench_flow.SCREENS)
+    assert all(set(m) == set(bench_flow.METRICS) for m in baseline["screens"].values())
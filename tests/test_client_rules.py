@@ -0,0 +1,58 @@
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import fields  # noqa: E402
+import validators  # noqa: E402
+
+VECTORS = json.loads((ROOT / "tests" / "validation_vectors.json").read_text(encoding="utf-8"))
+RULES_JS = ROOT / "components" / "check_overlay" / "rules.js"
+
+# Reads [{rules, cases}] on stdin, writes [[ok, message], ...] per check
+_NODE_RUNNER = """
+const CheckRules = require(process.argv[1]);
+let input = '';
+process.stdin.on('data', (chunk) => { input += chunk; });
+process.stdin.on('end', () => {
+  const out = JSON.parse(input).map(({ rules, cases }) =>
+    cases.map(([field, value]) => CheckRules.validateField(rules, field, value)));
+  process.stdout.write(JSON.stringify(out));
+});
+"""
+
+
+def _expected_results(check):
+    return [[ok, message] for _, _, ok, message in check["cases"]]
+
+
+def test_python_rules_match_the_shared_vectors():
+    for check in VECTORS["checks"]:
+        got = [list(fields.validate_check({field: value}, check["expected"])[field]) for field, value, _, _ in check["cases"]]
+        assert got == _expected_results(check)
+
+
+def test_client_rules_are_json_and_built_once_per_scenario():
+    expected = VECTORS["checks"][0]["expected"]
+    rules = validators.client_rules(expected)
+    assert validators.client_rules(dict(expected)) is rules
+    assert json.loads(json.dumps(rules)) == rules
+    assert rules["amount_numeric"]["cents"] == 4567
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+def test_browser_rules_match_the_shared_vectors():
+    payload = [{"rules": validators.client_rules(c["expected"]), "cases": c["cases"]} for c in VECTORS["checks"]]
+    result = subprocess.run(
+        ["node", "-e", _NODE_RUNNER, str(RULES_JS)],
+        input=json.dumps(payload), capture_output=True, text=True, timeout=60, check=True,
+    )
+    for check, got in zip(VECTORS["checks"], json.loads(result.stdout)):
+        for case, want, have in zip(check["cases"], _expected_results(check), got):
+            assert have == want, case
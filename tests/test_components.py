@@ -0,0 +1,52 @@
+import importlib
+import sys
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+
+def load_app_module():
+    project_root = Path(__file__).resolve().parents[1]
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+    return importlib.import_module("app")
+
+
+def _overlay_script():
+    import streamlit as st
+
+    import app
+
+    values = st.session_state.get("fields", {"date": "", "payee": ""})
+    st.session_state.fields = app._check_overlay_component(
+        bg_url=None, positions={}, values=values, editable=True
+    )
+
+
+def test_overlay_batches_are_applied_once(monkeypatch):
+    app = load_app_module()
+    sent = {"value": None}
+    monkeypatch.setattr(app, "_check_overlay", lambda **kwargs: sent["value"])
+    at = AppTest.from_function(_overlay_script)
+    at.run()
+    assert at.session_state["fields"] == {"date": "", "payee": ""}
+
+    sent["value"] = {"batch": "a", "seq": 1, "changes": {"payee": "FreshMart", "bogus": "x"}}
+    at.run()
+    assert at.session_state["fields"] == {"date": "", "payee": "FreshMart"}
+
+    # Python clears the field; the component still reports its last batch, which must not reapply
+    at.session_state["fields"] = {"date": "", "payee": ""}
+    at.run()
+    assert at.session_state["fields"] == {"date": "", "payee": ""}
+
+    sent["value"] = {"batch": "a", "seq": 2, "changes": {"date": "10/20/2025"}}
+    at.run()
+    assert at.session_state["fields"] == {"date": "10/20/2025", "payee": ""}
+
+
+def test_overlay_component_ships_its_protocol_locally():
+    root = Path(__file__).resolve().parents[1] / "components" / "check_overlay"
+    html = (root / "index.html").read_text(encoding="utf-8")
+    assert "unpkg.com" not in html and "innerHTML = ''" not in html
+    assert (root / "streamlit-component.js").is_file()
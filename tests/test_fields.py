@@ -0,0 +1,50 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import fields  # noqa: E402
+import state  # noqa: E402
+from scenarios import FIELDS  # noqa: E402
+
+EXPECTED = {"payee": "FreshMart", "amount_numeric": "45.67", "amount_words": "Forty-five and 67/100"}
+
+
+def test_registry_covers_every_check_input():
+    assert fields.FIELD_NAMES == FIELDS
+    assert set(fields.FIELD_NAMES) == set(state.CheckInputs.__slots__)
+
+
+def test_check_step_messages():
+    payee = fields.FIELDS_BY_NAME["payee"]
+    assert fields.check_step(payee, "  ", EXPECTED, 4567) == (False, "Please enter the payee name before continuing")
+    assert fields.check_step(payee, "FreshMart", EXPECTED, 4567) == (True, "")
+    assert fields.check_step(fields.FIELDS_BY_NAME["memo"], "", EXPECTED, 4567) == (True, "")
+    ok, message = fields.check_step(fields.FIELDS_BY_NAME["amount_numeric"], "1.00", EXPECTED, 4567)
+    assert not ok and message
+
+
+def test_instructions_are_formatted_once_per_scenario():
+    first = fields.instructions("10/20/2025", "FreshMart", 4567)
+    assert first["amount_numeric"] == "Enter the numeric amount: 45.67"
+    assert fields.instructions("10/20/2025", "FreshMart", 4567) is first
+    assert fields.FIELDS_BY_NAME["amount_numeric"].normalize("$ 12.00") == "12.00"
+
+
+def test_validate_check_and_summaries_follow_the_registry(monkeypatch):
+    check_number = fields.FieldSpec(
+        "check_number", "Check Number", str.strip,
+        lambda value, expected, cents: (value == expected["check_number"], "Use the next check number"),
+        True, "", "", "", "",
+    )
+    monkeypatch.setattr(fields, "FIELD_SPECS", fields.FIELD_SPECS + (check_number,))
+    results = fields.validate_check({"check_number": "1002", "memo": "rent"}, {**EXPECTED, "check_number": "1001"})
+    assert list(results) == [*fields.FIELD_NAMES, "check_number"]
+    assert results["check_number"] == (False, "Use the next check number")
+
+    lines = {spec.name: fields.summary_line(spec, value, *results[spec.name])
+             for spec, value in zip(fields.FIELD_SPECS, ("", "", "", "", "rent", "", "1002"))}
+    assert lines["check_number"] == ("❌", "Use the next check number")
+    assert lines["memo"] == ("ℹ️", "Added (optional)")
+    assert lines["signature"] == ("⚠️", "Add your signature")
+    assert fields.summary_line(fields.FIELDS_BY_NAME["memo"], "", True, None) is None
@@ -0,0 +1,106 @@
+import importlib
+import sys
+import threading
+import urllib.request
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import metrics  # noqa: E402
+
+APP = str(ROOT / "app.py")
+
+
+@pytest.fixture
+def fresh_metrics():
+    importlib.reload(metrics)
+    metrics.enable()
+    yield metrics
+    importlib.reload(metrics)  # back to disabled for the rest of the suite
+
+
+def _value(text, line_prefix):
+    return next(float(line.rsplit(" ", 1)[1]) for line in text.splitlines() if line.startswith(line_prefix))
+
+
+def test_histogram_buckets_are_cumulative(fresh_metrics):
+    for _ in range(3):
+        with fresh_metrics.rerun("full", "we_do", "s1"):
+            pass
+    with fresh_metrics.rerun("fragment", "we_do", "s2"):
+        with fresh_metrics.rerun("fragment", "we_do", "s2"):  # nested: counted once
+            pass
+    text = fresh_metrics.render()
+    assert _value(text, 'check_reruns_total{kind="full",screen="we_do"}') == 3
+    assert _value(text, 'check_reruns_total{kind="fragment",screen="we_do"}') == 1
+    assert _value(text, 'check_rerun_duration_seconds_bucket{screen="we_do",le="0.005"}') == 4
+    assert _value(text, 'check_rerun_duration_seconds_bucket{screen="we_do",le="+Inf"}') == 4
+    assert _value(text, "check_sessions_active") == 2
+
+
+def test_flow_counts_validation_and_caches_without_student_input(fresh_metrics, tmp_path):
+    at = AppTest.from_file(APP, default_timeout=30)
+    at.run()
+    at.session_state["check"].screen = "we_do"
+    at.run()
+    at.text_input(key="we_input_date").input("13/45/2025").run()
+    at.button(key="we_next").click().run()
+    at.text_input(key="we_input_date").input("11/01/2025").run()
+    at.button(key="we_next").click().run()
+
+    text = fresh_metrics.render()
+    assert _value(text, 'check_validation_total{mode="we_do",field="date",outcome="error"}') == 1
+    assert _value(text, 'check_validation_total{mode="we_do",field="date",outcome="ok"}') == 1
+    assert _value(text, 'check_reruns_total{kind="full",screen="we_do"}') >= 5
+    assert 'check_cache_hits_total{cache="check_html"}' in text
+    assert "13/45/2025" not in text and "11/01/2025" not in text
+
+    path = tmp_path / "check.prom"
+    fresh_metrics.write(path)
+    assert path.read_text(encoding="utf-8") == fresh_metrics.render()
+
+
+def test_http_endpoint_serves_metrics_only(fresh_metrics):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), fresh_metrics._Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with urllib.request.urlopen(f"{base}/metrics") as resp:
+            assert resp.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            assert b"# TYPE check_rerun_duration_seconds histogram" in resp.read()
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"{base}/")
+    finally:
+        server.shutdown()
+
+
+def test_serve_worker_label_on_every_series(fresh_metrics):
+    fresh_metrics.start_from_env({"CHECK_METRICS_WORKER": "3"})
+    fresh_metrics.enable()
+    fresh_metrics.validation("you_do", "payee", True)
+    text = fresh_metrics.render()
+    assert 'check_sessions_active{worker="3"} 0' in text
+    assert 'check_validation_total{mode="you_do",field="payee",outcome="ok",worker="3"} 1' in text
+
+
+def test_screen_from_the_url_never_reaches_a_label(fresh_metrics):
+    hostile = 'x"} 1\ncheck_injected 9 #'
+    at = AppTest.from_file(APP, default_timeout=30)
+    at.query_params.update({"we_nav": "next", "screen": hostile})
+    at.run()
+    assert not at.exception
+    text = fresh_metrics.render()
+    assert "check_injected" not in text and hostile not in text
+    assert _value(text, 'check_reruns_total{kind="full",screen="other"}') >= 1
+    assert all(line.startswith("#") or line.startswith("check_") for line in text.splitlines())
+
+
+def test_label_values_are_escaped(fresh_metrics):
+    fresh_metrics.start_from_env({"CHECK_METRICS_WORKER": 'a"b\\c\nd'})
+    fresh_metrics.enable()
+    assert 'check_sessions_active{worker="a\\"b\\\\c\\nd"} 0' in fresh_metrics.render()
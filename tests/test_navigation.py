@@ -0,0 +1,110 @@
+import functools
+import importlib
+import sys
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import metrics  # noqa: E402
+
+APP = str(ROOT / "app.py")
+
+
+def _we_do():
+    at = AppTest.from_file(APP, default_timeout=30)
+    at.run()
+    at.session_state["check"].screen = "we_do"
+    at.run()
+    return at
+
+
+def test_we_do_callbacks_advance_within_the_session():
+    at = _we_do()
+    at.text_input(key="we_input_date").input("10/20/2025").run()
+    assert at.session_state["check"].we_do.inputs.date == "10/20/2025"
+    at.button(key="we_next").click().run()
+    assert at.session_state["check"].we_do.step == 1 and not at.exception
+    at.text_input(key="we_input_payee").input("Nobody").run()
+    at.button(key="we_next").click().run()
+    assert at.session_state["check"].we_do.step == 1 and at.session_state["check"].we_do.error
+    at.button(key="we_back").click().run()
+    assert at.session_state["check"].we_do.step == 0
+    assert at.text_input(key="we_input_date").value == "10/20/2025"
+
+
+def test_we_do_legacy_links_keep_their_mode():
+    at = AppTest.from_file(APP, default_timeout=30)
+    at.query_params.update({"we_nav": "next", "screen": "we_do", "nav": "links"})
+    at.run()
+    assert at.session_state["check"].screen == "we_do" and not at.exception
+    assert dict(at.query_params) == {"nav": "links"}
+
+
+def test_you_do_seed_query_param_falls_back_unless_a_short_ascii_number():
+    cases = (("1234", "gen-1234"), ("²", None), ("١٢", None), ("-5", None), ("9" * 5000, None), ("9" * 19, None))
+    for seed, expected in cases:
+        at = AppTest.from_file(APP, default_timeout=30)
+        at.query_params["seed"] = seed
+        at.run()
+        at.session_state["check"].screen = "you_do"
+        at.run()
+        assert not at.exception, seed[:20]
+        scenario = at.session_state["check"].you_do.scenario
+        assert scenario == expected if expected else not scenario.startswith("gen-"), (seed[:20], scenario)
+
+
+def _fragment_clicker(at):
+    """Click as the browser does inside a fragment: the rerun carries the newest fragment's id.
+
+    AppTest only sends full reruns, so this reaches into its fragment storage and script
+    runner; the test is skipped rather than failing when a Streamlit release moves them.
+    """
+    try:
+        from streamlit.runtime.scriptrunner import RerunData
+        from streamlit.testing.v1 import local_script_runner
+
+        storage = at._fragment_storage
+        storage._fragments, storage._registration_sequence_by_id, local_script_runner.RerunData
+    except (ImportError, AttributeError) as exc:
+        pytest.skip(f"AppTest internals used to send a fragment rerun are missing: {exc}")
+
+    def click(button):
+        newest = max(storage._fragments, key=storage._registration_sequence_by_id.get)
+        rerun_data = functools.partial(RerunData, fragment_id=newest)
+        with mock.patch.object(local_script_runner, "RerunData", rerun_data):
+            button.click().run()
+
+    return click
+
+
+def test_clicks_inside_the_check_area_rerun_only_its_fragment():
+    importlib.reload(metrics)
+    metrics.enable()
+    try:
+        at = AppTest.from_file(APP, default_timeout=30)
+        at.run()
+        click_in_fragment = _fragment_clicker(at)
+        step = at.session_state["check"].i_do.step
+        click_in_fragment(next(b for b in at.button if b.label == "Next"))
+        assert at.session_state["check"].i_do.step == step + 1 and not at.exception
+        assert metrics._reruns == {("full", "i_do"): 1, ("fragment", "i_do"): 1}
+
+        at.session_state["check"].screen = "we_do"
+        at.run()
+        at.text_input(key="we_input_date").input("10/20/2025")
+        click_in_fragment(at.button(key="we_next"))
+        assert at.session_state["check"].we_do.step == 1 and at.session_state["check"].screen == "we_do"
+
+        at.session_state["check"].screen = "you_do"
+        at.run()
+        click_in_fragment(next(b for b in at.button if b.label == "Check my work"))
+        assert any(m.value == "### Results" for m in at.markdown) and not at.exception
+        # main() ran once per screen, never for a click in a check area
+        assert metrics._reruns == {(kind, screen): 1 for kind in ("full", "fragment") for screen in ("i_do", "we_do", "you_do")}
+    finally:
+        importlib.reload(metrics)
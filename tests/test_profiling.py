@@ -0,0 +1,82 @@
+import json
+import pstats
+import sys
+from pathlib import Path
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import profiling  # noqa: E402
+
+APP = str(ROOT / "app.py")
+
+
+def test_sections_split_self_time_and_skip_when_inactive():
+    @profiling.timed("html")
+    def build(depth):
+        return build(depth - 1) if depth else "x"
+
+    assert profiling.section("html") is profiling.section("validation")  # shared no-op
+    assert build(2) == "x" and profiling.active() is None
+
+    with profiling.record("main") as profile:
+        with profiling.section("validation"):
+            build(2)
+    calls, total_ms, self_ms = profile.sections["html"]
+    assert calls == 3 and total_ms <= profile.sections["validation"][1]
+    assert abs(sum(s[2] for s in profile.sections.values()) - profile.total_ms) < 0.5
+    assert profiling.active() is None
+
+    doc = json.loads(profiling.speedscope([profile, profile]))
+    events = doc["profiles"][0]["events"]
+    assert len(doc["profiles"]) == 2 and [e["type"] for e in events].count("O") == 5
+    assert [f["name"] for f in doc["shared"]["frames"]] == ["main", "validation", "html"]
+
+
+def test_full_profile_dumps_loadable_pstats(tmp_path):
+    with profiling.record("main", cprofile=True) as profile:
+        sorted(range(1000))
+    path = tmp_path / "rerun.pstats"
+    path.write_bytes(profile.pstats_bytes())
+    assert pstats.Stats(str(path)).total_calls > 0
+    assert set(profile.ownership()) == {"app", "streamlit", "other"}
+
+
+def test_only_one_rerun_runs_cprofile_at_a_time():
+    with profiling.record("main", cprofile=True) as first:
+        with profiling.record("fragment", cprofile=True) as second:
+            pass
+    assert first.profiler is not None and not first.cprofile_busy
+    assert second.profiler is None and second.cprofile_busy and second.pstats_bytes() is None
+    with profiling.record("main", cprofile=True) as third:
+        pass
+    assert third.profiler is not None  # released once the first rerun finished
+
+
+def test_profile_query_param_records_reruns_and_shows_panel():
+    markdown = st.markdown
+    at = AppTest.from_file(APP, default_timeout=30)
+    at.run()
+    assert "rerun_profiles" not in at.session_state and not at.expander
+
+    at.query_params.update({"dev": "1", "profile": "1"})
+    at.run()
+    profile = at.session_state["rerun_profiles"][-1]
+    assert profile.name == "main"
+    assert {"inject_global_styles", "render_check_guided", "assets", "st.markdown"} <= set(profile.sections)
+    assert at.expander[0].label.startswith("Rerun profile: main")
+    # Downloading a profile must not rerun the app (and profile itself)
+    assert [(b.proto.label, b.proto.ignore_rerun) for b in at.get("download_button")] == [("Speedscope JSON", True)]
+    at.query_params["profile"] = "full"
+    at.run()
+    assert not at.exception and all(b.proto.ignore_rerun for b in at.get("download_button"))
+    assert [b.proto.label for b in at.get("download_button")] == ["Speedscope JSON", "pstats (last rerun)"]
+    # Sections are opened at the call sites; nothing process-wide is rebound
+    assert st.markdown is markdown
+    import app
+    import fields
+
+    assert app._check_step is fields.check_step
@@ -0,0 +1,97 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import scenarios  # noqa: E402
+
+
+def _write(path, data):
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def _scenario(**overrides):
+    sc = {
+        "id": "s1", "modes": ["i_do", "we_do", "you_do"], "title": "T", "prompt": "P",
+        "date": "10/20/2025", "payee": "FreshMart", "amount_numeric": "$64.32",
+        "memo": "", "signature": "John Doe",
+    }
+    sc.update(overrides)
+    return sc
+
+
+def test_shipped_catalog_is_valid_and_indexed():
+    catalog = scenarios.load_catalog(Path(__file__).resolve().parents[1] / "assets" / "scenarios.json")
+    assert catalog.first("i_do").id == "plumbing-150"
+    assert catalog.first("we_do").amount_words == "One thousand two hundred dollars and 00/100"
+    assert [sc.id for sc in catalog.for_mode("you_do")][0] == "field-trip-8645"
+    assert catalog.by_id["rent-1200"].steps[3].value == "One thousand two hundred dollars and 00/100"
+
+
+def test_scenario_without_steps_gets_default_walkthrough():
+    catalog = scenarios.parse_catalog({"scenarios": [_scenario()]})
+    sc = catalog.get("s1")
+    assert [s.field for s in sc.steps] == list(scenarios.FIELDS)
+    assert sc.cents == 6432 and sc.expected["amount_words"] == "Sixty-four dollars and 32/100"
+    with pytest.raises(AttributeError):
+        sc.payee = "x"
+
+
+@pytest.mark.parametrize("bad", [
+    {"amount_numeric": "sixty"}, {"date": "13/45/2025"}, {"modes": ["later"]}, {"payee": ""},
+])
+def test_invalid_scenarios_are_rejected(bad):
+    with pytest.raises(ValueError):
+        scenarios.parse_catalog({"scenarios": [_scenario(**bad)]})
+
+
+def test_get_catalog_reloads_on_change_and_keeps_last_good(tmp_path):
+    path = tmp_path / "scenarios.json"
+    _write(path, {"scenarios": [_scenario()]})
+    first = scenarios.get_catalog(path)
+    assert scenarios.get_catalog(path) is first
+
+    _write(path, {"scenarios": [_scenario(id="s2")]})
+    os.utime(path, ns=(10**18, 10**18))
+    assert scenarios.get_catalog(path).get("s2") is not None
+
+    path.write_text("{not json", encoding="utf-8")
+    os.utime(path, ns=(2 * 10**18, 2 * 10**18))
+    assert scenarios.get_catalog(path).get("s2") is not None
+
+
+def test_get_catalog_keeps_last_good_while_the_file_is_missing(tmp_path):
+    path = tmp_path / "scenarios.json"
+    _write(path, {"scenarios": [_scenario()]})
+    first = scenarios.get_catalog(path)
+
+    path.rename(tmp_path / "scenarios.json.old")
+    assert scenarios.get_catalog(path) is first
+
+    _write(path, {"scenarios": [_scenario(id="s2")]})
+    os.utime(path, ns=(10**18, 10**18))
+    assert scenarios.get_catalog(path).get("s2") is not None
+
+    with pytest.raises(OSError):
+        scenarios.get_catalog(tmp_path / "never-there.json")
+
+
+def test_generated_scenarios_are_reproducible_and_self_consistent():
+    from fields import validate_check
+
+    a = scenarios.generate_scenario.__wrapped__(1234)
+    b = scenarios.generate_scenario.__wrapped__(1234)
+    assert a == b and a.id == "gen-1234"
+    assert scenarios.generated_seed(a.id) == 1234 and scenarios.generated_seed("rent-1200") is None
+    assert scenarios.generated_seed("gen-²") is None
+    assert scenarios.generated_seed("gen-" + "9" * 18) == 10**18 - 1
+    assert scenarios.generated_seed("gen-" + "9" * 5000) is None
+    assert scenarios.generate_pool(7, 5) == scenarios.generate_pool(7, 5)
+    for seed in scenarios.generate_pool(99, 50):
+        sc = scenarios.generate_scenario(seed)
+        results = validate_check(dict(sc.expected), sc.expected)
+        assert all(ok for ok, _ in results.values()), (seed, results)
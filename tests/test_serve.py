@@ -0,0 +1,175 @@
+import argparse
+import asyncio
+import os
+import signal
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import serve  # noqa: E402
+
+
+async def _backend(index: int, seen: list):
+    """Stands in for a Streamlit worker: answers HTTP with its index, echoes after an upgrade."""
+
+    async def handle(reader, writer):
+        head = await reader.readuntil(b"\r\n\r\n")
+        seen.append((index, head))
+        if b"Upgrade: websocket" in head:
+            writer.write(b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n\r\n")
+            while data := await reader.read(1024):
+                writer.write(data)
+                await writer.drain()
+        else:
+            body = f"worker {index}".encode()
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nCache-Control: no-cache\r\nContent-Length: " + str(len(body)).encode()
+                + b"\r\n\r\n" + body
+            )
+            await writer.drain()
+        writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+async def _request(reader, writer, path, cookie=None):
+    extra = f"Cookie: {cookie}\r\n" if cookie else ""
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: x\r\n{extra}\r\n".encode())
+    await writer.drain()
+    head = (await reader.readuntil(b"\r\n\r\n")).decode()
+    length = int(next(l.split(":")[1] for l in head.split("\r\n") if l.lower().startswith("content-length")))
+    return head, (await reader.readexactly(length)).decode()
+
+
+def _with_proxy(test):
+    async def run():
+        seen: list = []
+        backends = [await _backend(i, seen) for i in range(2)]
+        workers = [serve.Worker(i, b.sockets[0].getsockname()[1]) for i, b in enumerate(backends)]
+        for worker in workers:
+            worker.healthy = True
+        proxy = serve.Proxy(workers)
+        server = await asyncio.start_server(proxy.handle, "127.0.0.1", 0)
+        try:
+            await test(server.sockets[0].getsockname()[1], workers, seen)
+        finally:
+            server.close()
+            for backend in backends:
+                backend.close()
+
+    asyncio.run(run())
+
+
+def test_http_requests_stick_to_the_cookie_worker_over_keep_alive():
+    async def test(port, workers, seen):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        head, body = await _request(reader, writer, "/")
+        assert "Set-Cookie: check_worker=0; Path=/; HttpOnly; SameSite=Lax" in head and body == "worker 0"
+        assert "Connection: keep-alive" in head
+        head, body = await _request(reader, writer, "/app/static/check.0123456789ab.png", cookie="check_worker=1")
+        assert body == "worker 1" and "Set-Cookie" not in head
+        assert "Cache-Control: public, max-age=31536000, immutable" in head and "no-cache" not in head
+        assert all(b"Connection: close" in h for _, h in seen)  # one upstream connection per request
+        writer.close()
+
+    _with_proxy(test)
+
+
+def test_websocket_is_spliced_and_counted_against_its_worker():
+    async def test(port, workers, seen):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET /_stcore/stream HTTP/1.1\r\nHost: x\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n\r\n")
+        head = (await reader.readuntil(b"\r\n\r\n")).decode()
+        assert head.startswith("HTTP/1.1 101") and "check_worker=0" in head
+        writer.write(b"\x82\x03abc")
+        assert await reader.readexactly(5) == b"\x82\x03abc"
+        assert workers[0].sessions == 1
+        assert proxy_pick_index(workers) == 1  # the next new browser goes to the idle worker
+        writer.close()
+        await asyncio.sleep(0.05)
+        assert workers[0].sessions == 0
+
+    def proxy_pick_index(workers):
+        return serve.Proxy(workers).pick(serve._Head(b"GET / HTTP/1.1\r\n\r\n"))[0].index
+
+    _with_proxy(test)
+
+
+def test_unhealthy_pinned_worker_is_replaced_and_none_left_is_503():
+    async def test(port, workers, seen):
+        workers[1].healthy = False
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        head, body = await _request(reader, writer, "/", cookie="other=1; check_worker=1")
+        assert body == "worker 0" and "check_worker=0" in head
+        writer.close()
+
+        workers[0].healthy = False
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        head, _ = await _request(reader, writer, "/")
+        assert head.startswith("HTTP/1.1 503")
+        writer.close()
+
+    _with_proxy(test)
+
+
+def test_proxy_health_route_ignores_base_path_and_bad_cookies_are_reassigned():
+    async def test(port, workers, seen):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        head, body = await _request(reader, writer, "/_serve/health")
+        assert head.startswith("HTTP/1.1 200") and body == "2/2 workers healthy\n" and not seen
+        writer.close()
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET / HTTP/1.1\r\nHost: x\r\nCookie: check_worker=\xb2\r\n\r\n")  # latin-1 "²"
+        head = (await reader.readuntil(b"\r\n\r\n")).decode()
+        assert head.startswith("HTTP/1.1 200") and "Set-Cookie: check_worker=0" in head
+        writer.close()
+
+        for worker in workers:
+            worker.healthy = False
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        head, _ = await _request(reader, writer, "/_serve/health")
+        assert head.startswith("HTTP/1.1 503")
+        writer.close()
+
+    _with_proxy(test)
+
+
+def test_shutdown_waits_for_the_supervisor_before_stopping_workers(monkeypatch):
+    events = []
+
+    class FakeLauncher:
+        def __init__(self, count, first_port, streamlit_args):
+            self.workers = [serve.Worker(0, first_port)]
+
+        async def supervise(self, proxy):
+            try:
+                await asyncio.sleep(3600)
+            finally:
+                await asyncio.sleep(0.05)  # e.g. mid-restart when the signal arrives
+                events.append("supervisor done")
+
+        def stop(self):
+            events.append("workers stopped")
+
+    async def run():
+        args = argparse.Namespace(workers=1, worker_port=0, streamlit_args=[], host="127.0.0.1", port=0)
+        asyncio.get_running_loop().call_later(0.1, os.kill, os.getpid(), signal.SIGTERM)
+        await serve.serve(args)
+
+    monkeypatch.setattr(serve, "Launcher", FakeLauncher)
+    monkeypatch.setattr(serve, "_health_path", lambda args: "/_stcore/health")
+    asyncio.run(run())
+    assert events == ["supervisor done", "workers stopped"]
+
+
+def test_worker_count_and_metrics_per_worker():
+    assert serve.available_cpus() >= 1
+    launcher = serve.Launcher(2, 8600, [])
+    launcher.env.update(CHECK_METRICS_FILE="/tmp/check.prom", CHECK_METRICS_PORT="9464")
+    env = launcher._worker_env(launcher.workers[1])
+    assert env["CHECK_METRICS_FILE"] == "/tmp/check-worker1.prom"
+    assert env["CHECK_METRICS_PORT"] == "9465" and env["CHECK_METRICS_WORKER"] == "1"
+    assert env["STREAMLIT_SERVER_COOKIE_SECRET"] == launcher._worker_env(launcher.workers[0])["STREAMLIT_SERVER_COOKIE_SECRET"]
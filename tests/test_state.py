@@ -0,0 +1,30 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import state  # noqa: E402
+
+
+def test_session_model_is_slotted_and_sessions_do_not_share_inputs():
+    a, b = state.SessionModel(), state.SessionModel()
+    assert not hasattr(a, "__dict__") and not hasattr(a.we_do.inputs, "__dict__")
+    with pytest.raises(AttributeError):
+        a.we_do.typo = 1
+    a.we_do.inputs.payee = "FreshMart"
+    a.you_do.seeds.append(1)
+    assert b.we_do.inputs.payee == "" and b.you_do.seeds == []
+    assert (a.screen, a.i_do.step, a.we_do.step) == ("i_do", -1, 0)
+
+
+def test_check_inputs_update_as_dict_and_clear():
+    inputs = state.CheckInputs()
+    assert inputs.is_blank()
+    inputs.update({"date": "10/20/2025", "memo": "Rent", "unknown": "x"})
+    assert inputs.as_dict() == {
+        "date": "10/20/2025", "payee": "", "amount_numeric": "", "amount_words": "", "memo": "Rent", "signature": "",
+    }
+    inputs.clear()
+    assert inputs.is_blank()
@@ -75,3 +75,96 @@ def test_compute_filled_fields_steps_and_default_order():
     assert fields1["amount_numeric"] != "" and fields1["amount_words"] == ""
 
 
+def test_validate_date_matches_strptime_rules():
+    app = load_app_module()
+    assert app._validate_date("2/29/2024")[0]
+    assert not app._validate_date("02/29/2025")[0]
+    assert app._validate_date("1-5-25")[0]
+    assert not app._validate_date("10/15-2025")[0]
+    assert not app._validate_date("10/15/225")[0]
+
+
+def test_validate_check_batches_all_fields():
+    app = load_app_module()
+    expected = {"payee": "FreshMart", "amount_numeric": "$64.32", "amount_words": "Sixty-four dollars and 32/100"}
+    results = app._validate_check(
+        {"date": "10/12/2025", "payee": "freshmart", "amount_numeric": "64.32",
+         "amount_words": "sixty four and 32/100", "memo": "", "signature": ""},
+        expected,
+    )
+    assert set(results) == {"date", "payee", "amount_numeric", "amount_words", "memo", "signature"}
+    assert all(results[f][0] for f in ("date", "payee", "amount_numeric", "amount_words", "memo"))
+    assert results["signature"] == (False, "Add your signature")
+
+
+def test_parse_cents_is_exact():
+    app = load_app_module()
+    assert app._parse_cents("$1,200.00") == 120000
+    assert app._parse_cents(" $ 1200.5 ") == 120050
+    assert app._parse_cents("150.") == 15000
+    assert app._parse_cents(".45") == 45
+    assert app._parse_cents("9,999,999,999.99") == 999999999999
+    for bad in ("", "$", ".", "bad", "150.001", "-5", "1e3"):
+        assert app._parse_cents(bad) is None
+
+
+def test_parse_cents_rejects_broken_comma_grouping():
+    app = load_app_module()
+    assert app._parse_cents("1,200") == 120000 and app._parse_cents("12,345,678.90") == 1234567890
+    for bad in ("1,,,2", "1,2,3", "12,00.00", "1,200,00", "1200,", ",200", "1,2345"):
+        assert app._parse_cents(bad) is None, bad
+
+
+def test_amount_to_words_check_style():
+    app = load_app_module()
+    assert app._amount_to_words(120000) == "One thousand two hundred dollars and 00/100"
+    assert app._amount_to_words(8645) == "Eighty-six dollars and 45/100"
+    assert app._amount_to_words(100) == "One dollar and 00/100"
+    assert app._amount_to_words(7) == "Zero dollars and 07/100"
+    assert app._amount_to_words(200000001) == "Two million dollars and 01/100"
+
+
+def test_validate_amount_words_without_stored_expected():
+    app = load_app_module()
+    ok, _ = app._validate_amount_words("eighty six dollars and 45/100", "", 8645)
+    assert ok
+    sc = app._get_catalog().get("field-trip-8645")
+    assert sc.amount_words == "Eighty-six dollars and 45/100"
+
+
+def test_words_to_cents_accepts_equivalent_spellings():
+    app = load_app_module()
+    assert app._words_to_cents("twelve hundred dollars and 00/100") == 120000
+    assert app._words_to_cents("One thousand two-hundred and xx/100") == 120000
+    assert app._words_to_cents("one hundred and fifty dollars and no/100") == 15000
+    assert app._words_to_cents("Eighty-six and 45/100 dollars") == 8645
+    assert app._words_to_cents("eighty six dollars and forty-five cents") == 8645
+    for bad in ("one hundred fifty dollars", "one one dollars and 00/100", "twenty twelve and 00/100"):
+        assert app._words_to_cents(bad) is None
+    for cents in (0, 7, 8645, 120000, 230000401):
+        assert app._words_to_cents(app._amount_to_words(cents)) == cents
+
+
+def test_words_to_cents_rejects_malformed_amounts():
+    app = load_app_module()
+    for bad in (
+        "one thousand twelve hundred and 00/100",
+        "one thousand twelve hundred dollars and 00/100",
+        "two million fifteen hundred and 00/100",
+        "00/100",
+        "and 00/100",
+        "dollars and 45/100",
+        "forty-five cents",
+    ):
+        assert app._words_to_cents(bad) is None, bad
+    assert app._words_to_cents("one thousand one hundred and 00/100") == 110000
+    ok, _ = app._validate_amount_words("one thousand twelve hundred and 00/100", "", 220000)
+    assert not ok
+
+
+def test_validate_amount_words_compares_amounts():
+    app = load_app_module()
+    ok, _ = app._validate_amount_words("twelve hundred dollars and 00/100", "One thousand two hundred dollars and 00/100")
+    assert ok
+    ok, msg = app._validate_amount_words("eleven hundred dollars and 00/100", "One thousand two hundred dollars and 00/100")
+    assert not ok and msg.startswith("Example:")
@@ -0,0 +1,60 @@
+"""Download the app's web fonts into assets/fonts/ as Latin-subset WOFF2 files.
+
+app.py serves these from app/static/ (with @font-face and preload hints) instead of
+importing Google Fonts, so the stylesheet makes no third-party request. Run once
+with network access, e.g. at image build time:
+
+    python tools/fetch_fonts.py
+
+If fontTools is installed the files are subset further to the characters a check uses.
+"""
+
+from __future__ import annotations
+
+import re
+import sys
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from fonts import FONT_FACES, FONTS_DIR  # noqa: E402
+
+CSS_API = "https://fonts.googleapis.com/css2?family={family}:wght@{weight}&display=swap"
+# Google Fonts only returns WOFF2 to browsers that advertise support for it
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+LATIN_BLOCK_RE = re.compile(r"/\* latin \*/\s*@font-face\s*{[^}]*?url\((https://[^)]+\.woff2)\)", re.S)
+# Basic Latin, Latin-1 punctuation and the typographic quotes and dashes
+UNICODES = "U+0020-007E,U+00A0-00FF,U+2013-2014,U+2018-201D,U+2026"
+
+
+def _get(url: str) -> bytes:
+    request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return response.read()
+
+
+def _subset(path: Path) -> None:
+    try:
+        from fontTools import subset
+    except ImportError:
+        return
+    subset.main([str(path), f"--unicodes={UNICODES}", "--flavor=woff2", f"--output-file={path}", "--layout-features=*"])
+
+
+def main() -> None:
+    FONTS_DIR.mkdir(parents=True, exist_ok=True)
+    for family, weight, stem, _preload in FONT_FACES:
+        css = _get(CSS_API.format(family=family.replace(" ", "+"), weight=weight)).decode("utf-8")
+        match = LATIN_BLOCK_RE.search(css)
+        if match is None:
+            raise SystemExit(f"No latin WOFF2 for {family} {weight}")
+        target = FONTS_DIR / f"{stem}.woff2"
+        target.write_bytes(_get(match.group(1)))
+        _subset(target)
+        print(f"{target.relative_to(ROOT)}  {target.stat().st_size:>7} bytes")
+
+
+if __name__ == "__main__":
+    main()